@@ -62,6 +62,42 @@ class Config:
     TMDB_BASE_URL = "https://api.themoviedb.org/3"
     TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p"
 
+    # TMDB HTTP client -- one pooled keep-alive session per process, sized for
+    # the sync script's thread fan-out. Responses are cached per endpoint+params
+    # in a bounded in-process LRU, or in Redis when REDIS_URL is set.
+    TMDB_POOL_MAXSIZE = int(os.getenv("TMDB_POOL_MAXSIZE", "20"))
+    TMDB_CACHE_ENABLED = os.getenv("TMDB_CACHE_ENABLED", "true").lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+    TMDB_CACHE_MAX_ENTRIES = int(os.getenv("TMDB_CACHE_MAX_ENTRIES", "2048"))
+
+    # Movie detail enrichment (trailer + watch providers) -- total seconds the
+    # page waits on TMDB, and the size of the shared fetch thread pool.
+    ENRICHMENT_BUDGET_SECONDS = float(os.getenv("ENRICHMENT_BUDGET_SECONDS", "2.5"))
+    ENRICHMENT_MAX_WORKERS = int(os.getenv("ENRICHMENT_MAX_WORKERS", "8"))
+    # When on, movie_detail never waits on TMDB: uncached enrichment is loaded
+    # client-side from /api/v1/movies/<id>/enrichment after first paint.
+    DEFER_ENRICHMENT = os.getenv("DEFER_ENRICHMENT", "true").lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+
+    # Listing totals -- memoized per filter combination until the next data
+    # sync. Above COUNT_ESTIMATE_THRESHOLD rows (Postgres only, 0 = off) the
+    # query planner's row estimate is used instead of an exact COUNT.
+    COUNT_CACHE_TIMEOUT = int(os.getenv("COUNT_CACHE_TIMEOUT", "600"))
+    COUNT_ESTIMATE_THRESHOLD = int(os.getenv("COUNT_ESTIMATE_THRESHOLD", "0"))
+
+    # Metrics -- /metrics requires "Authorization: Bearer <token>" when set.
+    # Gunicorn workers share samples through PROMETHEUS_MULTIPROC_DIR (see
+    # gunicorn.conf.py).
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
     # Database
     # Railway injects DATABASE_URL as postgresql:// but SQLAlchemy 2.0 requires
     # postgresql+psycopg2://. Fix the scheme if needed.
@@ -72,6 +108,41 @@ class Config:
         else _raw_db_url
     )
 
+    # Read replicas -- comma-separated URLs (optional). GET requests read from
+    # them round-robin; a client that just wrote reads from the primary for
+    # REPLICA_STICKY_SECONDS so it sees its own changes despite replica lag.
+    DATABASE_REPLICA_URLS = [
+        url.strip().replace("postgresql://", "postgresql+psycopg2://", 1)
+        for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    ]
+    REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+    REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+    # Connection pool (Postgres) -- recycle connections before Railway's proxy
+    # drops them for idleness, and pre-ping so a dead one is never handed out.
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in {
+        "1",
+        "true",
+        "yes",
+        "on",
+    }
+    DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+    # Server-side per-statement timeout in milliseconds (0 = off), and the
+    # name connections report in pg_stat_activity.
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+    DB_APPLICATION_NAME = os.getenv("DB_APPLICATION_NAME", "movie-analytics")
+    # Statement timeout for batch jobs (TMDB sync, imports, backfills); their
+    # bulk writes and similarity refreshes outlast any web request (0 = off).
+    DB_JOB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_JOB_STATEMENT_TIMEOUT_MS", "0"))
+    # SQLite (local dev) -- WAL journaling with a memory-mapped read window
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
     # Redis -- optional, used for caching and rate limiting in production
     # Set REDIS_URL in the environment to enable. Falls back to in-memory if not set.
     REDIS_URL = os.getenv("REDIS_URL", None)
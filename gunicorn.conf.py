@@ -0,0 +1,25 @@
+"""
+Gunicorn settings shared by the Procfile and Dockerfile commands.
+
+Gunicorn loads ./gunicorn.conf.py automatically. Its job here is to give
+prometheus_client a multiprocess directory, so /metrics aggregates samples
+from every worker rather than whichever one answers the scrape.
+"""
+
+import os
+import shutil
+
+# prometheus_client picks its value class when first imported, so the
+# directory must be in the environment before anything imports it
+_metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+# Samples from a previous run would be summed into this one
+shutil.rmtree(_metrics_dir, ignore_errors=True)
+os.makedirs(_metrics_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drop a dead worker's live gauges from the aggregate."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
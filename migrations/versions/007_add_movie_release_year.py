@@ -0,0 +1,56 @@
+"""add denormalized release_year and release_decade to movies
+
+Revision ID: 007_add_movie_release_year
+Revises: 006_add_analytics_snapshots
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "007_add_movie_release_year"
+down_revision: Union[str, None] = "006_add_analytics_snapshots"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _backfill() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        year_expr = "CAST(strftime('%Y', release_date) AS INTEGER)"
+    else:
+        year_expr = "CAST(EXTRACT(YEAR FROM release_date) AS INTEGER)"
+
+    bind.execute(
+        sa.text(
+            f"""
+            UPDATE movies
+            SET release_year = {year_expr},
+                release_decade = ({year_expr} / 10) * 10
+            WHERE release_date IS NOT NULL
+            """
+        )
+    )
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("movies") as batch_op:
+        batch_op.add_column(sa.Column("release_year", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("release_decade", sa.Integer(), nullable=True))
+
+    _backfill()
+
+    op.create_index("idx_movies_release_year", "movies", ["release_year"])
+    op.create_index("idx_movies_release_decade", "movies", ["release_decade"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_movies_release_decade", table_name="movies")
+    op.drop_index("idx_movies_release_year", table_name="movies")
+
+    with op.batch_alter_table("movies") as batch_op:
+        batch_op.drop_column("release_decade")
+        batch_op.drop_column("release_year")
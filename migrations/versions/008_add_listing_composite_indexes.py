@@ -0,0 +1,60 @@
+"""add composite indexes for the hot listing query shapes
+
+Revision ID: 008_add_listing_composite_indexes
+Revises: 007_add_movie_release_year
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "008_add_listing_composite_indexes"
+down_revision: Union[str, None] = "007_add_movie_release_year"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Postgres-only: match the listings' "DESC NULLS LAST, id DESC" keyset order
+_LISTING_INDEXES = {
+    "idx_movies_popularity_listing": "popularity",
+    "idx_movies_vote_average_listing": "vote_average",
+    "idx_movies_release_date_listing": "release_date",
+}
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_movies_vote_average_vote_count",
+        "movies",
+        ["vote_average", "vote_count"],
+    )
+    op.create_index(
+        "idx_movies_hidden_gems",
+        "movies",
+        ["popularity", "vote_average", "vote_count"],
+    )
+    op.create_index(
+        "idx_movie_genres_genre_movie",
+        "movie_genres",
+        ["genre_id", "movie_id"],
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        for index_name, column in _LISTING_INDEXES.items():
+            op.create_index(
+                index_name,
+                "movies",
+                [sa.text(f"{column} DESC NULLS LAST"), sa.text("id DESC")],
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        for index_name in reversed(list(_LISTING_INDEXES)):
+            op.drop_index(index_name, table_name="movies")
+
+    op.drop_index("idx_movie_genres_genre_movie", table_name="movie_genres")
+    op.drop_index("idx_movies_hidden_gems", table_name="movies")
+    op.drop_index("idx_movies_vote_average_vote_count", table_name="movies")
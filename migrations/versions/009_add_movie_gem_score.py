@@ -0,0 +1,80 @@
+"""add persisted gem_score to movies
+
+Revision ID: 009_add_movie_gem_score
+Revises: 008_add_listing_composite_indexes
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+import math
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "009_add_movie_gem_score"
+down_revision: Union[str, None] = "008_add_listing_composite_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of src.models.compute_gem_score as of this revision
+GEM_MIN_VOTES = 50
+BATCH_SIZE = 1000
+
+
+def _gem_score(vote_average, popularity, vote_count):
+    if vote_average is None or popularity is None or (vote_count or 0) < GEM_MIN_VOTES:
+        return None
+    return round(float(vote_average) / (math.log10(float(popularity) + 2) * 2), 4)
+
+
+def _backfill() -> None:
+    # Computed in Python so SQLite builds without math functions get the
+    # same scores as Postgres
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(
+            """
+            SELECT id, vote_average, popularity, vote_count
+            FROM movies
+            WHERE vote_count >= :min_votes
+              AND vote_average IS NOT NULL
+              AND popularity IS NOT NULL
+            """
+        ),
+        {"min_votes": GEM_MIN_VOTES},
+    ).fetchall()
+
+    update = sa.text("UPDATE movies SET gem_score = :gem_score WHERE id = :id")
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start : start + BATCH_SIZE]
+        bind.execute(
+            update,
+            [
+                {
+                    "id": row.id,
+                    "gem_score": _gem_score(row.vote_average, row.popularity, row.vote_count),
+                }
+                for row in batch
+            ],
+        )
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("movies") as batch_op:
+        batch_op.add_column(sa.Column("gem_score", sa.Float(), nullable=True))
+
+    _backfill()
+
+    op.create_index(
+        "idx_movies_gem_score",
+        "movies",
+        ["gem_score", "vote_average", "popularity"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_movies_gem_score", table_name="movies")
+
+    with op.batch_alter_table("movies") as batch_op:
+        batch_op.drop_column("gem_score")
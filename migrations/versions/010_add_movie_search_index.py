@@ -0,0 +1,77 @@
+"""add full-text search index over movie titles and overviews
+
+Revision ID: 010_add_movie_search_index
+Revises: 009_add_movie_gem_score
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "010_add_movie_search_index"
+down_revision: Union[str, None] = "009_add_movie_gem_score"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of src.models.MOVIES_FTS_DDL as of this revision. Note that a
+# later batch_alter_table("movies") on SQLite recreates the table and drops
+# these triggers; such a migration must run this DDL again.
+SQLITE_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+        title, overview, content='movies', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+        INSERT INTO movies_fts(rowid, title, overview)
+        VALUES (new.id, new.title, new.overview);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, overview)
+        VALUES ('delete', old.id, old.title, old.overview);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE OF title, overview ON movies
+    BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, overview)
+        VALUES ('delete', old.id, old.title, old.overview);
+        INSERT INTO movies_fts(rowid, title, overview)
+        VALUES (new.id, new.title, new.overview);
+    END
+    """,
+)
+
+# Must match src.models.movie_search_document exactly, or the planner will
+# not use the index
+POSTGRES_DOCUMENT = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(overview, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+        # Index the rows that already exist
+        op.execute("INSERT INTO movies_fts(movies_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        op.execute(f"CREATE INDEX idx_movies_search ON movies USING gin (({POSTGRES_DOCUMENT}))")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("movies_fts_insert", "movies_fts_delete", "movies_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS movies_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS idx_movies_search")
@@ -0,0 +1,34 @@
+"""add movie_similar table of precomputed neighbours
+
+Revision ID: 011_add_movie_similar
+Revises: 010_add_movie_search_index
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "011_add_movie_similar"
+down_revision: Union[str, None] = "010_add_movie_search_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by the next import/sync run (src.similarity); until then movie
+    # pages fall back to the shared-genre query
+    op.create_table(
+        "movie_similar",
+        sa.Column("movie_id", sa.Integer(), sa.ForeignKey("movies.id"), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("similar_movie_id", sa.Integer(), sa.ForeignKey("movies.id"), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("movie_id", "rank"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("movie_similar")
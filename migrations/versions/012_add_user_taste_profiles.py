@@ -0,0 +1,33 @@
+"""add user_taste_profiles table
+
+Revision ID: 012_add_user_taste_profiles
+Revises: 011_add_movie_similar
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "012_add_user_taste_profiles"
+down_revision: Union[str, None] = "011_add_movie_similar"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fill with scripts/build_taste_profiles.py afterwards; until then
+    # recommendations profile each user's history on the fly (src.taste)
+    op.create_table(
+        "user_taste_profiles",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("weights", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_taste_profiles")
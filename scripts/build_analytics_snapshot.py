@@ -0,0 +1,34 @@
+"""
+Seed the analytics snapshot
+
+Builds and stores the dashboard snapshot read by /analytics and the
+analytics API. Sync and import runs refresh it on their own; run this once
+after migration 006 on a database that already has movies. It is safe to
+re-run.
+
+Usage:
+    python scripts/build_analytics_snapshot.py
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analytics import refresh_analytics_snapshot
+from src.models import job_session
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def main():
+    session = job_session()
+    try:
+        refresh_analytics_snapshot(session)
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Backfill per-user taste profiles
+
+Stores a profile for every user who doesn't have one yet, built from their
+favorites, watchlist and ratings. Run once after migration 012; it is safe
+to re-run and only touches users still missing a profile.
+
+Usage:
+    python scripts/build_taste_profiles.py
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.models import job_session
+from src.taste import backfill_profiles
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+
+def main():
+    session = job_session()
+    try:
+        backfill_profiles(session)
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
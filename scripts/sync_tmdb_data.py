@@ -25,6 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy import func
 
+from src.analytics import refresh_analytics_snapshot
 from src.models import (
     Cast,
     Crew,
@@ -32,10 +33,11 @@ from src.models import (
     Movie,
     Person,
     ProductionCompany,
-    Session,
+    job_session,
     movie_companies_table,
     movie_genres_table,
 )
+from src.similarity import refresh_movie_similarities
 from src.tmdb_api import TMDBClient
 
 os.makedirs("logs", exist_ok=True)
@@ -61,8 +63,10 @@ def fetch_movie_data(tmdb_id: int, client: TMDBClient) -> dict | None:
 
 class FastTMDBSyncer:
     def __init__(self, limit: int = 5000, update_existing: bool = False, workers: int = 10):
-        self.client = TMDBClient()
-        self.session = Session()
+        # Every fetch is for a distinct movie, so skip the response cache and
+        # just reuse the client's pooled keep-alive connections.
+        self.client = TMDBClient(use_cache=False)
+        self.session = job_session()
         self.limit = limit
         self.update_existing = update_existing
         self.workers = workers
@@ -78,9 +82,7 @@ class FastTMDBSyncer:
         """Sync all genres from TMDB."""
         logger.info("Syncing genres...")
         try:
-            import requests
-
-            response = requests.get(
+            response = self.client.session.get(
                 f"{self.client.base_url}/genre/movie/list",
                 params={"api_key": self.client.api_key},
                 timeout=self.client.timeout,
@@ -330,6 +332,12 @@ class FastTMDBSyncer:
         # Final commit
         self.session.commit()
 
+        # Rebuild similar-movie lists and dashboard aggregates once the whole
+        # batch is written
+        if self.stats["movies_added"] or self.stats["movies_updated"]:
+            refresh_movie_similarities(self.session)
+            refresh_analytics_snapshot(self.session)
+
         elapsed = time.time() - start_time
         rate = movies_written / elapsed if elapsed > 0 else 0
         logger.info(f"\n{'='*60}")
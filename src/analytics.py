@@ -0,0 +1,258 @@
+"""
+Materialized analytics summary for the dashboard and analytics API.
+
+/analytics, its CSV export and /api/v1/analytics/{overview,genres} all show
+the same catalog-wide aggregates. Rather than re-scanning movies x genres on
+every cache miss, the aggregates are computed once into a JSON snapshot stored
+in the analytics_snapshots table. The import and sync jobs rebuild it after
+they write movies (the web app itself never writes to the catalog or the
+snapshot), and every endpoint reads the same snapshot, so their numbers always
+agree.
+"""
+
+import heapq
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from src.logger import get_logger
+from src.models import (
+    AnalyticsSnapshot,
+    Genre,
+    Movie,
+    ProductionCompany,
+    movie_companies_table,
+    movie_genres_table,
+)
+
+logger = get_logger(__name__)
+
+SNAPSHOT_NAME = "dashboard"
+
+
+def _num(value):
+    """Convert DB numerics (Decimal/None) into JSON-safe floats."""
+    if value is None:
+        return None
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+class TopN:
+    """Keep the N largest items seen in a stream without sorting the stream.
+
+    Ties on the score go to the lower movie id so results are deterministic.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._heap = []
+
+    def push(self, score, movie_id, item):
+        entry = (score, -movie_id, item)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self):
+        return [item for _, _, item in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+class MeanCounter:
+    """Running COUNT(*) and AVG(x) per group, matching SQL's NULL handling."""
+
+    def __init__(self):
+        self.count = 0
+        self._total = 0.0
+        self._non_null = 0
+
+    def add(self, value):
+        self.count += 1
+        if value is not None:
+            self._total += value
+            self._non_null += 1
+
+    @property
+    def mean(self):
+        return self._total / self._non_null if self._non_null else None
+
+
+def _ranked(groups, min_count=1, limit=None, count_key="count"):
+    """Turn {name: MeanCounter} into rows ordered by count desc, then name."""
+    rows = sorted(
+        ((name, c) for name, c in groups.items() if c.count >= min_count),
+        key=lambda pair: (-pair[1].count, pair[0]),
+    )
+    if limit is not None:
+        rows = rows[:limit]
+    return [{"name": name, count_key: c.count, "avg_rating": c.mean} for name, c in rows]
+
+
+def build_analytics_summary(session, batch_size=2000) -> dict:
+    """Compute every dashboard aggregate from the current catalog.
+
+    The whole dashboard comes from three streamed scans: movies once, then
+    the genre and company link tables once each. Per-movie values from the
+    first pass are kept in a compact dict, so the join-based rollups don't
+    revisit movies. That is the same plan on SQLite and Postgres and avoids
+    re-filtering the movies table for every widget. Rows are streamed with
+    yield_per, so memory stays bounded by the per-movie tuples, not ORM objects.
+    """
+    total_movies = 0
+    total_revenue = 0
+    rated_total, rated_count = 0.0, 0
+    year_counts = {}
+    # movie_id -> (vote_average, vote_count) for the genre/company passes
+    movie_votes = {}
+
+    top_budget_movies = TopN(10)
+    budget_revenue_scatter = TopN(300)
+    most_profitable = TopN(15)
+    top_rated = TopN(25)
+    top_revenue = TopN(25)
+
+    movie_rows = (
+        session.query(
+            Movie.id,
+            Movie.title,
+            Movie.release_year,
+            Movie.budget,
+            Movie.revenue,
+            Movie.vote_average,
+            Movie.vote_count,
+        )
+        .execution_options(stream_results=True)
+        .yield_per(batch_size)
+    )
+    for movie_id, title, year, budget, revenue, vote_average, vote_count in movie_rows:
+        rating = _num(vote_average)
+        votes = vote_count or 0
+        budget = budget or 0
+        revenue = revenue or 0
+
+        total_movies += 1
+        movie_votes[movie_id] = (rating, votes)
+        if year is not None:
+            year_counts[year] = year_counts.get(year, 0) + 1
+        if revenue > 0:
+            total_revenue += revenue
+            top_revenue.push(
+                revenue,
+                movie_id,
+                {
+                    "title": title,
+                    "budget": budget,
+                    "revenue": revenue,
+                    "vote_average": rating,
+                    "release_year": year,
+                },
+            )
+            if budget > 0:
+                top_budget_movies.push(revenue, movie_id, [title, budget, revenue])
+            if budget > 1_000_000:
+                budget_revenue_scatter.push(revenue, movie_id, [title, budget, revenue, rating])
+                most_profitable.push(revenue - budget, movie_id, [title, budget, revenue])
+        if votes > 50 and rating is not None:
+            rated_total += rating
+            rated_count += 1
+        if votes > 100 and rating is not None:
+            top_rated.push(
+                rating,
+                movie_id,
+                {
+                    "title": title,
+                    "vote_average": rating,
+                    "vote_count": votes,
+                    "revenue": revenue,
+                    "release_year": year,
+                },
+            )
+
+    genre_stats = {}
+    rated_genre_stats = {}
+    genre_rows = (
+        session.query(movie_genres_table.c.movie_id, Genre.name)
+        .join(Genre, Genre.id == movie_genres_table.c.genre_id)
+        .execution_options(stream_results=True)
+        .yield_per(batch_size)
+    )
+    for movie_id, name in genre_rows:
+        if movie_id not in movie_votes:
+            continue
+        rating, votes = movie_votes[movie_id]
+        genre_stats.setdefault(name, MeanCounter()).add(rating)
+        if votes > 50:
+            rated_genre_stats.setdefault(name, MeanCounter()).add(rating)
+
+    company_stats = {}
+    company_rows = (
+        session.query(movie_companies_table.c.movie_id, ProductionCompany.name)
+        .join(ProductionCompany, ProductionCompany.id == movie_companies_table.c.company_id)
+        .execution_options(stream_results=True)
+        .yield_per(batch_size)
+    )
+    for movie_id, name in company_rows:
+        if movie_id not in movie_votes:
+            continue
+        rating, votes = movie_votes[movie_id]
+        if votes > 50:
+            company_stats.setdefault(name, MeanCounter()).add(rating)
+
+    return {
+        "total_movies": total_movies,
+        "avg_rating": rated_total / rated_count if rated_count else None,
+        "total_revenue": total_revenue,
+        "genre_stats": _ranked(genre_stats),
+        "rated_genre_stats": _ranked(rated_genre_stats),
+        "year_stats": [{"year": y, "count": year_counts[y]} for y in sorted(year_counts)],
+        "top_budget_movies": top_budget_movies.items(),
+        "budget_revenue_scatter": budget_revenue_scatter.items(),
+        "most_profitable": most_profitable.items(),
+        "top_companies": _ranked(company_stats, min_count=2, limit=10, count_key="movie_count"),
+        "top_rated": top_rated.items(),
+        "top_revenue": top_revenue.items(),
+    }
+
+
+def refresh_analytics_snapshot(session) -> dict:
+    """Rebuild and persist the snapshot. Call after any bulk write to movies."""
+    summary = build_analytics_summary(session)
+    summary["refreshed_at"] = datetime.utcnow().isoformat()
+
+    snapshot = session.query(AnalyticsSnapshot).filter_by(name=SNAPSHOT_NAME).one_or_none()
+    if snapshot is None:
+        snapshot = AnalyticsSnapshot(name=SNAPSHOT_NAME)
+        session.add(snapshot)
+    snapshot.payload = json.dumps(summary)
+    snapshot.refreshed_at = datetime.utcnow()
+    session.commit()
+    return summary
+
+
+def get_catalog_version(session) -> str:
+    """Return a token that changes whenever a sync job rewrites the catalog.
+
+    Every import/sync run ends by refreshing the snapshot, so its timestamp
+    doubles as a cheap version for anything cached off catalog queries.
+    """
+    refreshed_at = (
+        session.query(AnalyticsSnapshot.refreshed_at).filter_by(name=SNAPSHOT_NAME).scalar()
+    )
+    return refreshed_at.isoformat() if refreshed_at else "unversioned"
+
+
+def get_analytics_summary(session) -> dict:
+    """Return the stored snapshot.
+
+    Read-only, so it is safe on GET requests. Until a sync run or
+    scripts/build_analytics_snapshot.py stores the snapshot, the summary is
+    built on the fly without being persisted.
+    """
+    payload = session.query(AnalyticsSnapshot.payload).filter_by(name=SNAPSHOT_NAME).scalar()
+    if payload is not None:
+        return json.loads(payload)
+
+    logger.info("Analytics snapshot missing; building it without storing it")
+    return build_analytics_summary(session)
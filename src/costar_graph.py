@@ -0,0 +1,231 @@
+"""
+In-memory co-star graph.
+
+The actor network page used to find collaborator edges with a Cast x Cast
+self-join. That join grows with the square of cast size. Common Films and
+the autocomplete ``with`` filter also rebuilt per-actor movie sets with
+one query per actor. ``CostarGraph`` loads the cast table once and keeps
+the person <-> movie bipartite graph in CSR form:
+
+* ``_person_ptr[p]:_person_ptr[p + 1]`` slices ``_person_movies`` to give
+  the movie positions of person ``p``;
+* ``_movie_ptr`` / ``_movie_people`` give the cast of each movie the same
+  way.
+
+Positions index the sorted ``person_ids`` / ``movie_ids`` arrays. All of it
+is flat ``array`` storage, about 8 bytes per credit per direction.
+Collaborator counts come from walking a person's movies and counting their
+casts, which touches only the neighbourhood in question.
+
+``shortest_path`` runs a bidirectional BFS over the same arrays for the
+degrees-of-separation page. That graph is built from cast and crew
+credits together (``build_collaboration_graph``).
+
+Like the actor name index, each graph lives in each worker and is rebuilt
+through ``VersionedIndex`` after a sync.
+"""
+
+import heapq
+from array import array
+from collections import Counter
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select, union
+
+from src.models import Cast, Crew
+
+BATCH_SIZE = 5000
+# shortest_path gives up beyond this many films between the two people...
+MAX_DEGREES = 6
+# ...or once this many people have been reached from either end
+MAX_VISITED = 250_000
+
+
+def _csr(adjacency: Dict[int, Iterable[int]], size: int) -> Tuple[array, array]:
+    """Row pointers and column positions for rows ``0..size-1``."""
+    pointers = array("I", [0])
+    columns = array("I")
+    for row in range(size):
+        columns.extend(sorted(adjacency.get(row, ())))
+        pointers.append(len(columns))
+    return pointers, columns
+
+
+class CostarGraph:
+    """Who appeared in what, with fast co-appearance queries."""
+
+    def __init__(self, credits: Iterable[Tuple[int, int]]):
+        """Build from ``(person_id, movie_id)`` rows; duplicate credits collapse."""
+        pairs = set(credits)
+        self.person_ids = array("q", sorted({person_id for person_id, _ in pairs}))
+        self.movie_ids = array("q", sorted({movie_id for _, movie_id in pairs}))
+        self._person_pos = {person_id: pos for pos, person_id in enumerate(self.person_ids)}
+        self._movie_pos = {movie_id: pos for pos, movie_id in enumerate(self.movie_ids)}
+
+        movies_by_person: Dict[int, List[int]] = {}
+        people_by_movie: Dict[int, List[int]] = {}
+        for person_id, movie_id in pairs:
+            person, movie = self._person_pos[person_id], self._movie_pos[movie_id]
+            movies_by_person.setdefault(person, []).append(movie)
+            people_by_movie.setdefault(movie, []).append(person)
+        self._person_ptr, self._person_movies = _csr(movies_by_person, len(self.person_ids))
+        self._movie_ptr, self._movie_people = _csr(people_by_movie, len(self.movie_ids))
+
+    def __len__(self):
+        return len(self.person_ids)
+
+    def _movies_at(self, person: int) -> array:
+        return self._person_movies[self._person_ptr[person] : self._person_ptr[person + 1]]
+
+    def _cast_at(self, movie: int) -> array:
+        return self._movie_people[self._movie_ptr[movie] : self._movie_ptr[movie + 1]]
+
+    def _movie_positions(self, person_id: int) -> Set[int]:
+        person = self._person_pos.get(person_id)
+        return set() if person is None else set(self._movies_at(person))
+
+    def movies(self, person_id: int) -> Set[int]:
+        """IDs of the movies ``person_id`` is credited in."""
+        return {self.movie_ids[movie] for movie in self._movie_positions(person_id)}
+
+    def shared_movies(self, person_ids: Iterable[int]) -> Set[int]:
+        """IDs of the movies every one of ``person_ids`` appears in."""
+        shared = None
+        for person_id in person_ids:
+            movies = self._movie_positions(person_id)
+            shared = movies if shared is None else shared & movies
+            if not shared:
+                return set()
+        return {self.movie_ids[movie] for movie in shared or ()}
+
+    def costars(self, person_ids: Iterable[int]) -> Counter:
+        """Everyone in a movie shared by all of ``person_ids``, with how many such movies.
+
+        The given people count themselves; callers drop them if unwanted.
+        """
+        counts = Counter()
+        for movie_id in self.shared_movies(person_ids):
+            counts.update(self._cast_at(self._movie_pos[movie_id]))
+        return Counter({self.person_ids[person]: count for person, count in counts.items()})
+
+    def collaborators(self, person_id: int, limit: int) -> List[Tuple[int, int]]:
+        """Top ``limit`` ``(person_id, shared_movie_count)`` co-stars, most frequent first."""
+        person = self._person_pos.get(person_id)
+        if person is None:
+            return []
+        counts = Counter()
+        for movie in self._movies_at(person):
+            counts.update(self._cast_at(movie))
+        del counts[person]
+        top = heapq.nsmallest(limit, counts.items(), key=lambda item: (-item[1], item[0]))
+        return [(self.person_ids[other], count) for other, count in top]
+
+    def pair_shared_movies(self, person_ids: Iterable[int]) -> Dict[Tuple[int, int], Set[int]]:
+        """Movie IDs shared by each pair of ``person_ids`` that has any, keyed ``(low, high)``."""
+        movie_sets = {person_id: self._movie_positions(person_id) for person_id in person_ids}
+        pairs = {}
+        for a, b in combinations(sorted(movie_sets), 2):
+            shared = movie_sets[a] & movie_sets[b]
+            if shared:
+                pairs[(a, b)] = {self.movie_ids[movie] for movie in shared}
+        return pairs
+
+    def shortest_path(
+        self,
+        source_id: int,
+        target_id: int,
+        max_degrees: int = MAX_DEGREES,
+        max_visited: int = MAX_VISITED,
+    ) -> Optional[Tuple[List[int], List[int]]]:
+        """Fewest-films chain of co-appearances from one person to another.
+
+        Returns ``(person_ids, movie_ids)``, where ``movie_ids[i]`` links
+        ``person_ids[i]`` to ``person_ids[i + 1]``. Returns None when the two
+        are not connected within ``max_degrees`` films, or when the search
+        reaches ``max_visited`` people first.
+
+        The search grows whichever side has the smaller frontier, one whole
+        level at a time, and stops at the first level where the sides meet.
+        """
+        source = self._person_pos.get(source_id)
+        target = self._person_pos.get(target_id)
+        if source is None or target is None:
+            return None
+        if source == target:
+            return [source_id], []
+
+        # person -> (depth, previous person, linking movie), one map per side
+        forward = {source: (0, None, None)}
+        backward = {target: (0, None, None)}
+        frontiers = {True: [source], False: [target]}
+        seen_movies = {True: set(), False: set()}
+        depths = {True: 0, False: 0}
+
+        while frontiers[True] and frontiers[False]:
+            if depths[True] + depths[False] >= max_degrees:
+                return None
+            is_forward = len(frontiers[True]) <= len(frontiers[False])
+            parents, others = (forward, backward) if is_forward else (backward, forward)
+            depth = depths[is_forward] + 1
+
+            best = None
+            next_frontier = []
+            for person in frontiers[is_forward]:
+                if len(forward) + len(backward) > max_visited:
+                    return None
+                for movie in self._movies_at(person):
+                    if movie in seen_movies[is_forward]:
+                        continue
+                    seen_movies[is_forward].add(movie)
+                    for other in self._cast_at(movie):
+                        if other in parents:
+                            continue
+                        parents[other] = (depth, person, movie)
+                        next_frontier.append(other)
+                        if other in others:
+                            total = depth + others[other][0]
+                            if best is None or total < best[0]:
+                                best = (total, other)
+
+            if best is not None:
+                return self._join(forward, backward, best[1])
+            frontiers[is_forward] = next_frontier
+            depths[is_forward] = depth
+        return None
+
+    def _join(self, forward: dict, backward: dict, meeting: int) -> Tuple[List[int], List[int]]:
+        people, movies = [meeting], []
+        person = meeting
+        while forward[person][1] is not None:
+            _, person, movie = forward[person]
+            people.insert(0, person)
+            movies.insert(0, movie)
+        person = meeting
+        while backward[person][1] is not None:
+            _, person, movie = backward[person]
+            people.append(person)
+            movies.append(movie)
+        return (
+            [self.person_ids[person] for person in people],
+            [self.movie_ids[movie] for movie in movies],
+        )
+
+
+def build_costar_graph(session, batch_size: int = BATCH_SIZE) -> CostarGraph:
+    """Load every cast credit and build a fresh graph."""
+    credits = session.execute(
+        select(Cast.person_id, Cast.movie_id).execution_options(yield_per=batch_size)
+    )
+    return CostarGraph((person_id, movie_id) for person_id, movie_id in credits)
+
+
+def build_collaboration_graph(session, batch_size: int = BATCH_SIZE) -> CostarGraph:
+    """Graph over cast and crew credits alike, for degrees of separation."""
+    credits = session.execute(
+        union(
+            select(Cast.person_id, Cast.movie_id),
+            select(Crew.person_id, Crew.movie_id),
+        ).execution_options(yield_per=batch_size)
+    )
+    return CostarGraph((person_id, movie_id) for person_id, movie_id in credits)
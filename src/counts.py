@@ -0,0 +1,96 @@
+"""
+Memoized totals for paginated listing queries.
+
+The listing pages show "N results" and a page count, which means a COUNT over
+the whole filtered set on every request, and that is often slower than the page
+itself. The same filter combinations come up over and over, and the
+catalog only changes when a sync job runs, so totals are cached per query.
+
+The cache key is the compiled COUNT statement plus its bound parameters, with
+ORDER BY stripped. That normalizes the filters: two URLs with the same
+filters in a different order, or with different sorts, share one entry. Keys
+also carry the catalog version (see get_catalog_version), so a sync run
+invalidates every cached total in every worker at once.
+"""
+
+import hashlib
+import json
+from typing import Optional
+
+from src.analytics import get_catalog_version
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CountService:
+    """Return (and memoize) the total row count of a listing query.
+
+    ``cache`` is any object with Flask-Caching's get/set API. When
+    ``estimate_threshold`` is positive and the database is Postgres, results
+    the planner expects to exceed it are reported from its row estimate
+    rather than counted exactly.
+    """
+
+    def __init__(self, cache=None, timeout: int = 600, estimate_threshold: int = 0):
+        self.cache = cache
+        self.timeout = timeout
+        self.estimate_threshold = estimate_threshold
+
+    @staticmethod
+    def _signature(session, statement) -> str:
+        compiled = statement.compile(dialect=session.get_bind().dialect)
+        params = sorted((key, repr(value)) for key, value in compiled.params.items())
+        return hashlib.sha1(f"{compiled}|{params}".encode()).hexdigest()
+
+    def _planner_estimate(self, session, statement) -> Optional[int]:
+        """Return Postgres' row estimate for ``statement``, or None elsewhere."""
+        bind = session.get_bind()
+        if bind.dialect.name != "postgresql":
+            return None
+        compiled = statement.compile(dialect=bind.dialect)
+        # A failed EXPLAIN (e.g. statement_timeout) would otherwise abort the
+        # request's transaction, and the exact-count fallback with it
+        with session.begin_nested():
+            plan = (
+                session.connection()
+                .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+                .scalar()
+            )
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _count(self, session, query) -> int:
+        if self.estimate_threshold > 0:
+            try:
+                estimate = self._planner_estimate(session, query.statement)
+            except Exception as exc:
+                logger.warning(f"Planner row estimate failed: {exc}")
+                estimate = None
+            if estimate is not None and estimate >= self.estimate_threshold:
+                return estimate
+        return query.count()
+
+    def total(self, session, query) -> int:
+        """Return the number of rows ``query`` would produce, ignoring LIMIT/OFFSET."""
+        query = query.order_by(None)
+        if self.cache is None:
+            return self._count(session, query)
+
+        version = get_catalog_version(session)
+        key = f"count:{version}:{self._signature(session, query.statement)}"
+        try:
+            cached = self.cache.get(key)
+        except Exception as exc:
+            logger.warning(f"Count cache read failed: {exc}")
+            cached = None
+        if cached is not None:
+            return cached
+
+        total = self._count(session, query)
+        try:
+            self.cache.set(key, total, timeout=self.timeout)
+        except Exception as exc:
+            logger.warning(f"Count cache write failed: {exc}")
+        return total
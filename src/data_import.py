@@ -4,7 +4,9 @@ from typing import Optional
 
 from sqlalchemy.exc import IntegrityError
 
-from src.models import Cast, Crew, Genre, Movie, Person, ProductionCompany, Session
+from src.analytics import refresh_analytics_snapshot
+from src.models import Cast, Crew, Genre, Movie, Person, ProductionCompany, job_session
+from src.similarity import refresh_movie_similarities
 from src.tmdb_api import TMDBClient
 
 
@@ -26,7 +28,7 @@ class DataImporter:
 
     def __init__(self):
         self.client = TMDBClient()
-        self.session = Session()
+        self.session = job_session()
 
     def import_genres(self):
         """Import all genres from TMDB"""
@@ -227,6 +229,11 @@ class DataImporter:
             # Summary after each page
             print(f"  📊 Page summary: {len(popular['results'])} movies processed")
 
+        # Rebuild similar-movie lists and dashboard aggregates once for the whole run
+        if movies_created:
+            refresh_movie_similarities(self.session)
+            refresh_analytics_snapshot(self.session)
+
         # Final summary
         print(f"\n{'='*60}")
         print(f"✅ Import complete!")
@@ -0,0 +1,243 @@
+"""
+Decade data for /decades and /decade/<start>.
+
+Decade pages only change when a sync job rewrites the catalog, so both views
+are cached under the catalog version. Each one is then rebuilt once per sync
+rather than once per view.
+
+The index is built from one query. It returns per-decade counts, average
+ratings and revenue, plus the most popular backdrop, which ROW_NUMBER()
+picks. A detail page streams the decade's movies once and derives every
+section from that pass: stats, the by-year chart and the three shortlists.
+Only plain ids and numbers are cached. The few movies on the page are then
+loaded by primary key.
+"""
+
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, desc, func, select
+
+from src.analytics import MeanCounter, TopN, get_catalog_version
+from src.logger import get_logger
+from src.models import Genre, Movie, movie_genres_table
+from src.top_n import supports_window_functions, top_n_per_group
+
+logger = get_logger(__name__)
+
+CACHE_TIMEOUT = 24 * 3600
+
+
+def _decade_stats():
+    return (
+        select(
+            Movie.release_decade.label("decade_start"),
+            func.count(Movie.id).label("movie_count"),
+            func.avg(Movie.vote_average).label("avg_rating"),
+            func.sum(Movie.revenue).label("total_revenue"),
+        )
+        .where(Movie.release_decade.isnot(None), Movie.vote_count > 0)
+        .group_by(Movie.release_decade)
+    )
+
+
+def _hero_filters():
+    # Card image: the most popular well-known film with a backdrop
+    return (
+        Movie.release_decade.isnot(None),
+        Movie.backdrop_path.isnot(None),
+        Movie.vote_count > 50,
+    )
+
+
+def build_decade_summary(session) -> List[Dict]:
+    """Return one card's worth of stats per decade, oldest first."""
+    if supports_window_functions(session):
+        stats = _decade_stats().subquery("decade_stats")
+        heroes = (
+            select(
+                Movie.release_decade.label("decade_start"),
+                Movie.backdrop_path,
+                func.row_number()
+                .over(
+                    partition_by=Movie.release_decade,
+                    order_by=(desc(Movie.popularity), Movie.id),
+                )
+                .label("rank"),
+            )
+            .where(*_hero_filters())
+            .subquery("decade_heroes")
+        )
+        rows = [
+            dict(row._mapping)
+            for row in session.execute(
+                select(stats, heroes.c.backdrop_path.label("hero_backdrop"))
+                .outerjoin(
+                    heroes,
+                    and_(heroes.c.decade_start == stats.c.decade_start, heroes.c.rank == 1),
+                )
+                .order_by(stats.c.decade_start)
+            )
+        ]
+    else:
+        stat_rows = session.execute(_decade_stats().order_by(Movie.release_decade)).all()
+        heroes = top_n_per_group(
+            session,
+            session.query(Movie).filter(*_hero_filters()),
+            Movie.release_decade,
+            [row.decade_start for row in stat_rows],
+            order_by=desc(Movie.popularity),
+            limit=1,
+            window=False,
+        )
+        rows = []
+        for row in stat_rows:
+            hero = heroes.get(row.decade_start)
+            rows.append(dict(row._mapping, hero_backdrop=hero[0].backdrop_path if hero else None))
+
+    summary = []
+    for row in rows:
+        decade_start = row["decade_start"]
+        summary.append(
+            {
+                "decade_start": decade_start,
+                "decade_end": decade_start + 9,
+                "label": f"{decade_start}s",
+                "movie_count": row["movie_count"],
+                "avg_rating": round(float(row["avg_rating"]), 1) if row["avg_rating"] else 0,
+                "total_revenue": int(row["total_revenue"] or 0),
+                "hero_backdrop": row["hero_backdrop"],
+            }
+        )
+    return summary
+
+
+def _cached(cache, key, build):
+    try:
+        cached = cache.get(key)
+    except Exception as exc:
+        logger.warning(f"Decade cache read failed for {key}: {exc}")
+        cached = None
+    if cached is not None:
+        return cached
+
+    value = build()
+    try:
+        cache.set(key, value, timeout=CACHE_TIMEOUT)
+    except Exception as exc:
+        logger.warning(f"Decade cache write failed for {key}: {exc}")
+    return value
+
+
+def get_decade_summary(session, cache=None) -> List[Dict]:
+    """Return the decade summary, cached until the next catalog sync."""
+    if cache is None:
+        return build_decade_summary(session)
+    key = f"decades:summary:{get_catalog_version(session)}"
+    return _cached(cache, key, lambda: build_decade_summary(session))
+
+
+def _nulls_last(value):
+    # Sort key matching ORDER BY ... DESC NULLS LAST
+    return (value is not None, value or 0)
+
+
+def build_decade_detail(session, decade_start: int, batch_size: int = 2000) -> Optional[Dict]:
+    """Return the stats, chart series and shortlisted movie ids for one decade.
+
+    Returns None when the decade has no rated movies. The result holds only
+    plain values so it can be cached; see ``load_movies`` for the cards.
+    """
+    decade_end = decade_start + 9
+    in_decade = (Movie.release_year >= decade_start, Movie.release_year <= decade_end)
+
+    total_movies = 0
+    rated = MeanCounter()  # vote_count >= 20
+    total_revenue = 0
+    by_year = {}
+    top_rated = TopN(12)
+    most_popular = TopN(12)
+    defining_films = TopN(6)
+
+    rows = (
+        session.query(
+            Movie.id,
+            Movie.release_year,
+            Movie.vote_average,
+            Movie.vote_count,
+            Movie.popularity,
+            Movie.revenue,
+        )
+        .filter(*in_decade)
+        .execution_options(stream_results=True)
+        .yield_per(batch_size)
+    )
+    for movie_id, year, rating, votes, popularity, revenue in rows:
+        rating = float(rating) if rating is not None else None
+        popularity = float(popularity) if popularity is not None else None
+        votes = votes or 0
+
+        by_year.setdefault(year, MeanCounter()).add(rating)
+        if revenue and revenue > 0:
+            total_revenue += revenue
+        if votes <= 0:
+            continue
+
+        total_movies += 1
+        most_popular.push(_nulls_last(popularity), movie_id, movie_id)
+        if votes >= 20:
+            rated.add(rating)
+            top_rated.push(_nulls_last(rating), movie_id, movie_id)
+        if votes >= 50:
+            # Defining films: high rating AND high popularity
+            weight = popularity * rating if popularity is not None and rating is not None else None
+            defining_films.push(_nulls_last(weight), movie_id, movie_id)
+
+    if total_movies == 0:
+        return None
+
+    genre_stats = [
+        {"name": name, "count": count}
+        for name, count in session.query(Genre.name, func.count(movie_genres_table.c.movie_id))
+        .join(movie_genres_table, movie_genres_table.c.genre_id == Genre.id)
+        .join(Movie, Movie.id == movie_genres_table.c.movie_id)
+        .filter(*in_decade)
+        .group_by(Genre.name)
+        .order_by(desc(func.count(movie_genres_table.c.movie_id)), Genre.name)
+    ]
+
+    years = sorted(by_year)
+    return {
+        "stats": {
+            "total_movies": total_movies,
+            "avg_rating": round(rated.mean, 2) if rated.mean else 0,
+            "total_revenue": total_revenue,
+            "top_genre": genre_stats[0]["name"] if genre_stats else "N/A",
+        },
+        "chart_data": {
+            "years": years,
+            "counts": [by_year[y].count for y in years],
+            "ratings": [round(by_year[y].mean, 2) if by_year[y].mean else 0 for y in years],
+        },
+        "genre_stats": genre_stats,
+        "top_rated_ids": top_rated.items(),
+        "most_popular_ids": most_popular.items(),
+        "defining_film_ids": defining_films.items(),
+    }
+
+
+def get_decade_detail(session, decade_start: int, cache=None) -> Optional[Dict]:
+    """Return ``build_decade_detail`` for a decade, cached until the next catalog sync."""
+    if cache is None:
+        return build_decade_detail(session, decade_start)
+    key = f"decades:detail:{decade_start}:{get_catalog_version(session)}"
+    # Empty decades are cached as {} so repeated 404s stay cheap too
+    return _cached(cache, key, lambda: build_decade_detail(session, decade_start) or {}) or None
+
+
+def load_movies(session, *id_lists: List[int]) -> List[List[Movie]]:
+    """Load every listed movie in one query and return them list by list, in order."""
+    wanted = {movie_id for ids in id_lists for movie_id in ids}
+    if not wanted:
+        return [[] for _ in id_lists]
+    by_id = {movie.id: movie for movie in session.query(Movie).filter(Movie.id.in_(wanted))}
+    return [[by_id[i] for i in ids if i in by_id] for ids in id_lists]
@@ -0,0 +1,95 @@
+"""
+SQLAlchemy engine factory.
+
+Every engine the app opens comes from ``create_app_engine`` so pooling and
+per-connection settings live in one place and are driven by Config:
+
+* Postgres: bounded pool with pre-ping and recycling, so connections the
+  Railway proxy dropped while idle are replaced rather than handed to a
+  request. Each connection also gets a server-side statement timeout and an
+  ``application_name`` that identifies it in pg_stat_activity.
+* SQLite: WAL journaling, ``synchronous=NORMAL``, a memory-mapped read window
+  and a busy timeout. Readers then no longer block on the writer, and
+  concurrent writers wait briefly instead of failing with "database is locked".
+
+Connections must never be shared across a fork. When gunicorn preloads the
+app, the master's pool would otherwise be inherited by every worker, so each
+child process drops its inherited pool and opens fresh connections.
+"""
+
+import os
+import weakref
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+
+from config.config import Config
+
+_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+def _postgres_options(statement_timeout_ms: int) -> dict:
+    connect_args = {
+        "application_name": Config.DB_APPLICATION_NAME,
+        "connect_timeout": Config.DB_CONNECT_TIMEOUT,
+    }
+    if statement_timeout_ms:
+        connect_args["options"] = f"-c statement_timeout={statement_timeout_ms}"
+    return {
+        "pool_size": Config.DB_POOL_SIZE,
+        "max_overflow": Config.DB_MAX_OVERFLOW,
+        "pool_timeout": Config.DB_POOL_TIMEOUT,
+        "pool_recycle": Config.DB_POOL_RECYCLE,
+        "pool_pre_ping": Config.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def _apply_sqlite_pragmas(engine: Engine, in_memory: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"PRAGMA busy_timeout = {Config.SQLITE_BUSY_TIMEOUT_MS}")
+            if not in_memory:
+                # WAL and mmap only apply to on-disk databases
+                cursor.execute("PRAGMA journal_mode = WAL")
+                cursor.execute(f"PRAGMA mmap_size = {Config.SQLITE_MMAP_SIZE}")
+            cursor.execute("PRAGMA synchronous = NORMAL")
+        finally:
+            cursor.close()
+
+
+def create_app_engine(url: str = None, statement_timeout_ms: int = None, **kwargs) -> Engine:
+    """Create an engine for ``url`` (default Config.DATABASE_URL) with the app's settings.
+
+    ``statement_timeout_ms`` overrides Config.DB_STATEMENT_TIMEOUT_MS (0 turns
+    it off, e.g. for long-running sync jobs). Extra keyword arguments are
+    passed through to ``create_engine`` and win over the configured defaults.
+    """
+    url = make_url(url or Config.DATABASE_URL)
+    if statement_timeout_ms is None:
+        statement_timeout_ms = Config.DB_STATEMENT_TIMEOUT_MS
+
+    options = {}
+    if url.get_backend_name() == "postgresql":
+        options.update(_postgres_options(statement_timeout_ms))
+    elif url.get_backend_name() != "sqlite":
+        options.update(pool_pre_ping=Config.DB_POOL_PRE_PING, pool_recycle=Config.DB_POOL_RECYCLE)
+    options.update(kwargs)
+
+    engine = create_engine(url, **options)
+    if url.get_backend_name() == "sqlite":
+        _apply_sqlite_pragmas(engine, in_memory=url.database in (None, "", ":memory:"))
+    _engines.add(engine)
+    return engine
+
+
+def _dispose_inherited_pools() -> None:
+    # close=False leaves the parent's sockets alone; the child just forgets them
+    for engine in list(_engines):
+        engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_inherited_pools)
@@ -0,0 +1,180 @@
+"""
+External TMDB enrichment for the movie detail page.
+
+The trailer and watch-provider lookups are independent network calls, so they
+run side by side on a small shared thread pool instead of back to back on the
+gunicorn worker. The page waits at most ``budget`` seconds for both; anything
+still in flight is dropped from this render and written to the cache when it
+lands, so the next view of the movie gets it for free.
+
+Results are cached per tmdb_id and part. Empty results ("no trailer", "not
+streaming anywhere") are cached too, for a shorter time, so films without a
+trailer don't pay a TMDB round trip on every view.
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+POSITIVE_TTL = 6 * 3600
+NEGATIVE_TTL = 15 * 60
+
+
+def select_trailer(videos_data: Dict) -> Optional[Dict]:
+    """Pick the best YouTube video from a TMDB /videos payload."""
+    results = (videos_data or {}).get("results", [])
+
+    youtube_videos = [v for v in results if v.get("site") == "YouTube"]
+    if not youtube_videos:
+        return None
+
+    # Priority: official trailers > any trailer > teasers > any video
+    for filter_fn in [
+        lambda v: v.get("type") == "Trailer" and v.get("official"),
+        lambda v: v.get("type") == "Trailer",
+        lambda v: v.get("type") == "Teaser",
+    ]:
+        matches = [v for v in youtube_videos if filter_fn(v)]
+        if matches:
+            return matches[0]
+
+    return youtube_videos[0]
+
+
+class MovieEnricher:
+    """Run the detail page's TMDB lookups concurrently under a latency budget.
+
+    ``fetchers`` maps a part name (e.g. "trailer") to a callable taking a
+    tmdb_id. ``defaults`` gives the value rendered when a part fails or misses
+    the budget. ``cache`` is any object with Flask-Caching's get/set API.
+    """
+
+    def __init__(
+        self,
+        fetchers: Dict[str, Callable[[int], object]],
+        defaults: Dict[str, object],
+        cache=None,
+        app=None,
+        budget: float = 2.5,
+        max_workers: int = 8,
+    ):
+        self.fetchers = fetchers
+        self.defaults = defaults
+        self.cache = cache
+        self.app = app
+        self.budget = budget
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # Created lazily so gunicorn workers each get their own threads post-fork
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="tmdb-enrich"
+            )
+        return self._executor
+
+    @staticmethod
+    def _cache_key(part: str, tmdb_id: int) -> str:
+        return f"enrichment:{part}:{tmdb_id}"
+
+    def _cache_get(self, part: str, tmdb_id: int):
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(self._cache_key(part, tmdb_id))
+        except Exception as exc:
+            logger.warning(f"Enrichment cache read failed for tmdb_id={tmdb_id}: {exc}")
+            return None
+
+    def _cache_set(self, part: str, tmdb_id: int, value) -> None:
+        if self.cache is None:
+            return
+        timeout = POSITIVE_TTL if value else NEGATIVE_TTL
+        try:
+            # Wrapped so a cached "nothing found" is distinguishable from a miss
+            self.cache.set(self._cache_key(part, tmdb_id), {"value": value}, timeout=timeout)
+        except Exception as exc:
+            logger.warning(f"Enrichment cache write failed for tmdb_id={tmdb_id}: {exc}")
+
+    def _fetch(self, part: str, tmdb_id: int):
+        try:
+            return self.fetchers[part](tmdb_id)
+        except Exception as exc:
+            logger.warning(
+                f"Unable to fetch {part} for tmdb_id={tmdb_id}: {exc}",
+                exc_info=True,
+            )
+            raise
+
+    def _store_late_result(self, part: str, tmdb_id: int):
+        """Cache a result that arrived after the page was already rendered."""
+
+        def _callback(future):
+            if future.cancelled() or future.exception() is not None:
+                return
+            if self.app is not None:
+                with self.app.app_context():
+                    self._cache_set(part, tmdb_id, future.result())
+            else:
+                self._cache_set(part, tmdb_id, future.result())
+
+        return _callback
+
+    def cached(self, tmdb_id: int) -> Optional[Dict]:
+        """Return every part from cache without touching TMDB, or None on any miss."""
+        result = {}
+        for part in self.fetchers:
+            cached = self._cache_get(part, tmdb_id)
+            if cached is None:
+                return None
+            result[part] = cached["value"]
+        result["complete"] = True
+        return result
+
+    def enrich(self, tmdb_id: int, budget: Optional[float] = None) -> Dict:
+        """Return every part for ``tmdb_id``, plus ``complete`` when none were dropped."""
+        budget = self.budget if budget is None else budget
+        result = {}
+        pending = {}
+
+        for part in self.fetchers:
+            cached = self._cache_get(part, tmdb_id)
+            if cached is not None:
+                result[part] = cached["value"]
+            else:
+                # Run in a copy of this context so TMDB time is charged to the request
+                fetch = contextvars.copy_context().run
+                pending[self.executor.submit(fetch, self._fetch, part, tmdb_id)] = part
+
+        complete = True
+        if pending:
+            done, not_done = wait(pending, timeout=budget)
+            for future in done:
+                part = pending[future]
+                if future.exception() is not None:
+                    # Errors are not cached; the next view retries the lookup
+                    result[part] = self.defaults.get(part)
+                    complete = False
+                    continue
+                value = future.result()
+                result[part] = value
+                self._cache_set(part, tmdb_id, value)
+            for future in not_done:
+                part = pending[future]
+                result[part] = self.defaults.get(part)
+                future.add_done_callback(self._store_late_result(part, tmdb_id))
+                complete = False
+            if not_done:
+                logger.warning(
+                    f"Enrichment budget of {budget}s exceeded for tmdb_id={tmdb_id}",
+                    extra={"tmdb_id": tmdb_id, "dropped": sorted(pending[f] for f in not_done)},
+                )
+
+        result["complete"] = complete
+        return result
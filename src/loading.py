@@ -0,0 +1,17 @@
+"""
+Relationship loading policies for routes that render many movies.
+
+Relationships on the models stay lazy, so single-object code paths only load
+what they touch. A route that serializes a list of movies applies one of the
+policies below to its query instead. Each relationship it reads then costs
+one extra SELECT for the whole page rather than one per movie.
+
+    session.query(Movie).options(*MOVIE_LIST).limit(100).all()
+"""
+
+from sqlalchemy.orm import selectinload
+
+from src.models import Movie
+
+# Movie cards and list payloads that show each movie's genres
+MOVIE_LIST = (selectinload(Movie.genres),)
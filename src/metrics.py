@@ -0,0 +1,131 @@
+"""
+Prometheus metrics served at /metrics.
+
+Request latency histograms and status counts are recorded per route
+template (e.g. ``/movie/<int:movie_id>``), so the label set stays bounded
+whatever URLs clients send. The module also tracks Flask-Caching hits and
+misses, TMDB call latency and errors, and DB pool gauges.
+
+Under gunicorn every worker is a separate process. When
+PROMETHEUS_MULTIPROC_DIR is set, which gunicorn.conf.py does, prometheus_client
+writes each worker's samples to files in that directory. /metrics then
+aggregates them, whichever worker handles the scrape. Without it, as in local
+dev and tests, the default in-process registry is served.
+"""
+
+import os
+import re
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REQUESTS = Counter(
+    "http_requests_total",
+    "Completed requests by route template and status",
+    ["method", "route", "status"],
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Flask-Caching lookups by result",
+    ["result"],
+)
+TMDB_LATENCY = Histogram(
+    "tmdb_request_duration_seconds",
+    "TMDB API call latency (network calls only, cache hits excluded)",
+    ["endpoint"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+TMDB_ERRORS = Counter(
+    "tmdb_request_errors_total",
+    "Failed TMDB API calls",
+    ["endpoint", "reason"],
+)
+# livesum: the scrape reports the total across live workers
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the SQLAlchemy pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections open beyond the pool's base size",
+    multiprocess_mode="livesum",
+)
+
+_NUMERIC_SEGMENT = re.compile(r"(?<=/)\d+(?=/|$)")
+
+
+def tmdb_endpoint_label(endpoint: str) -> str:
+    """Collapse ids out of a TMDB path: ``movie/550/videos`` -> ``movie/{id}/videos``."""
+    return _NUMERIC_SEGMENT.sub("{id}", "/" + endpoint.strip("/"))[1:]
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    REQUEST_LATENCY.labels(method=method, route=route).observe(seconds)
+    REQUESTS.labels(method=method, route=route, status=str(status)).inc()
+
+
+def observe_pool(pool) -> None:
+    """Update the pool gauges; pools without checkout tracking are skipped."""
+    if hasattr(pool, "checkedout"):
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+    if hasattr(pool, "overflow"):
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+
+@contextmanager
+def time_tmdb(endpoint: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        TMDB_LATENCY.labels(endpoint=tmdb_endpoint_label(endpoint)).observe(
+            time.perf_counter() - started
+        )
+
+
+def record_tmdb_error(endpoint: str, reason: str) -> None:
+    TMDB_ERRORS.labels(endpoint=tmdb_endpoint_label(endpoint), reason=reason).inc()
+
+
+def instrument_cache(app, cache) -> None:
+    """Count hits and misses on the cache backend behind ``cache``.
+
+    The backend's ``get`` is wrapped rather than ``Cache.get``, so lookups
+    made by ``@cache.cached`` views are counted too.
+    """
+    backend = app.extensions["cache"][cache]
+    backend_get = backend.get
+
+    def get(*args, **kwargs):
+        value = backend_get(*args, **kwargs)
+        CACHE_REQUESTS.labels(result="miss" if value is None else "hit").inc()
+        return value
+
+    backend.get = get
+
+
+def render_latest():
+    """Return ``(body, content_type)`` for the /metrics response."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
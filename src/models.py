@@ -1,5 +1,7 @@
+import math
+import threading
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from sqlalchemy import (
     DECIMAL,
@@ -8,6 +10,7 @@ from sqlalchemy import (
     Column,
     Date,
     DateTime,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -15,17 +18,48 @@ from sqlalchemy import (
     Table,
     Text,
     UniqueConstraint,
-    create_engine,
+    event,
+    func,
+    literal_column,
 )
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.orm import relationship, sessionmaker, validates
+from sqlalchemy.schema import DDL
 from werkzeug.security import check_password_hash, generate_password_hash
 
 from config.config import Config
+from src.engine import create_app_engine
+from src.replicas import ReplicaSet, RoutingSession
 
 Base = declarative_base()
-engine = create_engine(Config.DATABASE_URL)
-Session = sessionmaker(bind=engine)
+engine = create_app_engine(Config.DATABASE_URL)
+replicas = ReplicaSet(
+    [create_app_engine(url) for url in Config.DATABASE_REPLICA_URLS],
+    retry_after=Config.REPLICA_RETRY_SECONDS,
+)
+Session = sessionmaker(bind=engine, class_=RoutingSession, replicas=replicas)
+
+
+_job_lock = threading.Lock()
+_job_sessionmaker = None
+
+
+def job_session():
+    """Session for batch jobs: primary only, with Config.DB_JOB_STATEMENT_TIMEOUT_MS
+    in place of the web request statement timeout.
+
+    The job engine is created on first use and shared by every later call.
+    """
+    global _job_sessionmaker
+    if _job_sessionmaker is None:
+        with _job_lock:
+            if _job_sessionmaker is None:
+                job_engine = create_app_engine(
+                    Config.DATABASE_URL, statement_timeout_ms=Config.DB_JOB_STATEMENT_TIMEOUT_MS
+                )
+                _job_sessionmaker = sessionmaker(bind=job_engine)
+    return _job_sessionmaker()
+
 
 # Association tables for many-to-many relationships
 movie_genres_table = Table(
@@ -34,6 +68,8 @@ movie_genres_table = Table(
     Column("movie_id", Integer, ForeignKey("movies.id"), primary_key=True),
     Column("genre_id", Integer, ForeignKey("genres.id"), primary_key=True),
     Index("idx_movie_genres_genre_id", "genre_id"),
+    # Covers genre filters without a lookup into the link table itself
+    Index("idx_movie_genres_genre_movie", "genre_id", "movie_id"),
 )
 
 movie_companies_table = Table(
@@ -105,6 +141,37 @@ class User(Base):
         return f"<User(username='{self.username}')>"
 
 
+# Movies need this many votes before their rating is trusted for a gem score
+GEM_MIN_VOTES = 50
+
+
+def compute_gem_score(vote_average, popularity, vote_count) -> Optional[float]:
+    """Rating discounted by log popularity: high for well-rated, little-seen films.
+
+    Returns None when the movie isn't eligible to be a hidden gem at all
+    (missing data or fewer than GEM_MIN_VOTES votes).
+    """
+    if vote_average is None or popularity is None or (vote_count or 0) < GEM_MIN_VOTES:
+        return None
+    return round(float(vote_average) / (math.log10(float(popularity) + 2) * 2), 4)
+
+
+# Postgres full-text search config; the search index and src/search.py must agree
+SEARCH_TS_CONFIG = "english"
+
+
+def movie_search_document(title, overview):
+    """Postgres tsvector for a movie; title terms are weighted above overview terms."""
+    config = literal_column(f"'{SEARCH_TS_CONFIG}'::regconfig")
+
+    def weighted(column, weight):
+        return func.setweight(
+            func.to_tsvector(config, func.coalesce(column, "")), literal_column(f"'{weight}'")
+        )
+
+    return weighted(title, "A").op("||")(weighted(overview, "B"))
+
+
 class Movie(Base):
     __tablename__ = "movies"
 
@@ -114,12 +181,17 @@ class Movie(Base):
     original_title = Column(String(255))
     overview = Column(Text)
     release_date = Column(Date)
+    # Denormalized from release_date so year/decade facets can use an index
+    release_year = Column(Integer)
+    release_decade = Column(Integer)
     runtime = Column(Integer)
     budget = Column(BigInteger)
     revenue = Column(BigInteger)
     popularity = Column(DECIMAL(10, 2))
     vote_average = Column(DECIMAL(3, 1))
     vote_count = Column(Integer)
+    # Persisted compute_gem_score(); NULL means not in the hidden-gems pool
+    gem_score = Column(Float)
     poster_path = Column(String(255))
     backdrop_path = Column(String(255))
     imdb_id = Column(String(20))
@@ -134,6 +206,42 @@ class Movie(Base):
         Index("idx_movies_release_date", "release_date"),
         Index("idx_movies_vote_average", "vote_average"),
         Index("idx_movies_popularity", "popularity"),
+        Index("idx_movies_release_year", "release_year"),
+        Index("idx_movies_release_decade", "release_decade"),
+        # Composite indexes shaped after the hot listing queries (migration 008):
+        # "vote_count > N ORDER BY vote_average" filters inside the index scan,
+        # and the hidden-gems / movie-of-the-day pool is a popularity range
+        # with its rating and vote floors checked without touching the table.
+        Index("idx_movies_vote_average_vote_count", "vote_average", "vote_count"),
+        Index("idx_movies_hidden_gems", "popularity", "vote_average", "vote_count"),
+        # /hidden-gems walks this in gem_score order, checking its filters in-index
+        Index("idx_movies_gem_score", "gem_score", "vote_average", "popularity"),
+        # Postgres can't walk a plain ascending index for "DESC NULLS LAST, id
+        # DESC", which is how the paginated listings sort, so it gets indexes in
+        # exactly that order. SQLite already serves these from the single-column
+        # indexes above, since its DESC order puts NULLs last.
+        Index(
+            "idx_movies_popularity_listing",
+            popularity.desc().nulls_last(),
+            id.desc(),
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "idx_movies_vote_average_listing",
+            vote_average.desc().nulls_last(),
+            id.desc(),
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "idx_movies_release_date_listing",
+            release_date.desc().nulls_last(),
+            id.desc(),
+        ).ddl_if(dialect="postgresql"),
+        # Full-text search (src/search.py). SQLite uses the movies_fts table
+        # defined below instead.
+        Index(
+            "idx_movies_search",
+            movie_search_document(title, overview),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
     )
 
     # Relationships
@@ -165,10 +273,72 @@ class Movie(Base):
         "Collection", secondary=collection_movies_table, back_populates="movies"
     )
 
+    @validates("release_date")
+    def _set_release_year(self, key, release_date):
+        """Keep release_year/release_decade in step with every release_date write."""
+        self.release_year = release_date.year if release_date else None
+        self.release_decade = release_date.year // 10 * 10 if release_date else None
+        return release_date
+
+    @validates("vote_average", "popularity", "vote_count")
+    def _set_gem_score(self, key, value):
+        """Recompute gem_score whenever one of its inputs is written."""
+        inputs = {
+            "vote_average": self.vote_average,
+            "popularity": self.popularity,
+            "vote_count": self.vote_count,
+        }
+        inputs[key] = value
+        self.gem_score = compute_gem_score(**inputs)
+        return value
+
     def __repr__(self):
         return f"<Movie(title='{self.title}', year={self.release_date.year if self.release_date else 'N/A'})>"
 
 
+# SQLite full-text search: an FTS5 index over movies.title/overview that
+# stores no text of its own (content='movies'). Triggers keep it in step with
+# every write, whichever code path makes it. Migration 010 creates the same
+# objects on existing databases.
+MOVIES_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+        title, overview, content='movies', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_insert AFTER INSERT ON movies BEGIN
+        INSERT INTO movies_fts(rowid, title, overview)
+        VALUES (new.id, new.title, new.overview);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, overview)
+        VALUES ('delete', old.id, old.title, old.overview);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_fts_update AFTER UPDATE OF title, overview ON movies
+    BEGIN
+        INSERT INTO movies_fts(movies_fts, rowid, title, overview)
+        VALUES ('delete', old.id, old.title, old.overview);
+        INSERT INTO movies_fts(rowid, title, overview)
+        VALUES (new.id, new.title, new.overview);
+    END
+    """,
+)
+
+for _statement in MOVIES_FTS_DDL:
+    event.listen(Movie.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    Movie.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS movies_fts").execute_if(dialect="sqlite"),
+)
+
+
 # NEW: Rating model for Feature 1
 class Rating(Base):
     __tablename__ = "ratings"
@@ -260,6 +430,47 @@ class MovieOfTheDay(Base):
         return f"<MovieOfTheDay(movie_id={self.movie_id}, shown_date={self.shown_date})>"
 
 
+class AnalyticsSnapshot(Base):
+    """Serialized dashboard aggregates, rebuilt by the import and sync jobs."""
+
+    __tablename__ = "analytics_snapshots"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), unique=True, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON
+    refreshed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<AnalyticsSnapshot(name='{self.name}', refreshed_at={self.refreshed_at})>"
+
+
+class MovieSimilarity(Base):
+    """Precomputed nearest neighbours of a movie, rebuilt by the import and sync jobs."""
+
+    __tablename__ = "movie_similar"
+
+    movie_id = Column(Integer, ForeignKey("movies.id"), primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 0 = most similar
+    similar_movie_id = Column(Integer, ForeignKey("movies.id"), nullable=False)
+    score = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<MovieSimilarity(movie_id={self.movie_id}, rank={self.rank}, similar={self.similar_movie_id})>"
+
+
+class UserTasteProfile(Base):
+    """A user's weighted genre/person preferences, kept in step with their activity."""
+
+    __tablename__ = "user_taste_profiles"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    weights = Column(Text, nullable=False)  # JSON {"genre:18": 2.5, "director:42": 1.0}
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<UserTasteProfile(user_id={self.user_id}, updated_at={self.updated_at})>"
+
+
 class Genre(Base):
     __tablename__ = "genres"
 
@@ -0,0 +1,118 @@
+"""
+Keyset (seek) pagination for movie listings.
+
+OFFSET pagination makes the database walk and discard every earlier row, so
+page 500 of /api/v1/movies costs 500 pages of work. A keyset cursor instead
+remembers the last row's ``(sort value, id)`` and asks for rows strictly after
+it in the listing's order, which an index on the sort column answers directly.
+
+Cursors are opaque URL-safe tokens. They carry the sort they were issued for,
+so a cursor can't be replayed against a different ordering.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import and_, or_
+
+from src.models import Movie
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor can't be decoded for the requested sort."""
+
+
+# sort name -> (column, ascending, decoder for the cursor's stored value)
+MOVIE_SORTS = {
+    "popularity": (Movie.popularity, False, Decimal),
+    "rating": (Movie.vote_average, False, Decimal),
+    "release_date": (Movie.release_date, False, date.fromisoformat),
+    "title": (Movie.title, True, str),
+}
+DEFAULT_MOVIE_SORT = "popularity"
+
+
+def _sort_spec(sort_by):
+    return MOVIE_SORTS.get(sort_by, MOVIE_SORTS[DEFAULT_MOVIE_SORT])
+
+
+def order_movies(query, sort_by):
+    """Apply the listing order for ``sort_by`` with ``Movie.id`` as tie-breaker.
+
+    The tie-breaker makes the order total, which keyset pagination needs, and
+    NULLs always sort last so SQLite and Postgres page identically.
+    """
+    column, ascending, _ = _sort_spec(sort_by)
+    if ascending:
+        return query.order_by(column.asc().nulls_last(), Movie.id.asc())
+    return query.order_by(column.desc().nulls_last(), Movie.id.desc())
+
+
+def encode_cursor(sort_by, movie):
+    """Build the cursor pointing just past ``movie`` in the ``sort_by`` order."""
+    column, _, _ = _sort_spec(sort_by)
+    value = getattr(movie, column.key)
+    if isinstance(value, date):
+        value = value.isoformat()
+    elif isinstance(value, Decimal):
+        value = str(value)
+    payload = json.dumps({"s": sort_by, "v": value, "id": movie.id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(sort_by, token):
+    """Return ``(value, id)`` from ``token``, or raise InvalidCursor."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort_by or not isinstance(payload["id"], int):
+            raise InvalidCursor("cursor was issued for a different sort")
+        _, _, decoder = _sort_spec(sort_by)
+        value = payload["v"]
+        return (None if value is None else decoder(value)), payload["id"]
+    except InvalidCursor:
+        raise
+    except (
+        binascii.Error,
+        InvalidOperation,
+        KeyError,
+        TypeError,
+        UnicodeDecodeError,
+        ValueError,
+    ) as exc:
+        raise InvalidCursor("malformed cursor") from exc
+
+
+def seek_movies(query, sort_by, token):
+    """Restrict an ordered movie query to rows after the cursor ``token``."""
+    value, last_id = decode_cursor(sort_by, token)
+    column, ascending, _ = _sort_spec(sort_by)
+    after_id = Movie.id > last_id if ascending else Movie.id < last_id
+
+    if value is None:
+        # Already inside the trailing block of NULL sort values
+        return query.filter(column.is_(None), after_id)
+
+    after_value = column > value if ascending else column < value
+    return query.filter(or_(after_value, and_(column == value, after_id), column.is_(None)))
+
+
+def fetch_page(query, sort_by, limit, cursor=None, offset=0):
+    """Fetch one page of an ordered movie query.
+
+    Returns ``(rows, next_cursor)``. One extra row is read to tell whether
+    another page exists, so no COUNT is needed to stop an infinite scroll.
+    """
+    if cursor:
+        query = seek_movies(query, sort_by, cursor)
+    elif offset:
+        query = query.offset(offset)
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(sort_by, rows[-1])
@@ -0,0 +1,166 @@
+"""
+In-memory actor name index for the Common Films autocomplete.
+
+``/api/v1/actors/search`` is called on every (debounced) keystroke. Running
+a substring ILIKE plus a GROUP BY over the whole cast table each time costs
+far more than the lookup needs. ``ActorNameIndex`` is an immutable snapshot
+of every credited actor. It holds:
+
+* names ranked by movie count, best first, so a search can stop after
+  ``limit`` hits;
+* posting lists from each 2- and 3-character gram of a casefolded name to
+  the ranks of the names that contain it. A query scans the shortest list
+  for one of its grams and checks each name for the full substring.
+
+The ``with`` constraint ("acted alongside everyone already picked") comes
+from the co-star graph (src/costar_graph.py). Its counts are passed in as
+``within``.
+
+``VersionedIndex`` holds one snapshot per process and rebuilds it when
+``get_catalog_version`` changes, i.e. after a sync. While a rebuild runs,
+other threads keep answering from the previous snapshot.
+"""
+
+import threading
+from array import array
+from typing import Callable, Dict, Iterable, List, Mapping, Optional
+
+from sqlalchemy import distinct, func, select
+
+from src.analytics import get_catalog_version
+from src.logger import get_logger
+from src.models import Cast, Person
+
+logger = get_logger(__name__)
+
+# Queries shorter than this are not served (the UI waits for two characters)
+MIN_QUERY_LENGTH = 2
+BATCH_SIZE = 5000
+
+
+def _grams(text: str) -> Iterable[str]:
+    """Every 2- and 3-character slice of ``text``."""
+    for size in (2, 3):
+        for start in range(len(text) - size + 1):
+            yield text[start : start + size]
+
+
+class ActorNameIndex:
+    """Snapshot of credited actors, searchable by name substring."""
+
+    def __init__(self, people: Iterable[tuple]):
+        """Build from ``(id, name, profile_path, movie_count)`` rows."""
+        ranked = sorted(
+            (
+                (person_id, name or "", profile_path, count)
+                for person_id, name, profile_path, count in people
+            ),
+            key=lambda row: (-row[3], row[1].casefold(), row[0]),
+        )
+
+        self.ids: List[int] = [row[0] for row in ranked]
+        self.names: List[str] = [row[1] for row in ranked]
+        self.profile_paths: List[Optional[str]] = [row[2] for row in ranked]
+        self.movie_counts: List[int] = [row[3] for row in ranked]
+        self._keys: List[str] = [name.casefold() for name in self.names]
+        self._rank: Dict[int, int] = {person_id: rank for rank, person_id in enumerate(self.ids)}
+
+        postings: Dict[str, array] = {}
+        for rank, key in enumerate(self._keys):
+            for gram in set(_grams(key)):
+                postings.setdefault(gram, array("I")).append(rank)
+        self._postings = postings
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _result(self, rank: int, movie_count: int) -> dict:
+        return {
+            "id": self.ids[rank],
+            "name": self.names[rank],
+            "profile_path": self.profile_paths[rank],
+            "movie_count": movie_count,
+        }
+
+    def search(
+        self, text: str, limit: int, within: Optional[Mapping[int, int]] = None
+    ) -> List[dict]:
+        """Actors whose name contains ``text``, most credited first.
+
+        ``within`` maps person IDs to a count (e.g. films shared with the
+        actors already picked). When given, only those people are returned,
+        ranked by and reporting that count as ``movie_count``.
+        """
+        key = (text or "").casefold()
+        if len(key) < MIN_QUERY_LENGTH or limit <= 0:
+            return []
+        if within is not None:
+            return self._search_within(key, limit, within)
+
+        candidates = [self._postings.get(gram) for gram in set(_grams(key))]
+        if not all(candidates):
+            return []
+        results = []
+        for rank in min(candidates, key=len):
+            if key in self._keys[rank]:
+                results.append(self._result(rank, self.movie_counts[rank]))
+                if len(results) == limit:
+                    break
+        return results
+
+    def _search_within(self, key: str, limit: int, within: Mapping[int, int]) -> List[dict]:
+        matches = []
+        for person_id, count in within.items():
+            rank = self._rank.get(person_id)
+            if rank is not None and key in self._keys[rank]:
+                matches.append((-count, rank))
+        matches.sort()
+        return [self._result(rank, -negative) for negative, rank in matches[:limit]]
+
+
+def build_actor_name_index(session, batch_size: int = BATCH_SIZE) -> ActorNameIndex:
+    """Load every credited actor with their movie count and build a fresh index."""
+    movie_count = func.count(distinct(Cast.movie_id))
+    people = session.execute(
+        select(Person.id, Person.name, Person.profile_path, movie_count)
+        .join(Cast, Cast.person_id == Person.id)
+        .group_by(Person.id, Person.name, Person.profile_path)
+        .execution_options(yield_per=batch_size)
+    )
+    return ActorNameIndex(people)
+
+
+class VersionedIndex:
+    """Per-process holder that rebuilds its index when the catalog changes."""
+
+    def __init__(self, build: Callable, name: str):
+        self.build = build
+        self.name = name
+        self._index = None
+        self._version = None
+        self._lock = threading.Lock()
+
+    def get(self, session):
+        version = get_catalog_version(session)
+        if self._index is not None and self._version == version:
+            return self._index
+
+        # The first build blocks; later ones are done by a single thread
+        # while the rest keep serving the previous snapshot
+        if self._index is None:
+            self._lock.acquire()
+        elif not self._lock.acquire(blocking=False):
+            return self._index
+        try:
+            if self._index is None or self._version != version:
+                index = self.build(session)
+                self._index, self._version = index, version
+                logger.info(f"Built {self.name} index ({len(index)} entries) for {version}")
+            return self._index
+        finally:
+            self._lock.release()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = None
+            self._version = None
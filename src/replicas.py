@@ -0,0 +1,108 @@
+"""
+Read-replica routing.
+
+When DATABASE_REPLICA_URLS is set, a ``RoutingSession`` can send its reads
+to one of the replicas and everything else to the primary. The app opts a
+request's session into replica reads only for safe (GET/HEAD) requests; see
+``get_db_session`` in app.py. Sessions created anywhere else (sync scripts,
+migrations, tests) stay on the primary.
+
+A session picks one replica on its first read and keeps it. That way a page
+reads from one consistent snapshot over a single connection. Replicas are
+handed out round-robin. A replica that fails with a connection error is taken
+out of rotation for ``retry_after`` seconds. While every replica is out,
+reads go to the primary.
+
+As soon as a session writes (a flush, or an INSERT/UPDATE/DELETE statement),
+it switches to the primary for the rest of its life, so it reads back what it
+just wrote. Raw ``text()`` writes are not detected and must run on a session
+that is not using replicas.
+
+Code on a safe request that reads and then writes on the strength of that
+read (insert-if-missing) calls ``use_primary`` before the read. A lagging
+replica could otherwise hide a row that already exists on the primary.
+"""
+
+import itertools
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class ReplicaSet:
+    """Round-robin over healthy replica engines."""
+
+    def __init__(self, engines: List[Engine], retry_after: float = 30.0):
+        self.engines = list(engines)
+        self.retry_after = retry_after
+        self._down_until = {}
+        self._cycle = itertools.cycle(self.engines) if self.engines else None
+        self._lock = threading.Lock()
+        for engine in self.engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def __bool__(self):
+        return bool(self.engines)
+
+    def choose(self) -> Optional[Engine]:
+        """Next healthy replica, or None when there is none."""
+        if not self.engines:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                engine = next(self._cycle)
+                if self._down_until.get(engine, 0) <= now:
+                    return engine
+        return None
+
+    def mark_down(self, engine: Engine) -> None:
+        with self._lock:
+            self._down_until[engine] = time.monotonic() + self.retry_after
+        logger.warning(
+            f"Read replica {engine.url.render_as_string(hide_password=True)} "
+            f"taken out of rotation for {self.retry_after:.0f}s"
+        )
+
+    def _on_error(self, context):
+        # Connection-level failures only; a bad query says nothing about health
+        if context.is_disconnect or context.connection is None:
+            self.mark_down(context.engine)
+
+
+class RoutingSession(Session):
+    """Session that can read from a replica and always writes to the primary."""
+
+    def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.use_replicas = False
+        self.wrote = False
+        self._replica = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or getattr(clause, "is_dml", False):
+            self.wrote = True
+        if self.use_replicas and self.replicas and not self.wrote:
+            if self._replica is None:
+                self._replica = self.replicas.choose()
+            if self._replica is not None:
+                return self._replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+def use_primary(session) -> None:
+    """Send the rest of ``session``'s statements to the primary.
+
+    A no-op for sessions that don't route reads to replicas.
+    """
+    if isinstance(session, RoutingSession):
+        session.use_replicas = False
@@ -0,0 +1,131 @@
+"""
+Per-request database and TMDB timing.
+
+``duration_ms`` alone can't say why a request was slow. The request logger
+starts a ``RequestMetrics`` for every request. SQLAlchemy cursor events and
+the TMDB client then report into it: how many statements ran, how long the
+database took in total, which statement was slowest, and how much time went
+to TMDB. The totals are added to the request's log line and returned in a
+``Server-Timing`` header, so they also show up in browser dev tools.
+
+The listeners are attached to the Engine class, so every engine the app
+creates is covered. Outside a request (sync jobs, shell) they do nothing.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Long statements are cut down to this many characters in the log line
+SLOWEST_STATEMENT_CHARS = 300
+
+_current: ContextVar[Optional["RequestMetrics"]] = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Running totals for one request. Safe to update from worker threads."""
+
+    def __init__(self):
+        self.statement_count = 0
+        self.db_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement = None
+        self.tmdb_calls = 0
+        self.tmdb_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record_statement(self, statement: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.statement_count += 1
+            self.db_ms += elapsed_ms
+            if elapsed_ms >= self.slowest_ms:
+                self.slowest_ms = elapsed_ms
+                self.slowest_statement = statement
+
+    def record_tmdb(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.tmdb_calls += 1
+            self.tmdb_ms += elapsed_ms
+
+    def log_fields(self) -> Dict:
+        """Fields merged into the request's JSON log line."""
+        slowest = self.slowest_statement
+        if slowest is not None:
+            slowest = " ".join(slowest.split())[:SLOWEST_STATEMENT_CHARS]
+        return {
+            "db_statements": self.statement_count,
+            "db_ms": round(self.db_ms, 1),
+            "db_slowest_ms": round(self.slowest_ms, 1),
+            "db_slowest_statement": slowest,
+            "tmdb_calls": self.tmdb_calls,
+            "tmdb_ms": round(self.tmdb_ms, 1),
+        }
+
+    def server_timing(self, total_ms: float) -> str:
+        """Value for the Server-Timing response header."""
+        return ", ".join(
+            [
+                f'db;dur={self.db_ms:.1f};desc="{self.statement_count} statements"',
+                f'tmdb;dur={self.tmdb_ms:.1f};desc="{self.tmdb_calls} calls"',
+                f"total;dur={total_ms:.1f}",
+            ]
+        )
+
+
+def start_request() -> RequestMetrics:
+    """Begin collecting for the current request, replacing any stale collector."""
+    metrics = RequestMetrics()
+    _current.set(metrics)
+    return metrics
+
+
+def end_request() -> Optional[RequestMetrics]:
+    """Stop collecting and return what the current request recorded."""
+    metrics = _current.get()
+    _current.set(None)
+    return metrics
+
+
+def current() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+@contextmanager
+def track_tmdb():
+    """Time a TMDB network call against the current request, if any."""
+    metrics = _current.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.record_tmdb((time.perf_counter() - started) * 1000)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("request_metrics_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("request_metrics_started")
+    if not started:
+        return
+    elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.record_statement(statement, elapsed_ms)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    started = context.connection.info.get("request_metrics_started") if context.connection else None
+    if started:
+        started.pop()
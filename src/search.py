@@ -0,0 +1,80 @@
+"""
+Full-text movie search over title and overview.
+
+``apply_text_search`` narrows a Movie query to the rows matching a search
+box string and returns ORDER BY terms for relevance. The ranking is
+backed by an index on both databases:
+
+* SQLite: the ``movies_fts`` FTS5 table (see models.py), ranked by BM25
+  with title hits weighted above overview hits.
+* Postgres: a GIN index over ``movie_search_document()``, ranked by
+  ``ts_rank`` on the same weighted vector.
+
+Each word of the input becomes a prefix term, and all terms must match. So
+"matri reload" finds "The Matrix Reloaded" as the user types. Input with no
+searchable words, and other databases, fall back to the old substring
+match without a relevance order, as does Postgres input made only of
+stopwords.
+"""
+
+import re
+from typing import List, Tuple
+
+from sqlalchemy import Integer, column, desc, func, literal_column, select, table
+
+from src.models import SEARCH_TS_CONFIG, Movie, movie_search_document
+
+# Longer inputs are truncated; extra words rarely change the top results
+MAX_TERMS = 8
+# BM25 column weights for (title, overview)
+TITLE_WEIGHT = 10.0
+OVERVIEW_WEIGHT = 1.0
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_movies_fts = table("movies_fts", column("rowid", Integer))
+
+
+def search_terms(text: str) -> List[str]:
+    """Lowercased words of ``text``, at most MAX_TERMS of them."""
+    return [word.lower() for word in _WORD.findall(text or "")][:MAX_TERMS]
+
+
+def _substring_match(query, text: str):
+    pattern = f"%{text}%"
+    return query.filter(Movie.title.ilike(pattern) | Movie.overview.ilike(pattern))
+
+
+def apply_text_search(session, query, text: str) -> Tuple[object, tuple]:
+    """Filter ``query`` to movies matching ``text``.
+
+    Returns ``(query, relevance)``. ``relevance`` holds the ORDER BY terms
+    that put the best match first; it is empty when the fallback substring
+    match was used.
+    """
+    terms = search_terms(text)
+    dialect = session.get_bind().dialect.name
+    if not terms or dialect not in ("sqlite", "postgresql"):
+        return _substring_match(query, text), ()
+
+    if dialect == "sqlite":
+        # Quoted so FTS5 operators typed by users (AND, NEAR, ...) stay literal
+        match = " AND ".join(f'"{term}"*' for term in terms)
+        fts = literal_column("movies_fts")
+        query = query.join(_movies_fts, _movies_fts.c.rowid == Movie.id).filter(
+            fts.op("MATCH")(match)
+        )
+        # bm25() is lower-is-better
+        return query, (func.bm25(fts, TITLE_WEIGHT, OVERVIEW_WEIGHT),)
+
+    ts_query = func.to_tsquery(
+        literal_column(f"'{SEARCH_TS_CONFIG}'::regconfig"),
+        " & ".join(f"{term}:*" for term in terms),
+    )
+    # Titles made only of stopwords ("It", "Up", "The Who") reduce to an empty
+    # tsquery, which matches nothing
+    if not session.scalar(select(func.numnode(ts_query))):
+        return _substring_match(query, text), ()
+
+    document = movie_search_document(Movie.title, Movie.overview)
+    query = query.filter(document.op("@@")(ts_query))
+    return query, (desc(func.ts_rank(document, ts_query)),)
@@ -0,0 +1,92 @@
+"""
+Degrees of separation between two people.
+
+``find_connection`` asks the collaboration graph (cast and crew credits,
+see src/costar_graph.py) for the shortest chain of shared films. It then
+loads the names and titles along it. Only the bare ids of a chain are
+cached, under the catalog version and the unordered pair, so a popular
+pair costs one graph search per sync whichever way round it is asked.
+"""
+
+from typing import Dict, Optional
+
+from src.analytics import get_catalog_version
+from src.logger import get_logger
+from src.models import Movie, Person
+
+logger = get_logger(__name__)
+
+CACHE_TIMEOUT = 24 * 3600
+
+
+def _path_ids(session, graph, source_id: int, target_id: int, cache) -> Optional[Dict]:
+    low, high = sorted((source_id, target_id))
+    key = f"people:path:{low}:{high}:{get_catalog_version(session)}" if cache else None
+    cached = None
+    if key:
+        try:
+            cached = cache.get(key)
+        except Exception as exc:
+            logger.warning(f"Path cache read failed for {key}: {exc}")
+
+    if cached is None:
+        path = graph.shortest_path(low, high)
+        # Unconnected pairs are cached as {} so repeat lookups stay cheap too
+        cached = {"people": path[0], "movies": path[1]} if path else {}
+        if key:
+            try:
+                cache.set(key, cached, timeout=CACHE_TIMEOUT)
+            except Exception as exc:
+                logger.warning(f"Path cache write failed for {key}: {exc}")
+
+    if not cached:
+        return None
+    if low == source_id:
+        return cached
+    return {"people": cached["people"][::-1], "movies": cached["movies"][::-1]}
+
+
+def find_connection(session, graph, source_id: int, target_id: int, cache=None) -> Optional[Dict]:
+    """Shortest co-appearance chain from one person to another.
+
+    Returns ``{"degrees", "people", "movies"}`` with the people and linking
+    films in order, or None when no chain exists within the graph's limits.
+    """
+    ids = _path_ids(session, graph, source_id, target_id, cache)
+    if ids is None:
+        return None
+
+    people = {
+        p.id: p
+        for p in session.query(Person.id, Person.name, Person.profile_path).filter(
+            Person.id.in_(ids["people"])
+        )
+    }
+    movies = {
+        m.id: m
+        for m in session.query(Movie.id, Movie.title, Movie.release_year, Movie.poster_path).filter(
+            Movie.id.in_(ids["movies"])
+        )
+    }
+    # A person or film removed since the graph was built breaks the chain
+    if len(people) < len(set(ids["people"])) or len(movies) < len(set(ids["movies"])):
+        return None
+
+    return {
+        "degrees": len(ids["movies"]),
+        "people": [_person(people[person_id]) for person_id in ids["people"]],
+        "movies": [_movie(movies[movie_id]) for movie_id in ids["movies"]],
+    }
+
+
+def _person(row) -> Dict:
+    return {"id": row.id, "name": row.name, "profile_path": row.profile_path}
+
+
+def _movie(row) -> Dict:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "release_year": row.release_year,
+        "poster_path": row.poster_path,
+    }
@@ -0,0 +1,178 @@
+"""
+Content-based "similar movies", precomputed into the movie_similar table.
+
+The movie page used to rank candidates by shared-genre count with a GROUP
+BY on every view. Now each movie is described by a sparse set of features:
+
+* its genres;
+* its top-billed cast;
+* its directors;
+* its production companies;
+* its decade.
+
+Each feature is weighted by kind and by inverse document frequency, so a
+shared director counts for far more than a shared "Drama" tag. Neighbours
+are ranked by cosine similarity. ``refresh_movie_similarities`` computes the
+top ``TOP_K`` per movie and rewrites the table; the import and sync jobs
+call it once per run. The movie page then reads its neighbours by primary
+key.
+
+Scores come from an inverted index: each of a movie's features adds its
+weight to every candidate in that feature's posting list. A feature such as
+a big genre or a decade can be shared by thousands of movies. So each list
+keeps only its ``MAX_POSTING`` most popular eligible movies. A short list
+of front-runners is then rescored exactly, over every feature they share.
+The cap therefore only stops rarely-seen movies entering the running
+through a common tag alone.
+"""
+
+import heapq
+import math
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, List, Set, Tuple
+
+from sqlalchemy import delete, insert, select
+
+from src.logger import get_logger
+from src.models import (
+    Cast,
+    Crew,
+    Movie,
+    MovieSimilarity,
+    movie_companies_table,
+    movie_genres_table,
+)
+
+logger = get_logger(__name__)
+
+TOP_K = 12
+TOP_CAST = 5
+# Neighbours must have more votes than this (same bar as the old genre query)
+MIN_VOTES = 20
+MAX_POSTING = 300
+# Candidates rescored exactly, per neighbour kept
+SHORTLIST_FACTOR = 4
+BATCH_SIZE = 5000
+FEATURE_WEIGHTS = {
+    "genre": 1.0,
+    "cast": 1.0,
+    "director": 1.5,
+    "company": 0.5,
+    "decade": 0.5,
+}
+
+Feature = Tuple[str, Hashable]
+
+
+def load_movie_features(
+    session, min_votes: int = MIN_VOTES
+) -> Tuple[Dict[int, Set[Feature]], Dict[int, tuple]]:
+    """Feature sets for every movie, plus ``(vote_average, popularity)`` of eligible ones.
+
+    A movie is eligible when it has more than ``min_votes`` votes.
+    """
+    features: Dict[int, Set[Feature]] = {}
+    eligible: Dict[int, tuple] = {}
+    movies = select(
+        Movie.id, Movie.release_decade, Movie.vote_count, Movie.vote_average, Movie.popularity
+    )
+    for movie_id, decade, vote_count, vote_average, popularity in session.execute(movies):
+        features[movie_id] = {("decade", decade)} if decade is not None else set()
+        if (vote_count or 0) > min_votes:
+            eligible[movie_id] = (float(vote_average or 0), float(popularity or 0))
+
+    sources = {
+        "genre": select(movie_genres_table.c.movie_id, movie_genres_table.c.genre_id),
+        "cast": select(Cast.movie_id, Cast.person_id).where(Cast.cast_order < TOP_CAST),
+        "director": select(Crew.movie_id, Crew.person_id).where(Crew.job == "Director"),
+        "company": select(movie_companies_table.c.movie_id, movie_companies_table.c.company_id),
+    }
+    for kind, query in sources.items():
+        rows = session.execute(query.execution_options(yield_per=BATCH_SIZE))
+        for movie_id, value in rows:
+            if movie_id in features:
+                features[movie_id].add((kind, value))
+    return features, eligible
+
+
+def compute_similar_movies(
+    features: Dict[int, Set[Feature]], eligible: Dict[int, tuple], top_k: int = TOP_K
+) -> Dict[int, List[Tuple[int, float]]]:
+    """Top ``top_k`` ``(movie_id, cosine)`` neighbours of each movie, best first.
+
+    Only ``eligible`` movies are offered as neighbours. Ties on score go to
+    the higher rated, then the more popular, then the older (lower id) movie.
+    """
+    total = len(features)
+    document_frequency = Counter(feature for movie in features.values() for feature in movie)
+    # Every movie has a feature with a given weight or not, so the product of
+    # two movies' weights for a shared feature is that weight squared
+    squared = {
+        feature: (FEATURE_WEIGHTS[feature[0]] * (math.log((1 + total) / (1 + count)) + 1)) ** 2
+        for feature, count in document_frequency.items()
+    }
+    norms = {
+        movie_id: math.sqrt(sum(squared[feature] for feature in movie)) or 1.0
+        for movie_id, movie in features.items()
+    }
+
+    postings: Dict[Feature, List[int]] = defaultdict(list)
+    for movie_id in sorted(eligible, key=lambda m: (-eligible[m][1], m)):
+        for feature in features[movie_id]:
+            if len(postings[feature]) < MAX_POSTING:
+                postings[feature].append(movie_id)
+
+    neighbours = {}
+    for movie_id, movie in features.items():
+        # Dot products over the (capped) posting lists...
+        dots: Dict[int, float] = defaultdict(float)
+        for feature in movie:
+            weight = squared[feature]
+            for other in postings.get(feature, ()):
+                dots[other] += weight
+        dots.pop(movie_id, None)
+        if not dots:
+            continue
+
+        # ...then an exact rescore of the front-runners, over every shared feature
+        shortlist = heapq.nlargest(
+            top_k * SHORTLIST_FACTOR, dots, key=lambda other: dots[other] / norms[other]
+        )
+        ranked = heapq.nlargest(
+            top_k,
+            (
+                (
+                    sum(squared[feature] for feature in movie & features[other])
+                    / (norms[movie_id] * norms[other]),
+                    eligible[other],
+                    -other,
+                )
+                for other in shortlist
+            ),
+        )
+        neighbours[movie_id] = [(-negative, round(value, 6)) for value, _, negative in ranked]
+    return neighbours
+
+
+def refresh_movie_similarities(session, top_k: int = TOP_K) -> int:
+    """Recompute every movie's neighbours and replace the table. Returns rows written."""
+    started = time.monotonic()
+    features, eligible = load_movie_features(session)
+    neighbours = compute_similar_movies(features, eligible, top_k=top_k)
+
+    rows = [
+        {"movie_id": movie_id, "rank": rank, "similar_movie_id": other, "score": score}
+        for movie_id, ranked in neighbours.items()
+        for rank, (other, score) in enumerate(ranked)
+    ]
+    session.execute(delete(MovieSimilarity))
+    for start in range(0, len(rows), BATCH_SIZE):
+        session.execute(insert(MovieSimilarity), rows[start : start + BATCH_SIZE])
+    session.commit()
+
+    logger.info(
+        f"Rebuilt movie similarities for {len(neighbours)} movies "
+        f"({len(rows)} rows) in {time.monotonic() - started:.1f}s"
+    )
+    return len(rows)
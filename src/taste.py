@@ -0,0 +1,300 @@
+"""
+Per-user taste profiles for personalised recommendations.
+
+A profile is a sparse vector of weights over genres, top-billed cast and
+directors, stored as JSON in user_taste_profiles. Every movie the user has
+favorited, watchlisted or rated adds its features to it:
+
+* a favorite counts ``FAVORITE_WEIGHT``;
+* a watchlist entry counts ``WATCHLIST_WEIGHT``;
+* a rating counts ``rating_weight(stars)``, so low ratings push away.
+
+The favorite, watchlist and rating routes call ``record_activity`` in the
+same transaction as each change, adding or removing that one movie's
+features. Profiles are only ever written there and by ``backfill_profiles``
+(scripts/build_taste_profiles.py, run after migration 012), never by the
+read-only pages that show recommendations. A user who has no stored profile
+yet is profiled from their full history on the fly.
+
+Recommendations score a profile against ``MovieVectors``, a per-process
+inverted index of IDF-weighted movie vectors built with the same features
+as src/similarity.py. Only the profile's ``MAX_QUERY_FEATURES`` strongest
+weights are used and every posting list is capped. Scoring therefore costs
+the same for a user with five favorites as for one with five thousand; the
+only per-favorite work is reading the ids of the user's history, which are
+skipped while ranking.
+"""
+
+import heapq
+import json
+import math
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Collection, Dict, List, Optional, Set
+
+from sqlalchemy import exists, literal, select, union_all
+
+from src.loading import MOVIE_LIST
+from src.logger import get_logger
+from src.models import (
+    Cast,
+    Crew,
+    Movie,
+    Rating,
+    User,
+    UserTasteProfile,
+    movie_genres_table,
+    user_favorites_table,
+    user_watchlist_table,
+)
+from src.similarity import FEATURE_WEIGHTS, TOP_CAST, load_movie_features
+
+logger = get_logger(__name__)
+
+FAVORITE_WEIGHT = 1.0
+WATCHLIST_WEIGHT = 0.5
+PROFILE_KINDS = ("genre", "cast", "director")
+# Recommended movies must have more votes than this (same bar as before profiles)
+MIN_VOTES = 50
+MAX_PROFILE_FEATURES = 500
+MAX_QUERY_FEATURES = 50
+MAX_POSTING = 500
+BATCH_SIZE = 500
+
+
+def rating_weight(stars: Optional[int]) -> float:
+    """Profile weight of a star rating: 5 stars is +1, 3 is neutral, 1 is -1."""
+    return (stars - 3) / 2 if stars else 0.0
+
+
+def _features_of(session, movie_ids: List[int]) -> Dict[int, set]:
+    """Profile feature keys (``"kind:id"``) of each of the given movies."""
+    features: Dict[int, set] = defaultdict(set)
+    for start in range(0, len(movie_ids), BATCH_SIZE):
+        batch = movie_ids[start : start + BATCH_SIZE]
+        query = union_all(
+            select(
+                movie_genres_table.c.movie_id, literal("genre"), movie_genres_table.c.genre_id
+            ).where(movie_genres_table.c.movie_id.in_(batch)),
+            select(Cast.movie_id, literal("cast"), Cast.person_id).where(
+                Cast.movie_id.in_(batch), Cast.cast_order < TOP_CAST
+            ),
+            select(Crew.movie_id, literal("director"), Crew.person_id).where(
+                Crew.movie_id.in_(batch), Crew.job == "Director"
+            ),
+        )
+        for movie_id, kind, value in session.execute(query):
+            features[movie_id].add(f"{kind}:{value}")
+    return features
+
+
+def _pruned(weights: Dict[str, float]) -> Dict[str, float]:
+    """Drop cancelled-out weights and keep the ``MAX_PROFILE_FEATURES`` strongest."""
+    kept = {key: round(weight, 6) for key, weight in weights.items() if abs(weight) > 1e-6}
+    if len(kept) > MAX_PROFILE_FEATURES:
+        strongest = heapq.nlargest(MAX_PROFILE_FEATURES, kept, key=lambda key: abs(kept[key]))
+        kept = {key: kept[key] for key in strongest}
+    return kept
+
+
+def build_profile(session, user_id: int) -> Dict[str, float]:
+    """Compute a user's profile from their full favorites, watchlist and ratings."""
+    movie_weights: Dict[int, float] = defaultdict(float)
+    for table, weight in (
+        (user_favorites_table, FAVORITE_WEIGHT),
+        (user_watchlist_table, WATCHLIST_WEIGHT),
+    ):
+        for (movie_id,) in session.execute(
+            select(table.c.movie_id).where(table.c.user_id == user_id)
+        ):
+            movie_weights[movie_id] += weight
+    for movie_id, stars in session.execute(
+        select(Rating.movie_id, Rating.rating).where(Rating.user_id == user_id)
+    ):
+        movie_weights[movie_id] += rating_weight(stars)
+
+    weights: Dict[str, float] = defaultdict(float)
+    for movie_id, keys in _features_of(session, list(movie_weights)).items():
+        for key in keys:
+            weights[key] += movie_weights[movie_id]
+    return _pruned(weights)
+
+
+def get_taste_profile(session, user_id: int) -> Dict[str, float]:
+    """Return a user's stored profile.
+
+    Read-only, so it is safe on GET requests. A user without a stored
+    profile is profiled from their full history on the fly. The profile is
+    stored by their next favorite, watchlist or rating change, or by
+    ``backfill_profiles``.
+    """
+    stored = session.query(UserTasteProfile.weights).filter_by(user_id=user_id).scalar()
+    if stored is not None:
+        return json.loads(stored)
+    return build_profile(session, user_id)
+
+
+def backfill_profiles(session, batch_size: int = 100) -> int:
+    """Store a profile for every user who lacks one. Returns profiles written."""
+    missing = (
+        select(User.id)
+        .where(~exists().where(UserTasteProfile.user_id == User.id))
+        .order_by(User.id)
+    )
+    user_ids = list(session.scalars(missing))
+    for start in range(0, len(user_ids), batch_size):
+        for user_id in user_ids[start : start + batch_size]:
+            session.add(
+                UserTasteProfile(
+                    user_id=user_id, weights=json.dumps(build_profile(session, user_id))
+                )
+            )
+        session.commit()
+    logger.info(f"Built taste profiles for {len(user_ids)} users")
+    return len(user_ids)
+
+
+def record_activity(
+    session, user_id: int, movie_id: int, added: float = 0.0, removed: float = 0.0
+) -> None:
+    """Apply one favorite, watchlist or rating change to a user's stored profile.
+
+    ``added`` times the movie's features is added to the profile, and a
+    withdrawn contribution of ``removed`` is subtracted. The subtraction only
+    touches features still in the profile: one pruned as too weak is not
+    brought back as a preference the user never had. A re-rating passes
+    both.
+
+    Call in the transaction that makes the change, before committing it. A
+    user without a stored profile gets one built from their whole history,
+    which already includes the change.
+    """
+    if not added and not removed:
+        return
+    try:
+        with session.begin_nested():
+            profile = (
+                session.query(UserTasteProfile)
+                .filter_by(user_id=user_id)
+                .with_for_update()
+                .one_or_none()
+            )
+            if profile is None:
+                weights = build_profile(session, user_id)
+                profile = UserTasteProfile(user_id=user_id)
+                session.add(profile)
+            else:
+                weights = json.loads(profile.weights)
+                for key in _features_of(session, [movie_id]).get(movie_id, ()):
+                    if removed and key in weights:
+                        weights[key] -= removed
+                    if added:
+                        weights[key] = weights.get(key, 0.0) + added
+            profile.weights = json.dumps(_pruned(weights))
+            profile.updated_at = datetime.utcnow()
+    except Exception as exc:
+        # Only the savepoint is rolled back, so the user's change still goes
+        # through; the profile misses it until it is rebuilt
+        logger.warning(f"Taste profile update failed for user {user_id}: {exc}")
+
+
+class MovieVectors:
+    """IDF-weighted genre/cast/director vectors of eligible movies, indexed by feature."""
+
+    def __init__(self, features: Dict[int, set], eligible: Dict[int, tuple]):
+        features = {
+            movie_id: {feature for feature in movie if feature[0] in PROFILE_KINDS}
+            for movie_id, movie in features.items()
+        }
+        total = len(features)
+        document_frequency = Counter(feature for movie in features.values() for feature in movie)
+        self.weights = {
+            f"{feature[0]}:{feature[1]}": FEATURE_WEIGHTS[feature[0]]
+            * (math.log((1 + total) / (1 + count)) + 1)
+            for feature, count in document_frequency.items()
+        }
+        self.quality = eligible
+
+        postings: Dict[str, List[int]] = defaultdict(list)
+        self.norms: Dict[int, float] = {}
+        for movie_id in sorted(eligible, key=lambda m: (-eligible[m][1], m)):
+            keys = [f"{kind}:{value}" for kind, value in features.get(movie_id, ())]
+            self.norms[movie_id] = math.sqrt(sum(self.weights[key] ** 2 for key in keys)) or 1.0
+            for key in keys:
+                if len(postings[key]) < MAX_POSTING:
+                    postings[key].append(movie_id)
+        self.postings = {key: array("i", ids) for key, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.norms)
+
+    def rank(
+        self, profile: Dict[str, float], limit: int, exclude: Collection[int] = ()
+    ) -> List[int]:
+        """Ids of the ``limit`` movies closest to a profile, best first.
+
+        Ties on score go to the higher rated, then the more popular, then the
+        older (lower id) movie. Movies scoring zero or below, and those in
+        ``exclude``, are left out.
+        """
+        strongest = heapq.nlargest(
+            MAX_QUERY_FEATURES, profile.items(), key=lambda item: abs(item[1])
+        )
+        scores: Dict[int, float] = defaultdict(float)
+        for key, weight in strongest:
+            contribution = weight * self.weights.get(key, 0.0)
+            for movie_id in self.postings.get(key, ()):
+                scores[movie_id] += contribution
+
+        ranked = heapq.nlargest(
+            limit,
+            (
+                (score / self.norms[movie_id], self.quality[movie_id], -movie_id)
+                for movie_id, score in scores.items()
+                if score > 0 and movie_id not in exclude
+            ),
+        )
+        return [-negative for _, _, negative in ranked]
+
+
+def build_movie_vectors(session) -> MovieVectors:
+    return MovieVectors(*load_movie_features(session, min_votes=MIN_VOTES))
+
+
+def history_ids(session, user_id: int) -> Set[int]:
+    """Ids of every movie the user has favorited, watchlisted or rated."""
+    query = union_all(
+        select(user_favorites_table.c.movie_id).where(user_favorites_table.c.user_id == user_id),
+        select(user_watchlist_table.c.movie_id).where(user_watchlist_table.c.user_id == user_id),
+        select(Rating.movie_id).where(Rating.user_id == user_id),
+    )
+    return set(session.scalars(query))
+
+
+def not_in_history(user_id: int) -> List:
+    """Filter conditions excluding movies the user has favorited, watchlisted or rated."""
+    return [
+        ~exists().where(table.c.user_id == user_id, table.c.movie_id == Movie.id)
+        for table in (user_favorites_table, user_watchlist_table)
+    ] + [~exists().where(Rating.user_id == user_id, Rating.movie_id == Movie.id)]
+
+
+def recommend_movies(
+    session, vectors: MovieVectors, user_id: int, profile: Dict[str, float], limit: int
+) -> List[Movie]:
+    """The ``limit`` movies best matching a profile that the user hasn't
+    favorited, watchlisted or rated yet, best first.
+
+    The user's history is skipped while ranking, so a heavy user whose
+    closest matches are all favorites still gets the next best ones. Fewer
+    than ``limit`` are returned only when too few movies match at all.
+    """
+    ranked = vectors.rank(profile, limit, exclude=history_ids(session, user_id))
+    if not ranked:
+        return []
+    movies = {
+        movie.id: movie
+        for movie in session.query(Movie).options(*MOVIE_LIST).filter(Movie.id.in_(ranked))
+    }
+    return [movies[movie_id] for movie_id in ranked if movie_id in movies]
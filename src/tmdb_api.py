@@ -1,43 +1,233 @@
+import json
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from config.config import Config
+from src import metrics
+from src.request_metrics import track_tmdb
 
 logger = logging.getLogger(__name__)
 
+# Seconds to keep each kind of TMDB response. Patterns are matched in order
+# against the endpoint path; anything unlisted falls back to the default.
+_DEFAULT_TTL = 3600
+_ENDPOINT_TTLS = (
+    (re.compile(r"^genre/"), 7 * 24 * 3600),
+    (re.compile(r"^movie/\d+/watch/providers$"), 6 * 3600),
+    (re.compile(r"^movie/\d+/(videos|credits)$"), 24 * 3600),
+    (re.compile(r"^movie/\d+$"), 24 * 3600),
+    (re.compile(r"^person/\d+$"), 24 * 3600),
+    (re.compile(r"^movie/(popular|top_rated|now_playing|upcoming)$"), 3600),
+    (re.compile(r"^(search|discover)/"), 600),
+)
+
+
+def ttl_for_endpoint(endpoint: str) -> int:
+    """Return the cache TTL in seconds for a TMDB endpoint path."""
+    for pattern, ttl in _ENDPOINT_TTLS:
+        if pattern.match(endpoint):
+            return ttl
+    return _DEFAULT_TTL
+
+
+def cache_key(endpoint: str, params: Optional[Dict] = None) -> str:
+    """Build a stable cache key from the endpoint and its non-secret params."""
+    items = sorted((k, str(v)) for k, v in (params or {}).items() if k != "api_key")
+    query = "&".join(f"{k}={v}" for k, v in items)
+    return f"tmdb:{endpoint}?{query}"
+
+
+class LRUResponseCache:
+    """Bounded, thread-safe in-process cache of decoded TMDB responses."""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Dict, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisResponseCache:
+    """TMDB response cache shared across workers through Redis.
+
+    Redis errors are logged and treated as cache misses so an unavailable
+    cache never takes the TMDB integration down with it.
+    """
+
+    def __init__(self, redis_url: str):
+        import redis
+
+        self._client = redis.Redis.from_url(redis_url)
+
+    def get(self, key: str) -> Optional[Dict]:
+        try:
+            raw = self._client.get(key)
+        except Exception as e:
+            logger.warning("TMDB cache read failed for %s: %s", key, e)
+            return None
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return None
+
+    def set(self, key: str, value: Dict, ttl: int) -> None:
+        try:
+            self._client.setex(key, ttl, json.dumps(value))
+        except Exception as e:
+            logger.warning("TMDB cache write failed for %s: %s", key, e)
+
+    def clear(self) -> None:
+        try:
+            for key in self._client.scan_iter(match="tmdb:*"):
+                self._client.delete(key)
+        except Exception as e:
+            logger.warning("TMDB cache clear failed: %s", e)
+
+
+_shared_lock = threading.Lock()
+_shared_session: Optional[requests.Session] = None
+_shared_cache = None
+
+
+def get_http_session() -> requests.Session:
+    """Return the process-wide keep-alive session used for every TMDB call.
+
+    requests.Session is safe to share across threads for plain GETs; the
+    adapter's pool is sized so the sync script's worker threads each keep
+    their own connection to api.themoviedb.org open.
+    """
+    global _shared_session
+    if _shared_session is None:
+        with _shared_lock:
+            if _shared_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=Config.TMDB_POOL_MAXSIZE,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _shared_session = session
+    return _shared_session
+
+
+def get_response_cache():
+    """Return the process-wide response cache (Redis when configured)."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                if Config.REDIS_URL:
+                    _shared_cache = RedisResponseCache(Config.REDIS_URL)
+                else:
+                    _shared_cache = LRUResponseCache(Config.TMDB_CACHE_MAX_ENTRIES)
+    return _shared_cache
+
+
+def clear_response_cache() -> None:
+    """Drop every cached TMDB response held by this process's cache backend."""
+    if _shared_cache is not None:
+        _shared_cache.clear()
+
 
 class TMDBClient:
-    """Client for interacting with TMDB API"""
+    """Client for interacting with TMDB API
 
-    def __init__(self):
+    Instances are cheap: all of them share one pooled HTTP session and one
+    response cache, so building a client per request costs nothing extra.
+    Pass use_cache=False to always hit the network (e.g. for syncs).
+    """
+
+    def __init__(self, use_cache: bool = True):
         self.api_key = Config.TMDB_API_KEY
         self.base_url = Config.TMDB_BASE_URL
         self.timeout = (3.05, 10)
+        self.session = get_http_session()
+        self.cache = get_response_cache() if use_cache and Config.TMDB_CACHE_ENABLED else None
+
+    def _make_request(
+        self, endpoint: str, params: Optional[Dict] = None, raise_errors: bool = False
+    ) -> Dict:
+        """Make a request to TMDB API.
 
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
-        """Make a request to TMDB API"""
+        Failures are logged and return ``{}``, unless ``raise_errors`` is set,
+        for callers that must tell an outage apart from an empty payload.
+        """
         if params is None:
             params = {}
 
+        key = cache_key(endpoint, params)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
         params["api_key"] = self.api_key
         url = f"{self.base_url}/{endpoint}"
 
         try:
-            response = requests.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
+            with track_tmdb(), metrics.time_tmdb(endpoint):
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                response.raise_for_status()
+                data = response.json()
         except requests.RequestException as e:
             logger.warning("TMDB request failed for %s: %s", url, e)
+            metrics.record_tmdb_error(endpoint, "request")
+            if raise_errors:
+                raise
             return {}
         except ValueError as e:
             logger.warning("TMDB returned invalid JSON for %s: %s", url, e)
+            metrics.record_tmdb_error(endpoint, "invalid_json")
+            if raise_errors:
+                raise
             return {}
         except Exception as e:
             logger.warning("Unexpected TMDB request error for %s: %s", url, e)
+            metrics.record_tmdb_error(endpoint, "unexpected")
+            if raise_errors:
+                raise
             return {}
 
+        # Failures return above, so only real payloads are ever cached
+        if self.cache is not None and isinstance(data, dict):
+            self.cache.set(key, data, ttl_for_endpoint(endpoint))
+        return data
+
     def get_popular_movies(self, page: int = 1) -> Dict:
         """Get popular movies"""
         return self._make_request("movie/popular", {"page": page})
@@ -62,18 +252,20 @@ class TMDBClient:
         """Get cast and crew for a movie"""
         return self._make_request(f"movie/{movie_id}/credits")
 
-    def get_movie_videos(self, movie_id: int) -> Dict:
+    def get_movie_videos(self, movie_id: int, raise_errors: bool = False) -> Dict:
         """Get videos (trailers, teasers, etc.) for a movie"""
-        return self._make_request(f"movie/{movie_id}/videos")
+        return self._make_request(f"movie/{movie_id}/videos", raise_errors=raise_errors)
 
-    def get_watch_providers(self, movie_id: int, region: str = "US") -> Dict:
+    def get_watch_providers(
+        self, movie_id: int, region: str = "US", raise_errors: bool = False
+    ) -> Dict:
         """Get streaming/rental/purchase availability for a movie.
 
         Returns a dict with keys like 'flatrate', 'rent', 'buy', each a list
         of provider dicts with 'provider_name' and 'logo_path'.
         Returns an empty dict if no data is available for the region.
         """
-        data = self._make_request(f"movie/{movie_id}/watch/providers")
+        data = self._make_request(f"movie/{movie_id}/watch/providers", raise_errors=raise_errors)
         results = data.get("results", {})
         return results.get(region, {})
 
@@ -0,0 +1,78 @@
+"""
+Batched "top N per group" fetches for spotlight-style listing pages.
+
+Pages like /directors and /companies show a page of groups, each with its
+best few movies. Fetching those movies one group at a time costs a round
+trip per card. ``top_n_per_group`` loads every card's movies in one query:
+it ranks rows with ROW_NUMBER() OVER (PARTITION BY group ...) where the
+database supports window functions. On SQLite builds too old for them it
+streams the rows ordered by group and keeps the first N of each in Python.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+
+from src.models import Movie
+
+# SQLite gained window functions in 3.25
+_SQLITE_WINDOW_VERSION = (3, 25, 0)
+
+
+def supports_window_functions(session) -> bool:
+    dialect = session.get_bind().dialect
+    if dialect.name != "sqlite":
+        return True
+    return dialect.dbapi.sqlite_version_info >= _SQLITE_WINDOW_VERSION
+
+
+def top_n_per_group(
+    session,
+    query,
+    group_column,
+    group_ids: Iterable[int],
+    order_by,
+    limit: int,
+    window: Optional[bool] = None,
+) -> Dict[int, List[Movie]]:
+    """Return ``{group_id: [Movie, ...]}`` with the top ``limit`` movies per group.
+
+    ``query`` selects Movie, already joined to whatever ``group_column``
+    lives on (e.g. Crew.person_id) and carrying any shared filters.
+    ``order_by`` ranks movies within a group. Movie.id is appended as a
+    tie-breaker, so both code paths return the same rows. ``window`` forces
+    one strategy; by default it is picked from the database's capabilities.
+    """
+    group_ids = list(group_ids)
+    if not group_ids:
+        return {}
+    if window is None:
+        window = supports_window_functions(session)
+
+    order_by = list(order_by) if isinstance(order_by, (list, tuple)) else [order_by]
+    order_by.append(Movie.id)
+    query = query.filter(group_column.in_(group_ids))
+    grouped = defaultdict(list)
+
+    if window:
+        ranked = query.add_columns(
+            group_column.label("group_id"),
+            func.row_number().over(partition_by=group_column, order_by=order_by).label("rank"),
+        ).subquery()
+        ranked_movie = aliased(Movie, ranked)
+        rows = (
+            session.query(ranked_movie, ranked.c.group_id)
+            .filter(ranked.c.rank <= limit)
+            .order_by(ranked.c.group_id, ranked.c.rank)
+        )
+        for movie, group_id in rows:
+            grouped[group_id].append(movie)
+        return dict(grouped)
+
+    rows = query.add_columns(group_column).order_by(group_column, *order_by)
+    for movie, group_id in rows:
+        if len(grouped[group_id]) < limit:
+            grouped[group_id].append(movie)
+    return dict(grouped)
@@ -1,7 +1,8 @@
 /**
  * Infinite Scroll for Movie Listings
  * Replaces pagination on /movies with automatic loading on scroll.
- * Uses the existing /api/v1/movies endpoint.
+ * Uses the existing /api/v1/movies endpoint, following its keyset cursor so
+ * deep scrolls cost the same as the first page.
  */
 
 (function () {
@@ -12,10 +13,10 @@
     if (!movieGrid) return;
 
     // --- State ---
-    let currentPage = parseInt(document.getElementById('scroll-meta').dataset.page, 10);
-    const totalPages = parseInt(document.getElementById('scroll-meta').dataset.totalPages, 10);
+    const scrollMeta = document.getElementById('scroll-meta');
+    let nextCursor = scrollMeta.dataset.nextCursor || null;
     let loading = false;
-    let exhausted = currentPage >= totalPages;
+    let exhausted = !nextCursor;
 
     // --- Hide server-rendered pagination ---
     // Also hidden via CSS in movies.html to avoid flash before JS runs
@@ -68,11 +69,11 @@
     spinner.after(endMsg);
 
     // --- Build API query string from current page filters ---
-    function buildApiUrl(page) {
+    function buildApiUrl(cursor) {
         const params = new URLSearchParams(window.location.search);
         // Map HTML filter param names to API param names
         const sort = params.get('sort') || 'popularity';
-        const apiParams = new URLSearchParams({ page, per_page: 20, sort });
+        const apiParams = new URLSearchParams({ cursor, per_page: 20, sort });
 
         if (params.get('genre'))            apiParams.set('genre', params.get('genre'));
         if (params.get('year'))             apiParams.set('year', params.get('year'));
@@ -149,8 +150,7 @@
         const timeoutId = setTimeout(() => controller.abort(), 15000);
 
         try {
-            const nextPage = currentPage + 1;
-            const url = buildApiUrl(nextPage);
+            const url = buildApiUrl(nextCursor);
             const response = await fetch(url, { signal: controller.signal });
             clearTimeout(timeoutId);
 
@@ -163,8 +163,8 @@
             (data.movies || []).forEach(movie => fragment.appendChild(buildCard(movie)));
             movieGrid.appendChild(fragment);
 
-            currentPage = data.page;
-            exhausted = currentPage >= data.total_pages;
+            nextCursor = data.next_cursor;
+            exhausted = !data.has_more;
 
             if (exhausted) {
                 endMsg.classList.remove('d-none');
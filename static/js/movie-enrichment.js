@@ -0,0 +1,121 @@
+/**
+ * Deferred TMDB enrichment for the movie detail page.
+ * The server renders the page without waiting on TMDB; this fetches the
+ * trailer and watch providers from /api/v1/movies/<id>/enrichment after
+ * first paint and builds the same cards the template would have rendered.
+ */
+
+(function () {
+    'use strict';
+
+    const container = document.getElementById('movie-enrichment');
+    if (!container) return;
+
+    function el(tag, className, text) {
+        const node = document.createElement(tag);
+        if (className) node.className = className;
+        if (text) node.appendChild(document.createTextNode(text));
+        return node;
+    }
+
+    function cardWithHeader(iconClass, title) {
+        const card = el('div', 'card mb-4');
+        const header = el('div', 'card-header');
+        const heading = el('h5', 'mb-0');
+        heading.appendChild(el('i', iconClass));
+        heading.appendChild(document.createTextNode(' ' + title));
+        header.appendChild(heading);
+        card.appendChild(header);
+        return { card, heading };
+    }
+
+    function renderTrailer(trailer) {
+        if (!trailer || !trailer.key) return null;
+        const { card } = cardWithHeader('bi bi-play-circle-fill text-danger', trailer.name || 'Official Trailer');
+        const body = el('div', 'card-body p-0');
+        const ratio = el('div', 'ratio ratio-16x9');
+        const iframe = document.createElement('iframe');
+        iframe.src = 'https://www.youtube.com/embed/' + encodeURIComponent(trailer.key);
+        iframe.title = trailer.name || 'Movie Trailer';
+        iframe.loading = 'lazy';
+        iframe.allowFullscreen = true;
+        iframe.allow = 'accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture';
+        ratio.appendChild(iframe);
+        body.appendChild(ratio);
+        card.appendChild(body);
+        return card;
+    }
+
+    function renderProviderGroup(label, providers, wrapperClass) {
+        const group = el('div', wrapperClass);
+        const heading = el('p', 'small fw-semibold text-muted text-uppercase mb-2', label);
+        heading.style.letterSpacing = '.05em';
+        group.appendChild(heading);
+        const list = el('div', 'd-flex flex-wrap gap-2');
+        providers.forEach(function (p) {
+            const item = el('div', 'watch-provider');
+            item.title = p.provider_name || '';
+            const img = document.createElement('img');
+            img.src = 'https://image.tmdb.org/t/p/w45' + (p.logo_path || '');
+            img.alt = p.provider_name || '';
+            img.className = 'watch-provider-logo';
+            img.loading = 'lazy';
+            item.appendChild(img);
+            item.appendChild(el('span', 'watch-provider-name', p.provider_name || ''));
+            list.appendChild(item);
+        });
+        group.appendChild(list);
+        return group;
+    }
+
+    function renderProviders(providers) {
+        providers = providers || {};
+        const stream = providers.flatrate || [];
+        const rent = providers.rent || [];
+        const buy = providers.buy || [];
+        if (!stream.length && !rent.length && !buy.length) return null;
+
+        const { card, heading } = cardWithHeader('bi bi-display me-2', 'Where to Watch');
+        heading.appendChild(el('small', 'text-muted fw-normal ms-2', 'US availability via JustWatch'));
+        const body = el('div', 'card-body');
+        if (stream.length) body.appendChild(renderProviderGroup('Stream', stream, 'mb-3'));
+        if (rent.length) body.appendChild(renderProviderGroup('Rent', rent, 'mb-3'));
+        if (buy.length) body.appendChild(renderProviderGroup('Buy', buy, 'mb-1'));
+
+        const credit = el('p', 'text-muted small mb-0 mt-3');
+        credit.appendChild(el('i', 'bi bi-info-circle me-1'));
+        credit.appendChild(document.createTextNode('Data provided by '));
+        const link = el('a', 'text-muted', 'JustWatch');
+        link.href = 'https://www.justwatch.com';
+        link.target = '_blank';
+        link.rel = 'noopener noreferrer';
+        credit.appendChild(link);
+        credit.appendChild(document.createTextNode(' via TMDB · US only'));
+        body.appendChild(credit);
+        card.appendChild(body);
+        return card;
+    }
+
+    async function loadEnrichment() {
+        try {
+            const response = await fetch(container.dataset.url, {
+                headers: { 'Accept': 'application/json' },
+            });
+            if (!response.ok) return;
+            const data = await response.json();
+            const trailerCard = renderTrailer(data.trailer);
+            const providersCard = renderProviders(data.watch_providers);
+            if (trailerCard) container.appendChild(trailerCard);
+            if (providersCard) container.appendChild(providersCard);
+        } catch (err) {
+            // Enrichment is optional; the page is complete without it
+            console.error(err);
+        }
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', loadEnrichment);
+    } else {
+        loadEnrichment();
+    }
+})();
@@ -9,8 +9,9 @@ import pytest
 from sqlalchemy import event
 
 from config.config import Config
+from src.app import actor_names
 from src.app import app as flask_app
-from src.app import cache, limiter
+from src.app import cache, collaboration_graph, costar_graph, limiter, movie_vectors
 from src.models import (
     Base,
     Cast,
@@ -24,6 +25,25 @@ from src.models import (
     User,
     engine,
 )
+from src.tmdb_api import clear_response_cache
+
+
+@pytest.fixture(autouse=True)
+def _reset_tmdb_response_cache():
+    """Keep cached TMDB responses from leaking between tests."""
+    clear_response_cache()
+    yield
+    clear_response_cache()
+
+
+@pytest.fixture(autouse=True)
+def _reset_people_indexes():
+    """Every test builds its own catalog, so in-process indexes must not outlive it."""
+    for index in (actor_names, costar_graph, collaboration_graph, movie_vectors):
+        index.clear()
+    yield
+    for index in (actor_names, costar_graph, collaboration_graph, movie_vectors):
+        index.clear()
 
 
 @pytest.fixture(scope="function")
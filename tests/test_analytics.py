@@ -0,0 +1,200 @@
+"""
+Tests for the materialized analytics snapshot (src/analytics.py)
+"""
+
+import csv
+import io
+import json
+from datetime import date
+
+from src.analytics import (
+    SNAPSHOT_NAME,
+    build_analytics_summary,
+    get_analytics_summary,
+    refresh_analytics_snapshot,
+)
+from src.models import AnalyticsSnapshot, Genre, Movie, ProductionCompany
+
+
+def _add_movie(db_session, tmdb_id, genres=(), **fields):
+    defaults = {
+        "title": f"Movie {tmdb_id}",
+        "release_date": date(2001, 5, 1),
+        "vote_average": 7.0,
+        "vote_count": 100,
+        "popularity": 10.0,
+        "budget": 0,
+        "revenue": 0,
+    }
+    defaults.update(fields)
+    movie = Movie(tmdb_id=tmdb_id, **defaults)
+    movie.genres.extend(genres)
+    db_session.add(movie)
+    db_session.commit()
+    return movie
+
+
+class TestBuildAnalyticsSummary:
+    """Tests for build_analytics_summary"""
+
+    def test_empty_catalog(self, db_session):
+        summary = build_analytics_summary(db_session)
+
+        assert summary["total_movies"] == 0
+        assert summary["avg_rating"] is None
+        assert summary["genre_stats"] == []
+        assert summary["year_stats"] == []
+
+    def test_aggregates(self, db_session):
+        drama = Genre(tmdb_id=18, name="Drama")
+        comedy = Genre(tmdb_id=35, name="Comedy")
+        db_session.add_all([drama, comedy])
+        db_session.commit()
+
+        _add_movie(db_session, 1, [drama], vote_average=8.0, revenue=100, budget=50)
+        _add_movie(db_session, 2, [drama, comedy], vote_average=6.0, revenue=300)
+        _add_movie(db_session, 3, [comedy], vote_count=10, release_date=date(1995, 1, 1))
+
+        summary = build_analytics_summary(db_session)
+
+        assert summary["total_movies"] == 3
+        assert summary["total_revenue"] == 400
+        assert summary["avg_rating"] == 7.0  # only vote_count > 50
+        assert {g["name"]: g["count"] for g in summary["genre_stats"]} == {
+            "Drama": 2,
+            "Comedy": 2,
+        }
+        assert {g["name"]: g["count"] for g in summary["rated_genre_stats"]} == {
+            "Drama": 2,
+            "Comedy": 1,
+        }
+        assert summary["year_stats"] == [
+            {"year": 1995, "count": 1},
+            {"year": 2001, "count": 2},
+        ]
+        assert [m["title"] for m in summary["top_revenue"]] == ["Movie 2", "Movie 1"]
+
+    def test_builds_in_three_scans(self, db_session, sample_movies, capture_sql):
+        """Movies, genre links and company links are each read exactly once"""
+        with capture_sql() as statements:
+            summary = build_analytics_summary(db_session)
+
+        assert summary["total_movies"] == 25
+        assert len(statements) == 3
+
+    def test_null_ratings_follow_sql_avg(self, db_session):
+        """Unrated movies count toward a genre but not its average"""
+        drama = Genre(tmdb_id=18, name="Drama")
+        db_session.add(drama)
+        db_session.commit()
+        _add_movie(db_session, 1, [drama], vote_average=8.0, vote_count=200)
+        _add_movie(db_session, 2, [drama], vote_average=None, vote_count=0)
+
+        summary = build_analytics_summary(db_session)
+
+        assert summary["genre_stats"] == [{"name": "Drama", "count": 2, "avg_rating": 8.0}]
+        assert [m["title"] for m in summary["top_rated"]] == ["Movie 1"]
+
+    def test_ties_are_deterministic(self, db_session):
+        """Equal counts sort by name; equal scores keep the earlier movie"""
+        genres = [Genre(tmdb_id=i, name=name) for i, name in enumerate(["Western", "Action"])]
+        db_session.add_all(genres)
+        db_session.commit()
+        for tmdb_id in range(1, 4):
+            _add_movie(db_session, tmdb_id, genres, revenue=500)
+
+        summary = build_analytics_summary(db_session)
+
+        assert [g["name"] for g in summary["genre_stats"]] == ["Action", "Western"]
+        assert [m["title"] for m in summary["top_revenue"]] == ["Movie 1", "Movie 2", "Movie 3"]
+
+    def test_top_companies_needs_two_rated_movies(self, db_session):
+        studio = ProductionCompany(tmdb_id=1, name="Studio")
+        indie = ProductionCompany(tmdb_id=2, name="Indie")
+        db_session.add_all([studio, indie])
+        db_session.commit()
+        movies = [
+            _add_movie(db_session, 1),
+            _add_movie(db_session, 2),
+            _add_movie(db_session, 3),
+            _add_movie(db_session, 4, vote_count=5),
+        ]
+        movies[0].companies.append(studio)
+        movies[1].companies.append(studio)
+        movies[2].companies.append(indie)
+        movies[3].companies.append(indie)
+        db_session.commit()
+
+        summary = build_analytics_summary(db_session)
+
+        assert summary["top_companies"] == [{"name": "Studio", "movie_count": 2, "avg_rating": 7.0}]
+
+    def test_summary_is_json_serializable(self, db_session, sample_movie):
+        company = ProductionCompany(tmdb_id=1, name="Studio")
+        sample_movie.companies.append(company)
+        db_session.commit()
+
+        json.dumps(build_analytics_summary(db_session))
+
+
+class TestAnalyticsSnapshot:
+    """Tests for snapshot persistence and reads"""
+
+    def test_missing_snapshot_is_built_without_storing(self, db_session, sample_movies):
+        summary = get_analytics_summary(db_session)
+
+        assert summary["total_movies"] == 25
+        assert not db_session.new and not db_session.dirty
+        assert db_session.query(AnalyticsSnapshot).count() == 0
+
+    def test_refresh_stores_snapshot(self, db_session, sample_movies):
+        refresh_analytics_snapshot(db_session)
+
+        stored = db_session.query(AnalyticsSnapshot).filter_by(name=SNAPSHOT_NAME).one()
+        assert json.loads(stored.payload)["total_movies"] == 25
+
+    def test_reads_do_not_rescan_catalog(self, db_session, sample_movies, capture_sql):
+        refresh_analytics_snapshot(db_session)
+
+        with capture_sql() as statements:
+            get_analytics_summary(db_session)
+
+        assert len(statements) == 1
+        assert "analytics_snapshots" in statements[0]
+
+    def test_refresh_picks_up_new_movies(self, db_session, sample_movies):
+        refresh_analytics_snapshot(db_session)
+        _add_movie(db_session, 9999)
+
+        assert get_analytics_summary(db_session)["total_movies"] == 25
+        refresh_analytics_snapshot(db_session)
+        assert get_analytics_summary(db_session)["total_movies"] == 26
+        assert db_session.query(AnalyticsSnapshot).count() == 1
+
+
+class TestAnalyticsEndpointsShareSnapshot:
+    """All analytics endpoints should report the same numbers"""
+
+    def test_endpoints_agree(self, client, db_session, sample_movies):
+        refresh_analytics_snapshot(db_session)
+
+        overview = client.get("/api/v1/analytics/overview").get_json()
+        genres = client.get("/api/v1/analytics/genres").get_json()
+        page = client.get("/analytics")
+        export = client.get("/analytics/export/csv")
+
+        assert overview["total_movies"] == 25
+        assert genres["genres"][0]["movie_count"] == 25
+        assert page.status_code == 200
+        assert b"25" in page.data
+
+        rows = list(csv.reader(io.StringIO(export.get_data(as_text=True))))
+        assert ["2024", "25"] in rows
+
+    def test_endpoints_serve_snapshot_until_refreshed(self, client, db_session, sample_movies):
+        refresh_analytics_snapshot(db_session)
+        _add_movie(db_session, 9999)
+
+        overview = client.get("/api/v1/analytics/overview").get_json()
+
+        assert overview["total_movies"] == 25
@@ -3,6 +3,8 @@ Tests for REST API endpoints (/api/v1/*)
 Replaces the manual test_api.py script with proper pytest coverage.
 """
 
+from unittest.mock import patch
+
 import pytest
 
 from src.app import limiter
@@ -93,6 +95,7 @@ class TestDocsEndpoint:
             route = rule.rule
             route = route.replace("<int:movie_id>", "<id>")
             route = route.replace("<int:actor_id>", "<id>")
+            route = route.replace("<int:source_id>", "<id>").replace("<int:target_id>", "<id>")
             actual_routes.add(f"GET {route}")
 
         assert documented_routes == actual_routes
@@ -202,6 +205,80 @@ class TestMoviesApiEndpoint:
         assert responses[-1].status_code == 429
 
 
+class TestMoviesCursorPagination:
+    """Tests for keyset cursors on /api/v1/movies"""
+
+    def _walk(self, client, sort, per_page=7):
+        """Follow next_cursor until the listing is exhausted, returning movie ids"""
+        data = client.get(f"/api/v1/movies?sort={sort}&per_page={per_page}").get_json()
+        ids = [m["id"] for m in data["movies"]]
+        while data["has_more"]:
+            data = client.get(
+                f"/api/v1/movies?sort={sort}&per_page={per_page}&cursor={data['next_cursor']}"
+            ).get_json()
+            ids.extend(m["id"] for m in data["movies"])
+        return ids
+
+    @pytest.mark.parametrize("sort", ["popularity", "rating", "release_date", "title"])
+    def test_cursor_walk_matches_full_listing(self, client, sample_movies, sort):
+        """Paging by cursor visits every row exactly once, in listing order"""
+        full = client.get(f"/api/v1/movies?sort={sort}&per_page=100").get_json()
+
+        ids = self._walk(client, sort)
+
+        assert ids == [m["id"] for m in full["movies"]]
+        assert len(ids) == len(set(ids)) == 25
+
+    def test_cursor_walk_handles_null_sort_values(self, client, db_session, sample_movies):
+        """Movies without a popularity sort last and are still reached"""
+        unranked = {movie.id for movie in sample_movies[:3]}
+        for movie in sample_movies[:3]:
+            movie.popularity = None
+        db_session.commit()
+
+        ids = self._walk(client, "popularity", per_page=4)
+
+        assert len(ids) == 25
+        assert set(ids[-3:]) == unranked
+
+    def test_cursor_page_skips_count_by_default(self, client, sample_movies):
+        first = client.get("/api/v1/movies?per_page=5").get_json()
+        second = client.get(f"/api/v1/movies?per_page=5&cursor={first['next_cursor']}").get_json()
+        counted = client.get(
+            f"/api/v1/movies?per_page=5&cursor={first['next_cursor']}&include_total=1"
+        ).get_json()
+
+        assert first["total"] == 25
+        assert "total" not in second
+        assert "page" not in second
+        assert counted["total"] == 25
+
+    def test_last_page_has_no_cursor(self, client, sample_movies):
+        data = client.get("/api/v1/movies?per_page=100").get_json()
+
+        assert data["has_more"] is False
+        assert data["next_cursor"] is None
+
+    def test_cursor_from_another_sort_is_rejected(self, client, sample_movies):
+        cursor = client.get("/api/v1/movies?per_page=5&sort=title").get_json()["next_cursor"]
+
+        response = client.get(f"/api/v1/movies?per_page=5&sort=rating&cursor={cursor}")
+
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+    def test_malformed_cursor_is_rejected(self, client, sample_movies):
+        response = client.get("/api/v1/movies?cursor=not-a-cursor")
+
+        assert response.status_code == 400
+
+    def test_movies_page_exposes_cursor_for_infinite_scroll(self, client, sample_movies):
+        page = client.get("/movies")
+        first = client.get("/api/v1/movies?per_page=20").get_json()
+
+        assert f'data-next-cursor="{first["next_cursor"]}"'.encode() in page.data
+
+
 class TestMovieDetailApiEndpoint:
     """Tests for /api/v1/movies/<id>"""
 
@@ -254,6 +331,66 @@ class TestMovieDetailApiEndpoint:
         assert "count" in data["user_rating"]
 
 
+class TestMovieEnrichmentApiEndpoint:
+    """Tests for /api/v1/movies/<id>/enrichment"""
+
+    _TRAILER = {"key": "abc", "site": "YouTube", "type": "Trailer", "official": True}
+    _PROVIDERS = {"flatrate": [{"provider_name": "Netflix", "logo_path": "/n.png"}]}
+
+    def test_returns_trailer_and_providers(self, client, sample_movie):
+        with patch("src.app.get_trailer_for_movie", return_value=self._TRAILER), patch(
+            "src.app.get_watch_providers_for_movie", return_value=self._PROVIDERS
+        ):
+            response = client.get(f"/api/v1/movies/{sample_movie.id}/enrichment")
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data["tmdb_id"] == sample_movie.tmdb_id
+        assert data["trailer"]["key"] == "abc"
+        assert data["watch_providers"] == self._PROVIDERS
+        assert data["complete"] is True
+
+    def test_complete_response_is_publicly_cacheable(self, client, sample_movie):
+        with patch("src.app.get_trailer_for_movie", return_value=None), patch(
+            "src.app.get_watch_providers_for_movie", return_value={}
+        ):
+            response = client.get(f"/api/v1/movies/{sample_movie.id}/enrichment")
+
+        assert response.cache_control.public is True
+        assert response.cache_control.max_age == 3600
+        assert response.headers.get("ETag")
+
+    def test_matching_etag_returns_304(self, client, sample_movie):
+        with patch("src.app.get_trailer_for_movie", return_value=self._TRAILER), patch(
+            "src.app.get_watch_providers_for_movie", return_value=self._PROVIDERS
+        ):
+            first = client.get(f"/api/v1/movies/{sample_movie.id}/enrichment")
+            second = client.get(
+                f"/api/v1/movies/{sample_movie.id}/enrichment",
+                headers={"If-None-Match": first.headers["ETag"]},
+            )
+
+        assert second.status_code == 304
+        assert second.data == b""
+
+    def test_partial_response_is_not_cached(self, client, sample_movie):
+        with patch("src.app.get_trailer_for_movie", return_value=None), patch(
+            "src.app.get_watch_providers_for_movie", side_effect=TimeoutError("slow")
+        ):
+            response = client.get(f"/api/v1/movies/{sample_movie.id}/enrichment")
+
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data["complete"] is False
+        assert data["watch_providers"] == {}
+        assert response.cache_control.no_cache
+        assert not response.cache_control.public
+
+    def test_unknown_movie_returns_404(self, client):
+        response = client.get("/api/v1/movies/99999/enrichment")
+        assert response.status_code == 404
+
+
 class TestMovieSearchApiEndpoint:
     """Tests for /api/v1/movies/search"""
 
@@ -7,7 +7,7 @@ import re
 import pytest
 from werkzeug.security import check_password_hash
 
-from src.models import Movie, User
+from src.models import Movie, User, UserTasteProfile
 
 
 def _csrf_token_from_response(response):
@@ -464,6 +464,7 @@ class TestWatchlistFeature:
         user = db_session.query(User).filter_by(id=user_id).first()
         for movie in sample_movies:
             user.watchlist.append(movie)
+        db_session.add(UserTasteProfile(user_id=user_id, weights="{}"))
         db_session.commit()
 
         with capture_sql() as statements:
@@ -472,7 +473,8 @@ class TestWatchlistFeature:
         assert response.status_code == 200
         assert response.get_json()["status"] == "removed"
         selects = _select_statements(statements)
-        assert len(selects) <= 3
+        # user, movie and membership, plus the taste profile and the movie's features
+        assert len(selects) <= 5
         assert any("exists" in statement and "user_watchlist" in statement for statement in selects)
 
     def test_watchlist_nonexistent_movie(self, client, logged_in_user):
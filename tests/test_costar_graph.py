@@ -0,0 +1,156 @@
+"""
+Tests for the in-memory co-star graph (src/costar_graph.py)
+"""
+
+import pytest
+
+from src.costar_graph import CostarGraph, build_costar_graph
+from src.models import Cast, Movie, Person
+
+# person -> movies: 1 is in everything, 2 and 3 share two films, 4 is alone
+CREDITS = [
+    (1, 10),
+    (1, 11),
+    (1, 12),
+    (2, 10),
+    (2, 11),
+    (3, 10),
+    (3, 11),
+    (3, 12),
+    (4, 13),
+    (1, 10),  # a second role in the same film
+]
+
+
+@pytest.fixture
+def graph():
+    return CostarGraph(CREDITS)
+
+
+class TestCostarGraph:
+    """Tests for co-appearance queries"""
+
+    def test_movies(self, graph):
+        assert graph.movies(1) == {10, 11, 12}
+        assert graph.movies(99) == set()
+        assert len(graph) == 4
+
+    def test_shared_movies(self, graph):
+        assert graph.shared_movies([1, 2]) == {10, 11}
+        assert graph.shared_movies([1, 2, 4]) == set()
+        assert graph.shared_movies([1, 99]) == set()
+
+    def test_collaborators_ranked(self, graph):
+        assert graph.collaborators(1, limit=5) == [(3, 3), (2, 2)]
+        assert graph.collaborators(1, limit=1) == [(3, 3)]
+        assert graph.collaborators(4, limit=5) == []
+        assert graph.collaborators(99, limit=5) == []
+
+    def test_costars_count_films_shared_with_everyone(self, graph):
+        assert graph.costars([2]) == {1: 2, 2: 2, 3: 2}
+        assert graph.costars([2, 4]) == {}
+
+    def test_pair_shared_movies(self, graph):
+        assert graph.pair_shared_movies([2, 3, 4]) == {(2, 3): {10, 11}}
+
+
+def _credit(db_session, movie, *people):
+    for order, person in enumerate(people):
+        db_session.add(Cast(movie_id=movie.id, person_id=person.id, cast_order=order))
+
+
+@pytest.fixture
+def ensemble(db_session):
+    movies = [
+        Movie(tmdb_id=i, title=f"Film {i}", vote_count=10, vote_average=7.0) for i in range(3)
+    ]
+    people = [Person(tmdb_id=100 + i, name=f"Actor {i}") for i in range(4)]
+    db_session.add_all(movies + people)
+    db_session.flush()
+    _credit(db_session, movies[0], people[0], people[1], people[2])
+    _credit(db_session, movies[1], people[0], people[1])
+    _credit(db_session, movies[2], people[3])
+    db_session.commit()
+    return movies, people
+
+
+def test_built_from_database(db_session, ensemble):
+    movies, people = ensemble
+
+    graph = build_costar_graph(db_session)
+
+    assert graph.shared_movies([people[0].id, people[1].id]) == {movies[0].id, movies[1].id}
+
+
+class TestGraphRoutes:
+    """Routes answered from the graph"""
+
+    def test_actor_network(self, client, ensemble, capture_sql):
+        _, people = ensemble
+        url = f"/actor/{people[0].id}/network"
+
+        with capture_sql() as statements:
+            response = client.get(url)
+
+        assert response.status_code == 200
+        html = response.get_data(as_text=True)
+        assert "Actor 1" in html and "Actor 2" in html and "Actor 3" not in html
+        # Person, catalog version, cast scan, collaborators, titles
+        assert len(statements) <= 5
+
+    def test_actor_network_without_collaborators(self, client, ensemble):
+        _, people = ensemble
+
+        assert client.get(f"/actor/{people[3].id}/network").status_code == 200
+
+    def test_common_films(self, client, ensemble):
+        _, people = ensemble
+
+        html = client.get(f"/common-films?actor={people[0].id}&actor={people[2].id}").get_data(
+            as_text=True
+        )
+
+        assert "Film 0" in html and "Film 1" not in html
+
+    def test_actor_search_with_filter(self, client, ensemble):
+        _, people = ensemble
+
+        data = client.get(f"/api/v1/actors/search?q=actor&with={people[1].id}").get_json()
+
+        assert [(actor["name"], actor["movie_count"]) for actor in data["actors"]] == [
+            ("Actor 0", 2),
+            ("Actor 1", 2),
+            ("Actor 2", 1),
+        ]
+
+
+class TestShortestPath:
+    """Tests for the bidirectional BFS"""
+
+    # 1 -10- 2 -11- 3 -12- 4, with a shortcut 1 -14- 5 -15- 4 and 6 alone
+    CHAIN = [(1, 10), (2, 10), (2, 11), (3, 11), (3, 12), (4, 12), (6, 13)]
+
+    def test_follows_chain_in_either_direction(self):
+        graph = CostarGraph(self.CHAIN)
+
+        assert graph.shortest_path(1, 4) == ([1, 2, 3, 4], [10, 11, 12])
+        assert graph.shortest_path(4, 1) == ([4, 3, 2, 1], [12, 11, 10])
+
+    def test_prefers_fewer_films(self):
+        graph = CostarGraph(self.CHAIN + [(1, 14), (5, 14), (5, 15), (4, 15)])
+
+        assert graph.shortest_path(1, 4) == ([1, 5, 4], [14, 15])
+
+    def test_same_person_and_unknowns(self):
+        graph = CostarGraph(self.CHAIN)
+
+        assert graph.shortest_path(2, 2) == ([2], [])
+        assert graph.shortest_path(1, 99) is None
+        assert graph.shortest_path(1, 6) is None
+
+    def test_search_limits(self):
+        graph = CostarGraph(self.CHAIN)
+
+        assert graph.shortest_path(1, 4, max_degrees=2) is None
+        assert graph.shortest_path(1, 4, max_degrees=3) is not None
+        assert graph.shortest_path(1, 4, max_visited=2) is None
@@ -0,0 +1,131 @@
+"""
+Tests for memoized listing totals (src/counts.py)
+"""
+
+from unittest.mock import patch
+
+from sqlalchemy import desc
+
+from src.analytics import refresh_analytics_snapshot
+from src.counts import CountService
+from src.models import Movie
+
+
+class DictCache:
+    """Minimal stand-in for Flask-Caching's get/set API."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+
+
+def _count_statements(statements):
+    return [s for s in statements if "count(" in s.lower()]
+
+
+class TestCountService:
+    """Tests for CountService"""
+
+    def test_counts_without_cache(self, db_session, sample_movies):
+        service = CountService()
+
+        assert service.total(db_session, db_session.query(Movie)) == 25
+
+    def test_repeat_total_is_memoized(self, db_session, sample_movies, capture_sql):
+        service = CountService(cache=DictCache())
+        query = db_session.query(Movie).filter(Movie.vote_count > 150)
+        expected = query.count()
+
+        assert service.total(db_session, query) == expected
+        with capture_sql() as statements:
+            assert service.total(db_session, query) == expected
+
+        assert _count_statements(statements) == []
+
+    def test_sort_and_filter_order_share_an_entry(self, db_session, sample_movies):
+        cache = DictCache()
+        service = CountService(cache=cache)
+        by_popularity = (
+            db_session.query(Movie)
+            .filter(Movie.vote_count > 150, Movie.vote_average >= 8)
+            .order_by(desc(Movie.popularity))
+        )
+        by_title = (
+            db_session.query(Movie)
+            .filter(Movie.vote_count > 150, Movie.vote_average >= 8)
+            .order_by(Movie.title)
+        )
+
+        service.total(db_session, by_popularity)
+        service.total(db_session, by_title)
+
+        assert len(cache.data) == 1
+
+    def test_different_filters_get_different_totals(self, db_session, sample_movies):
+        service = CountService(cache=DictCache())
+
+        loose = service.total(db_session, db_session.query(Movie).filter(Movie.vote_count > 0))
+        strict = service.total(db_session, db_session.query(Movie).filter(Movie.vote_count > 300))
+
+        assert loose == 25
+        assert strict == 4
+
+    def test_sync_refresh_invalidates_totals(self, db_session, sample_movies):
+        service = CountService(cache=DictCache())
+        refresh_analytics_snapshot(db_session)
+        assert service.total(db_session, db_session.query(Movie)) == 25
+
+        db_session.add(Movie(tmdb_id=99999, title="Late Arrival"))
+        db_session.commit()
+        assert service.total(db_session, db_session.query(Movie)) == 25
+
+        refresh_analytics_snapshot(db_session)
+        assert service.total(db_session, db_session.query(Movie)) == 26
+
+    def test_planner_estimate_used_above_threshold(self, db_session, sample_movies):
+        service = CountService(estimate_threshold=1000)
+
+        with patch.object(CountService, "_planner_estimate", return_value=5_000_000):
+            assert service.total(db_session, db_session.query(Movie)) == 5_000_000
+
+    def test_small_estimates_fall_back_to_exact_count(self, db_session, sample_movies):
+        service = CountService(estimate_threshold=1000)
+
+        with patch.object(CountService, "_planner_estimate", return_value=30):
+            assert service.total(db_session, db_session.query(Movie)) == 25
+
+    def test_failed_estimate_falls_back_to_exact_count(
+        self, db_session, sample_movies, capture_sql
+    ):
+        service = CountService(estimate_threshold=1)
+        dialect = db_session.get_bind().dialect
+
+        # SQLite rejects the Postgres EXPLAIN syntax, standing in for a timeout
+        with patch.object(dialect, "name", "postgresql"), capture_sql() as statements:
+            total = service.total(db_session, db_session.query(Movie))
+
+        assert total == 25
+        assert any(s.startswith("ROLLBACK TO SAVEPOINT") for s in statements)
+
+    def test_estimate_is_skipped_on_sqlite(self, db_session, sample_movies):
+        service = CountService(estimate_threshold=1)
+
+        assert service.total(db_session, db_session.query(Movie)) == 25
+
+
+class TestListingRoutesUseCountService:
+    """Listing pages should reuse memoized totals"""
+
+    def test_movies_page_reuses_total(self, client, sample_movies, capture_sql):
+        with patch("src.app.listing_counts.cache", DictCache()):
+            client.get("/movies?sort=title")
+            with capture_sql() as statements:
+                response = client.get("/movies?sort=popularity")
+
+        assert response.status_code == 200
+        assert _count_statements(statements) == []
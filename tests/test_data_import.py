@@ -9,19 +9,20 @@ Focuses on logic that can be tested without hitting the TMDB API:
 - Genre duplicate handling
 """
 
+import json
 from datetime import date
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from src.data_import import DataImporter
-from src.models import Base, Cast, Crew, Genre, Movie, Person
+from src.models import AnalyticsSnapshot, Base, Cast, Crew, Genre, Movie, Person
 
 
 @pytest.fixture
 def importer(db_session):
     """Create a DataImporter with a mocked TMDB client and test DB session."""
-    with patch("src.data_import.TMDBClient"), patch("src.data_import.Session") as mock_session:
+    with patch("src.data_import.TMDBClient"), patch("src.data_import.job_session") as mock_session:
         mock_session.return_value = db_session
         imp = DataImporter()
         imp.session = db_session
@@ -177,6 +178,16 @@ class TestDuplicateHandling:
 
         assert stats == {"created": 1, "skipped": 1, "failed": 0}
 
+    def test_import_popular_movies_refreshes_analytics_snapshot(self, importer, db_session):
+        importer.client.get_popular_movies.return_value = {"results": [{"id": 22222}]}
+        importer.client.get_movie_details.return_value = make_movie_data(id=22222)
+        importer.client.get_movie_credits.return_value = {"cast": [], "crew": []}
+
+        importer.import_popular_movies(num_pages=1)
+
+        snapshot = db_session.query(AnalyticsSnapshot).one()
+        assert json.loads(snapshot.payload)["total_movies"] == 1
+
 
 # ============================================
 # Movie field mapping
@@ -0,0 +1,86 @@
+"""
+Tests for the request-scoped database session and current-user cache
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from flask import session as flask_session
+
+import src.app as app_module
+from src.app import get_current_user, get_db_session
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    """Replace the sessionmaker with one that hands out recorded mocks"""
+    created = []
+
+    def factory():
+        created.append(MagicMock(name=f"session{len(created)}"))
+        return created[-1]
+
+    monkeypatch.setattr(app_module, "Session", factory)
+    return created
+
+
+class TestRequestScopedSession:
+    """Tests for get_db_session and its teardown"""
+
+    def test_one_session_per_app_context(self, app, session_factory):
+        with app.app_context():
+            first = get_db_session()
+            assert get_db_session() is first
+            first.close.assert_not_called()
+
+        first.close.assert_called_once()
+        first.rollback.assert_not_called()
+        assert len(session_factory) == 1
+
+    def test_created_lazily(self, app, session_factory):
+        with app.app_context():
+            pass
+
+        assert session_factory == []
+
+    def test_rolled_back_on_error(self, app, session_factory):
+        with pytest.raises(RuntimeError):
+            with app.app_context():
+                get_db_session()
+                raise RuntimeError("boom")
+
+        session_factory[0].rollback.assert_called_once()
+        session_factory[0].close.assert_called_once()
+
+    def test_outside_app_context_returns_fresh_sessions(self, session_factory):
+        assert get_db_session() is not get_db_session()
+        assert len(session_factory) == 2
+
+
+class TestCurrentUserCache:
+    """get_current_user loads the user once per request"""
+
+    def test_user_loaded_once(self, app, db_session, sample_user, capture_sql):
+        user_id = sample_user.id
+        db_session.expunge_all()
+
+        with app.test_request_context("/"):
+            flask_session["user_id"] = user_id
+            with capture_sql() as statements:
+                first = get_current_user(db_session)
+                second = get_current_user(db_session)
+
+        assert first is second
+        assert first.id == user_id
+        assert len(statements) == 1
+
+    def test_switching_user_reloads(self, app, db_session, sample_user, multiple_users):
+        other_id = multiple_users[0].id
+
+        with app.test_request_context("/"):
+            flask_session["user_id"] = sample_user.id
+            assert get_current_user(db_session).id == sample_user.id
+            flask_session["user_id"] = other_id
+            assert get_current_user(db_session).id == other_id
+            flask_session.pop("user_id")
+            assert get_current_user(db_session) is None
@@ -0,0 +1,213 @@
+"""
+Tests for the cached decade overview (src/decades.py)
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+
+from src.analytics import refresh_analytics_snapshot
+from src.decades import (
+    build_decade_detail,
+    build_decade_summary,
+    get_decade_detail,
+    get_decade_summary,
+    load_movies,
+)
+from src.models import Genre, Movie
+
+
+class DictCache:
+    """Minimal stand-in for Flask-Caching's get/set API."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+
+
+@pytest.fixture
+def decade_catalog(db_session):
+    rows = [
+        # (tmdb_id, year, rating, votes, popularity, revenue, backdrop)
+        (1, 1985, 6.0, 100, 30.0, 100, "/eighties-b.jpg"),
+        (2, 1988, 8.0, 300, 90.0, 300, "/eighties-a.jpg"),
+        (3, 1989, 7.0, 10, 99.0, 0, "/too-few-votes.jpg"),
+        (4, 1994, 9.0, 500, 50.0, 1000, None),
+        (5, 2003, 5.0, 0, 10.0, 0, "/unrated.jpg"),
+    ]
+    for tmdb_id, year, rating, votes, popularity, revenue, backdrop in rows:
+        db_session.add(
+            Movie(
+                tmdb_id=tmdb_id,
+                title=f"Movie {tmdb_id}",
+                release_date=date(year, 6, 1),
+                vote_average=rating,
+                vote_count=votes,
+                popularity=popularity,
+                revenue=revenue,
+                backdrop_path=backdrop,
+            )
+        )
+    db_session.commit()
+
+
+class TestBuildDecadeSummary:
+    """Tests for build_decade_summary"""
+
+    def test_summary_values(self, db_session, decade_catalog):
+        summary = build_decade_summary(db_session)
+
+        assert summary == [
+            {
+                "decade_start": 1980,
+                "decade_end": 1989,
+                "label": "1980s",
+                "movie_count": 3,
+                "avg_rating": 7.0,
+                "total_revenue": 400,
+                "hero_backdrop": "/eighties-a.jpg",
+            },
+            {
+                "decade_start": 1990,
+                "decade_end": 1999,
+                "label": "1990s",
+                "movie_count": 1,
+                "avg_rating": 9.0,
+                "total_revenue": 1000,
+                "hero_backdrop": None,
+            },
+        ]
+
+    def test_single_query(self, db_session, decade_catalog, capture_sql):
+        with capture_sql() as statements:
+            build_decade_summary(db_session)
+
+        assert len(statements) == 1
+
+    def test_fallback_matches_window_query(self, db_session, decade_catalog):
+        windowed = build_decade_summary(db_session)
+
+        with patch("src.decades.supports_window_functions", return_value=False):
+            fallback = build_decade_summary(db_session)
+
+        assert fallback == windowed
+
+
+class TestGetDecadeSummary:
+    """Tests for caching of the decade summary"""
+
+    def test_cached_until_sync(self, db_session, decade_catalog, capture_sql):
+        cache = DictCache()
+        refresh_analytics_snapshot(db_session)
+        first = get_decade_summary(db_session, cache=cache)
+
+        with capture_sql() as statements:
+            assert get_decade_summary(db_session, cache=cache) == first
+        assert len(statements) == 1  # catalog version lookup only
+
+        db_session.add(Movie(tmdb_id=99, title="New", release_date=date(1999, 1, 1), vote_count=5))
+        db_session.commit()
+        assert get_decade_summary(db_session, cache=cache)[1]["movie_count"] == 1
+
+        refresh_analytics_snapshot(db_session)
+        assert get_decade_summary(db_session, cache=cache)[1]["movie_count"] == 2
+
+    def test_decades_page_renders_summary(self, client, decade_catalog):
+        response = client.get("/decades")
+
+        assert response.status_code == 200
+        assert b"/eighties-a.jpg" in response.data
+        assert b"1990s" in response.data
+
+
+class TestBuildDecadeDetail:
+    """Tests for build_decade_detail"""
+
+    def test_sections(self, db_session, decade_catalog):
+        ids = {m.tmdb_id: m.id for m in db_session.query(Movie)}
+
+        detail = build_decade_detail(db_session, 1980)
+
+        assert detail["stats"] == {
+            "total_movies": 3,
+            "avg_rating": 7.0,
+            "total_revenue": 400,
+            "top_genre": "N/A",
+        }
+        assert detail["chart_data"] == {
+            "years": [1985, 1988, 1989],
+            "counts": [1, 1, 1],
+            "ratings": [6.0, 8.0, 7.0],
+        }
+        assert detail["top_rated_ids"] == [ids[2], ids[1]]
+        assert detail["most_popular_ids"] == [ids[3], ids[2], ids[1]]
+        assert detail["defining_film_ids"] == [ids[2], ids[1]]
+
+    def test_genre_breakdown(self, db_session, decade_catalog):
+        drama, comedy = Genre(tmdb_id=18, name="Drama"), Genre(tmdb_id=35, name="Comedy")
+        for movie in db_session.query(Movie).filter(Movie.release_decade == 1980):
+            movie.genres.append(drama)
+            if movie.tmdb_id == 1:
+                movie.genres.append(comedy)
+        db_session.commit()
+
+        detail = build_decade_detail(db_session, 1980)
+
+        assert detail["genre_stats"] == [
+            {"name": "Drama", "count": 3},
+            {"name": "Comedy", "count": 1},
+        ]
+        assert detail["stats"]["top_genre"] == "Drama"
+
+    def test_unrated_decade_is_empty(self, db_session, decade_catalog):
+        assert build_decade_detail(db_session, 2000) is None
+        assert build_decade_detail(db_session, 1950) is None
+
+    def test_two_queries(self, db_session, decade_catalog, capture_sql):
+        with capture_sql() as statements:
+            build_decade_detail(db_session, 1980)
+
+        assert len(statements) == 2
+
+    def test_load_movies_keeps_order(self, db_session, decade_catalog, capture_sql):
+        ids = [m.id for m in db_session.query(Movie).order_by(Movie.id)]
+
+        with capture_sql() as statements:
+            first, second = load_movies(db_session, [ids[2], ids[0]], [ids[1]])
+
+        assert [m.id for m in first] == [ids[2], ids[0]]
+        assert [m.id for m in second] == [ids[1]]
+        assert len(statements) == 1
+
+
+class TestGetDecadeDetail:
+    """Tests for caching of decade detail pages"""
+
+    def test_cached_per_decade_until_sync(self, db_session, decade_catalog):
+        cache = DictCache()
+        refresh_analytics_snapshot(db_session)
+
+        assert get_decade_detail(db_session, 1990, cache=cache)["stats"]["total_movies"] == 1
+        assert get_decade_detail(db_session, 2000, cache=cache) is None
+
+        db_session.add(Movie(tmdb_id=98, title="Late", release_date=date(2001, 1, 1), vote_count=9))
+        db_session.commit()
+        assert get_decade_detail(db_session, 2000, cache=cache) is None
+
+        refresh_analytics_snapshot(db_session)
+        assert get_decade_detail(db_session, 2000, cache=cache)["stats"]["total_movies"] == 1
+        assert get_decade_detail(db_session, 1990, cache=cache)["stats"]["total_movies"] == 1
+
+    def test_decade_detail_page(self, client, decade_catalog, capture_sql):
+        with capture_sql() as statements:
+            response = client.get("/decade/1980")
+
+        assert response.status_code == 200
+        assert b"Movie 2" in response.data
+        assert len(statements) <= 4
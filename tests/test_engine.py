@@ -0,0 +1,119 @@
+"""
+Tests for the SQLAlchemy engine factory (src/engine.py)
+"""
+
+from unittest.mock import patch
+
+from sqlalchemy import text
+
+from config.config import Config
+from src import engine as engine_module
+from src import models as models_module
+from src.engine import create_app_engine
+from src.models import job_session
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestSQLiteEngine:
+    """Tests for SQLite connection pragmas"""
+
+    def test_file_database_uses_wal(self, tmp_path):
+        engine = create_app_engine(f"sqlite:///{tmp_path / 'app.db'}")
+        try:
+            assert _pragma(engine, "journal_mode") == "wal"
+            assert _pragma(engine, "synchronous") == 1  # NORMAL
+            assert _pragma(engine, "mmap_size") == Config.SQLITE_MMAP_SIZE
+            assert _pragma(engine, "busy_timeout") == Config.SQLITE_BUSY_TIMEOUT_MS
+        finally:
+            engine.dispose()
+
+    def test_in_memory_database_skips_wal(self):
+        engine = create_app_engine("sqlite:///:memory:")
+        try:
+            assert _pragma(engine, "journal_mode") == "memory"
+            assert _pragma(engine, "synchronous") == 1
+        finally:
+            engine.dispose()
+
+
+class TestPostgresEngine:
+    """Tests for Postgres pool and connection settings"""
+
+    def _engine_kwargs(self, **factory_kwargs):
+        with patch.object(engine_module, "create_engine") as create_engine:
+            create_app_engine("postgresql+psycopg2://user:pw@db.internal/movies", **factory_kwargs)
+        return create_engine.call_args.kwargs
+
+    def test_pool_settings_come_from_config(self, monkeypatch):
+        monkeypatch.setattr(Config, "DB_POOL_SIZE", 7)
+        monkeypatch.setattr(Config, "DB_POOL_RECYCLE", 300)
+
+        kwargs = self._engine_kwargs()
+
+        assert kwargs["pool_size"] == 7
+        assert kwargs["max_overflow"] == Config.DB_MAX_OVERFLOW
+        assert kwargs["pool_recycle"] == 300
+        assert kwargs["pool_pre_ping"] is Config.DB_POOL_PRE_PING
+
+    def test_connect_args(self, monkeypatch):
+        monkeypatch.setattr(Config, "DB_STATEMENT_TIMEOUT_MS", 5000)
+
+        connect_args = self._engine_kwargs()["connect_args"]
+
+        assert connect_args["application_name"] == Config.DB_APPLICATION_NAME
+        assert connect_args["options"] == "-c statement_timeout=5000"
+
+    def test_statement_timeout_can_be_disabled(self):
+        connect_args = self._engine_kwargs(statement_timeout_ms=0)["connect_args"]
+
+        assert "options" not in connect_args
+
+    def test_explicit_kwargs_win(self):
+        assert self._engine_kwargs(pool_size=1)["pool_size"] == 1
+
+    def test_job_sessions_use_the_job_timeout(self, monkeypatch):
+        monkeypatch.setattr(
+            Config, "DATABASE_URL", "postgresql+psycopg2://user:pw@db.internal/movies"
+        )
+        monkeypatch.setattr(Config, "DB_STATEMENT_TIMEOUT_MS", 5000)
+        monkeypatch.setattr(Config, "DB_JOB_STATEMENT_TIMEOUT_MS", 600000)
+        monkeypatch.setattr(models_module, "_job_sessionmaker", None)
+
+        with patch.object(engine_module, "create_engine") as create_engine:
+            job_session()
+
+        connect_args = create_engine.call_args.kwargs["connect_args"]
+        assert connect_args["options"] == "-c statement_timeout=600000"
+
+    def test_job_sessions_share_one_engine(self, monkeypatch):
+        monkeypatch.setattr(
+            Config, "DATABASE_URL", "postgresql+psycopg2://user:pw@db.internal/movies"
+        )
+        monkeypatch.setattr(models_module, "_job_sessionmaker", None)
+
+        with patch.object(engine_module, "create_engine") as create_engine:
+            first, second = job_session(), job_session()
+
+        assert create_engine.call_count == 1
+        assert first.get_bind() is second.get_bind()
+
+
+class TestForkSafety:
+    """Child processes must not reuse the parent's pooled connections"""
+
+    def test_child_drops_inherited_pool(self, tmp_path):
+        engine = create_app_engine(f"sqlite:///{tmp_path / 'fork.db'}")
+        try:
+            with engine.connect():
+                pass
+            parent_pool = engine.pool
+
+            engine_module._dispose_inherited_pools()
+
+            assert engine.pool is not parent_pool
+        finally:
+            engine.dispose()
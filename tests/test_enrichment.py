@@ -0,0 +1,224 @@
+"""
+Tests for concurrent TMDB enrichment of the movie detail page
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import requests
+
+from src.enrichment import MovieEnricher, select_trailer
+
+
+class DictCache:
+    """Minimal stand-in for Flask-Caching's get/set API."""
+
+    def __init__(self):
+        self.data = {}
+        self.timeouts = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+        self.timeouts[key] = timeout
+
+
+def _enricher(fetchers, cache=None, budget=1.0):
+    return MovieEnricher(
+        fetchers=fetchers,
+        defaults={"trailer": None, "watch_providers": {}},
+        cache=cache,
+        budget=budget,
+    )
+
+
+class TestMovieEnricher:
+    """Tests for MovieEnricher"""
+
+    def test_fetches_run_concurrently(self):
+        """Both lookups should overlap rather than run back to back"""
+
+        def slow(value):
+            def _fetch(tmdb_id):
+                time.sleep(0.3)
+                return value
+
+            return _fetch
+
+        enricher = _enricher({"trailer": slow({"key": "abc"}), "watch_providers": slow({"x": 1})})
+
+        start = time.monotonic()
+        result = enricher.enrich(550)
+        elapsed = time.monotonic() - start
+
+        assert result == {"trailer": {"key": "abc"}, "watch_providers": {"x": 1}, "complete": True}
+        assert elapsed < 0.55
+
+    def test_budget_exceeded_returns_defaults(self):
+        """Parts that miss the budget fall back to their defaults"""
+        release = threading.Event()
+
+        def stuck(tmdb_id):
+            release.wait(2)
+            return {"flatrate": []}
+
+        enricher = _enricher(
+            {"trailer": lambda tmdb_id: {"key": "abc"}, "watch_providers": stuck}, budget=0.05
+        )
+        try:
+            result = enricher.enrich(550)
+        finally:
+            release.set()
+
+        assert result["trailer"] == {"key": "abc"}
+        assert result["watch_providers"] == {}
+        assert result["complete"] is False
+
+    def test_late_result_is_cached_for_next_view(self):
+        """A lookup that lands after the budget is stored for the next render"""
+        cache = DictCache()
+        release = threading.Event()
+
+        def delayed(tmdb_id):
+            release.wait(2)
+            return {"flatrate": [{"provider_name": "Netflix"}]}
+
+        enricher = _enricher(
+            {"trailer": lambda tmdb_id: None, "watch_providers": delayed}, cache=cache, budget=0.05
+        )
+        assert enricher.enrich(550)["watch_providers"] == {}
+
+        release.set()
+        enricher.executor.shutdown(wait=True)
+
+        assert cache.get("enrichment:watch_providers:550") == {
+            "value": {"flatrate": [{"provider_name": "Netflix"}]}
+        }
+
+    def test_positive_and_negative_results_cached(self):
+        """Empty results are cached too, with a shorter timeout"""
+        cache = DictCache()
+        calls = []
+
+        def trailer(tmdb_id):
+            calls.append(tmdb_id)
+            return None
+
+        enricher = _enricher(
+            {"trailer": trailer, "watch_providers": lambda tmdb_id: {"rent": []}}, cache=cache
+        )
+        enricher.enrich(550)
+        second = enricher.enrich(550)
+
+        assert calls == [550]
+        assert second["trailer"] is None
+        assert (
+            cache.timeouts["enrichment:trailer:550"]
+            < cache.timeouts["enrichment:watch_providers:550"]
+        )
+
+    def test_errors_are_not_cached(self):
+        """A failing lookup renders the default and is retried next time"""
+        cache = DictCache()
+
+        def boom(tmdb_id):
+            raise TimeoutError("slow")
+
+        enricher = _enricher(
+            {"trailer": lambda tmdb_id: None, "watch_providers": boom}, cache=cache
+        )
+        result = enricher.enrich(550)
+
+        assert result["watch_providers"] == {}
+        assert result["complete"] is False
+        assert "enrichment:watch_providers:550" not in cache.data
+
+    @patch("src.tmdb_api.requests.Session.get")
+    def test_tmdb_outage_is_not_cached_as_empty(self, mock_get):
+        """A TMDB timeout is an error, not a "no trailer / no providers" result"""
+        from src.app import movie_enricher
+
+        mock_get.side_effect = requests.Timeout("Connection timed out")
+        cache = DictCache()
+
+        result = _enricher(movie_enricher.fetchers, cache=cache).enrich(987650)
+
+        assert result["trailer"] is None
+        assert result["watch_providers"] == {}
+        assert result["complete"] is False
+        assert cache.data == {}
+
+
+class TestSelectTrailer:
+    """Tests for select_trailer"""
+
+    def test_prefers_teaser_over_featurette(self):
+        """Teasers beat other YouTube video types"""
+        videos = {
+            "results": [
+                {"key": "a", "site": "YouTube", "type": "Featurette"},
+                {"key": "b", "site": "YouTube", "type": "Teaser"},
+            ]
+        }
+        assert select_trailer(videos)["key"] == "b"
+
+    def test_handles_empty_payload(self):
+        """An empty TMDB response yields no trailer"""
+        assert select_trailer({}) is None
+
+
+class TestMovieDetailEnrichment:
+    """Tests for enrichment on the movie detail route"""
+
+    def test_movie_detail_renders_when_budget_exceeded(self, client, sample_movie):
+        """The page renders without enrichment when TMDB is too slow"""
+        release = threading.Event()
+
+        def stuck(tmdb_id):
+            release.wait(2)
+            return {}
+
+        with patch("src.app.get_watch_providers_for_movie", side_effect=stuck), patch(
+            "src.app.get_trailer_for_movie", side_effect=stuck
+        ), patch("src.app.movie_enricher.budget", 0.05), patch(
+            "src.app.Config.DEFER_ENRICHMENT", False
+        ):
+            start = time.monotonic()
+            response = client.get(f"/movie/{sample_movie.id}")
+            elapsed = time.monotonic() - start
+        release.set()
+
+        assert response.status_code == 200
+        assert elapsed < 1.5
+
+    def test_deferred_mode_skips_tmdb_and_loads_client_side(self, client, sample_movie):
+        """Deferred mode never calls TMDB while rendering the page"""
+        with patch("src.app.get_trailer_for_movie") as mock_trailer, patch(
+            "src.app.get_watch_providers_for_movie"
+        ) as mock_providers, patch("src.app.Config.DEFER_ENRICHMENT", True):
+            response = client.get(f"/movie/{sample_movie.id}")
+
+        assert response.status_code == 200
+        mock_trailer.assert_not_called()
+        mock_providers.assert_not_called()
+        assert b'id="movie-enrichment"' in response.data
+        assert f"/api/v1/movies/{sample_movie.id}/enrichment".encode() in response.data
+        assert b"js/movie-enrichment.js" in response.data
+
+    def test_deferred_mode_renders_cached_enrichment_inline(self, client, sample_movie):
+        """A full cache hit is rendered server-side with no client fetch"""
+        cached = {
+            "trailer": {"key": "abc", "name": "Cached Trailer"},
+            "watch_providers": {},
+            "complete": True,
+        }
+        with patch("src.app.movie_enricher.cached", return_value=cached), patch(
+            "src.app.Config.DEFER_ENRICHMENT", True
+        ):
+            response = client.get(f"/movie/{sample_movie.id}")
+
+        assert b"Cached Trailer" in response.data
+        assert b'id="movie-enrichment"' not in response.data
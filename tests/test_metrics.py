@@ -0,0 +1,130 @@
+"""
+Tests for the Prometheus /metrics endpoint (src/metrics.py)
+"""
+
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+import requests
+from flask import Flask
+from flask_caching import Cache
+from prometheus_client import REGISTRY
+
+from config.config import Config
+from src import metrics
+from src.tmdb_api import TMDBClient
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestMetricsEndpoint:
+    """Tests for /metrics"""
+
+    def test_requests_are_labelled_by_route_template(self, client, sample_movie):
+        labels = {"method": "GET", "route": "/api/v1/movies/<int:movie_id>", "status": "200"}
+        before = _sample("http_requests_total", **labels)
+
+        client.get(f"/api/v1/movies/{sample_movie.id}")
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        assert _sample("http_requests_total", **labels) == before + 1
+        assert b'http_request_duration_seconds_bucket{le="0.1",method="GET"' in response.data
+        assert f"/api/v1/movies/{sample_movie.id}".encode() not in response.data
+
+    def test_unmatched_paths_share_one_series(self, client):
+        labels = {"method": "GET", "route": "<unmatched>", "status": "404"}
+        before = _sample("http_requests_total", **labels)
+
+        client.get("/no-such-page-1")
+        client.get("/no-such-page-2")
+
+        assert _sample("http_requests_total", **labels) == before + 2
+
+    def test_token_required_when_configured(self, client, monkeypatch):
+        monkeypatch.setattr(Config, "METRICS_TOKEN", "s3cret")
+
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
+
+
+class TestInstrumentation:
+    """Tests for cache and TMDB instrumentation"""
+
+    def test_cache_hits_and_misses(self):
+        app = Flask(__name__)
+        cache = Cache()
+        cache.init_app(app, config={"CACHE_TYPE": "SimpleCache"})
+        metrics.instrument_cache(app, cache)
+        hits = _sample("cache_requests_total", result="hit")
+        misses = _sample("cache_requests_total", result="miss")
+
+        with app.app_context():
+            cache.get("key")
+            cache.set("key", "value")
+            cache.get("key")
+
+        assert _sample("cache_requests_total", result="hit") == hits + 1
+        assert _sample("cache_requests_total", result="miss") == misses + 1
+
+    def test_tmdb_endpoint_label(self):
+        assert metrics.tmdb_endpoint_label("movie/550/videos") == "movie/{id}/videos"
+        assert metrics.tmdb_endpoint_label("person/31") == "person/{id}"
+        assert metrics.tmdb_endpoint_label("movie/popular") == "movie/popular"
+
+    @patch("src.tmdb_api.requests.Session.get")
+    def test_tmdb_errors_and_latency(self, mock_get):
+        mock_get.side_effect = requests.ConnectionError("down")
+        labels = {"endpoint": "movie/{id}", "reason": "request"}
+        errors = _sample("tmdb_request_errors_total", **labels)
+        calls = _sample("tmdb_request_duration_seconds_count", endpoint="movie/{id}")
+
+        assert TMDBClient(use_cache=False).get_movie_details(550) == {}
+
+        assert _sample("tmdb_request_errors_total", **labels) == errors + 1
+        assert _sample("tmdb_request_duration_seconds_count", endpoint="movie/{id}") == calls + 1
+
+
+class TestMultiprocessAggregation:
+    """Samples from separate worker processes are summed on scrape"""
+
+    def _run(self, code, env):
+        return subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=_PROJECT_ROOT,
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+    def test_workers_are_aggregated(self, tmp_path):
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+        worker = "from src import metrics; metrics.observe_request('GET', '/movies', 200, 0.2)"
+
+        self._run(worker, env)
+        self._run(worker, env)
+        output = self._run(
+            "from src import metrics; print(metrics.render_latest()[0].decode())", env
+        )
+
+        assert 'http_requests_total{method="GET",route="/movies",status="200"} 2.0' in output
+
+    def test_gunicorn_config_enables_multiprocess_mode(self):
+        env = {k: v for k, v in os.environ.items() if k != "PROMETHEUS_MULTIPROC_DIR"}
+        output = self._run(
+            "import runpy; runpy.run_path('gunicorn.conf.py'); "
+            "from prometheus_client import values; print(values.ValueClass.__name__)",
+            env,
+        )
+
+        # MutexValue (in-process only) if the directory was set too late
+        assert output.strip() == "MmapedValue"
@@ -40,6 +40,9 @@ def test_alembic_upgrade_head_builds_clean_sqlite_database(tmp_path):
     assert "movies" in tables
     assert "users" in tables
     assert "collections" in tables
+    assert "analytics_snapshots" in tables
+    assert "movie_similar" in tables
+    assert "user_taste_profiles" in tables
 
     user_columns = {column["name"]: column for column in inspector.get_columns("users")}
     assert user_columns["password_hash"]["type"].length == 256
@@ -54,10 +57,13 @@ def test_alembic_upgrade_head_builds_clean_sqlite_database(tmp_path):
         "cast": {"idx_cast_movie_id", "idx_cast_person_id"},
         "crew": {"idx_crew_movie_id", "idx_crew_person_id", "idx_crew_person_job"},
         "movie_companies": {"idx_movie_companies_company_id"},
+        "movie_genres": {"idx_movie_genres_genre_movie"},
         "movies": {
             "idx_movies_release_date",
             "idx_movies_vote_average",
             "idx_movies_popularity",
+            "idx_movies_vote_average_vote_count",
+            "idx_movies_hidden_gems",
         },
     }
     for table_name, index_names in expected_indexes.items():
@@ -88,3 +94,95 @@ def test_alembic_upgrade_head_builds_clean_sqlite_database(tmp_path):
                     "VALUES (1, 1, 'second review')"
                 )
             )
+
+
+def _alembic_upgrade(database_url, target):
+    env = os.environ.copy()
+    env["DATABASE_URL"] = database_url
+    result = subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", target],
+        cwd=Path(__file__).resolve().parents[1],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+
+def test_release_year_migration_backfills_existing_movies(tmp_path):
+    database_url = f"sqlite:///{(tmp_path / 'release-year.sqlite').as_posix()}"
+
+    _alembic_upgrade(database_url, "006_add_analytics_snapshots")
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO movies (id, tmdb_id, title, release_date) "
+                "VALUES (1, 101, 'Dated', '1987-06-12'), (2, 102, 'Undated', NULL)"
+            )
+        )
+
+    _alembic_upgrade(database_url, "head")
+
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text("SELECT id, release_year, release_decade FROM movies ORDER BY id")
+        ).fetchall()
+    assert [tuple(row) for row in rows] == [(1, 1987, 1980), (2, None, None)]
+
+    index_names = {index["name"] for index in inspect(engine).get_indexes("movies")}
+    assert {"idx_movies_release_year", "idx_movies_release_decade"} <= index_names
+
+
+def test_gem_score_migration_backfills_eligible_movies(tmp_path):
+    database_url = f"sqlite:///{(tmp_path / 'gem-score.sqlite').as_posix()}"
+
+    _alembic_upgrade(database_url, "008_add_listing_composite_indexes")
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO movies (id, tmdb_id, title, vote_average, popularity, vote_count) "
+                "VALUES (1, 101, 'Gem', 8.0, 8.0, 120), (2, 102, 'Too few votes', 9.0, 1.0, 10)"
+            )
+        )
+
+    _alembic_upgrade(database_url, "head")
+
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT id, gem_score FROM movies ORDER BY id")).fetchall()
+    assert [tuple(row) for row in rows] == [(1, 4.0), (2, None)]
+
+    index_names = {index["name"] for index in inspect(engine).get_indexes("movies")}
+    assert "idx_movies_gem_score" in index_names
+
+
+def test_search_index_migration_indexes_existing_movies(tmp_path):
+    database_url = f"sqlite:///{(tmp_path / 'search.sqlite').as_posix()}"
+
+    _alembic_upgrade(database_url, "009_add_movie_gem_score")
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO movies (id, tmdb_id, title, overview) "
+                "VALUES (1, 101, 'Lighthouse', 'A keeper waits'), (2, 102, 'Harbour', NULL)"
+            )
+        )
+
+    _alembic_upgrade(database_url, "head")
+
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE movies SET title = 'Old Harbour' WHERE id = 2"))
+        matches = {
+            term: [
+                row[0]
+                for row in connection.execute(
+                    text("SELECT rowid FROM movies_fts WHERE movies_fts MATCH :term"),
+                    {"term": term},
+                )
+            ]
+            for term in ("keeper", "old", "lighthouse")
+        }
+    assert matches == {"keeper": [1], "old": [2], "lighthouse": [1]}
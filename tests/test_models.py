@@ -67,6 +67,43 @@ class TestMovieModel:
         assert sample_movie.vote_count == 25000
         assert 0 <= float(sample_movie.vote_average) <= 10
 
+    def test_release_year_and_decade_follow_release_date(self, db_session):
+        """release_year/release_decade are derived on every release_date write"""
+        movie = Movie(
+            tmdb_id=321,
+            title="Year Test",
+            release_date=datetime.strptime("1999-10-15", "%Y-%m-%d").date(),
+        )
+        db_session.add(movie)
+        db_session.commit()
+
+        assert movie.release_year == 1999
+        assert movie.release_decade == 1990
+
+        movie.release_date = datetime.strptime("2001-03-01", "%Y-%m-%d").date()
+        assert movie.release_year == 2001
+        assert movie.release_decade == 2000
+
+        movie.release_date = None
+        assert movie.release_year is None
+        assert movie.release_decade is None
+
+    def test_gem_score_tracks_rating_popularity_and_votes(self, db_session):
+        """gem_score is recomputed on writes and NULL below the vote floor"""
+        movie = Movie(
+            tmdb_id=654, title="Gem Test", vote_average=8.0, popularity=8.0, vote_count=120
+        )
+        db_session.add(movie)
+        db_session.commit()
+
+        assert movie.gem_score == 4.0  # 8.0 / (log10(8 + 2) * 2)
+
+        movie.popularity = 98.0
+        assert movie.gem_score == 2.0
+
+        movie.vote_count = 10
+        assert movie.gem_score is None
+
 
 class TestGenreModel:
     """Tests for Genre model"""
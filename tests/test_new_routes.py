@@ -132,6 +132,24 @@ class TestHiddenGemsRoute:
         assert response.status_code == 200
         assert b"Obscure Masterpiece" in response.data
 
+    def test_hidden_gems_ordered_by_gem_score(self, client, db_session):
+        obscure = Movie(
+            tmdb_id=55502, title="Deep Cut", vote_average=7.5, popularity=1.0, vote_count=80
+        )
+        known = Movie(
+            tmdb_id=55503, title="Cult Hit", vote_average=8.0, popularity=18.0, vote_count=900
+        )
+        unvetted = Movie(
+            tmdb_id=55504, title="Barely Voted", vote_average=9.5, popularity=1.0, vote_count=10
+        )
+        db_session.add_all([obscure, known, unvetted])
+        db_session.commit()
+
+        response = client.get("/hidden-gems")
+
+        assert response.data.index(b"Deep Cut") < response.data.index(b"Cult Hit")
+        assert b"Barely Voted" not in response.data
+
     def test_hidden_gems_filter_by_genre(self, client, sample_genre):
         response = client.get(f"/hidden-gems?genre={sample_genre.id}")
         assert response.status_code == 200
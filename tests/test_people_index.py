@@ -0,0 +1,131 @@
+"""
+Tests for the actor autocomplete index (src/people_index.py)
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src import people_index
+from src.models import Cast, Movie, Person
+from src.people_index import ActorNameIndex, VersionedIndex, build_actor_name_index
+
+PEOPLE = [
+    (1, "Brad Pitt", "/brad.jpg", 3),
+    (2, "Bradley Cooper", None, 1),
+    (3, "Edward Norton", None, 2),
+    (4, "Helena Bonham Carter", None, 2),
+]
+
+
+@pytest.fixture
+def index():
+    return ActorNameIndex(PEOPLE)
+
+
+def _names(results):
+    return [actor["name"] for actor in results]
+
+
+class TestActorNameIndex:
+    """Tests for name matching and ranking"""
+
+    def test_substring_match_ranked_by_movie_count(self, index):
+        results = index.search("brad", 8)
+
+        assert _names(results) == ["Brad Pitt", "Bradley Cooper"]
+        assert results[0] == {
+            "id": 1,
+            "name": "Brad Pitt",
+            "profile_path": "/brad.jpg",
+            "movie_count": 3,
+        }
+
+    def test_match_inside_name_and_case(self, index):
+        assert _names(index.search("BONHAM", 8)) == ["Helena Bonham Carter"]
+        assert _names(index.search("on", 8)) == ["Edward Norton", "Helena Bonham Carter"]
+
+    def test_limit_and_short_queries(self, index):
+        assert len(index.search("r", 8)) == 0
+        assert _names(index.search("ar", 1)) == ["Edward Norton"]
+        assert index.search("zz", 8) == []
+
+    def test_within_restricts_and_reranks(self, index):
+        results = index.search("ar", 8, within={4: 5, 3: 1, 99: 7})
+
+        assert _names(results) == ["Helena Bonham Carter", "Edward Norton"]
+        assert [actor["movie_count"] for actor in results] == [5, 1]
+        assert index.search("brad", 8, within={}) == []
+
+
+class TestVersionedIndex:
+    """Tests for rebuilding after a catalog sync"""
+
+    def test_rebuilds_only_when_version_changes(self):
+        build = MagicMock(side_effect=lambda session: [object()])
+        holder = VersionedIndex(build, "test")
+
+        with patch.object(people_index, "get_catalog_version", return_value="v1"):
+            first = holder.get(None)
+            assert holder.get(None) is first
+        with patch.object(people_index, "get_catalog_version", return_value="v2"):
+            assert holder.get(None) is not first
+
+        assert build.call_count == 2
+
+    def test_stale_index_served_while_rebuilding(self):
+        holder = VersionedIndex(lambda session: ["v1"], "test")
+        with patch.object(people_index, "get_catalog_version", return_value="v1"):
+            stale = holder.get(None)
+
+        holder._lock.acquire()
+        try:
+            with patch.object(people_index, "get_catalog_version", return_value="v2"):
+                assert holder.get(None) is stale
+        finally:
+            holder._lock.release()
+
+
+def test_built_from_database(db_session):
+    movie = Movie(tmdb_id=1, title="Fight Club")
+    people = [Person(tmdb_id=i, name=name) for i, name in enumerate(["Brad Pitt", "Nobody"])]
+    db_session.add_all([movie, *people])
+    db_session.flush()
+    db_session.add_all(
+        [
+            Cast(movie_id=movie.id, person_id=people[0].id, cast_order=0),
+            Cast(movie_id=movie.id, person_id=people[0].id, cast_order=5),
+        ]
+    )
+    db_session.commit()
+
+    index = build_actor_name_index(db_session)
+
+    assert len(index) == 1
+    assert index.search("pitt", 8)[0]["movie_count"] == 1
+
+
+class TestActorSearchRoute:
+    """Tests for /api/v1/actors/search"""
+
+    def test_searches_index(self, client, sample_cast):
+        response = client.get("/api/v1/actors/search?q=pit")
+
+        assert response.get_json() == {
+            "actors": [
+                {
+                    "id": sample_cast.person_id,
+                    "name": "Brad Pitt",
+                    "profile_path": "/kU3B75TyRiCgE270EyZnHjfivoq.jpg",
+                    "movie_count": 1,
+                }
+            ]
+        }
+
+    def test_repeat_keystrokes_skip_cast_scan(self, client, sample_cast, capture_sql):
+        client.get("/api/v1/actors/search?q=br")
+
+        with capture_sql() as statements:
+            client.get("/api/v1/actors/search?q=bra")
+
+        assert not any('FROM "cast"' in statement for statement in statements)
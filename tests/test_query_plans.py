@@ -0,0 +1,125 @@
+"""
+Query-plan regression tests for the hot listing routes.
+
+Every SELECT these routes send against the movies table must be answerable
+from an index, not a full table scan. SQLite is always checked. Postgres is
+checked too when TEST_POSTGRES_URL points at a scratch database. Sequential
+scans are disabled there, so the test asserts an index exists that the
+planner *can* use, whatever the table size.
+"""
+
+import os
+import re
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.models import Base, Genre, Movie
+
+HOT_ROUTES = [
+    "/",
+    "/movies",
+    "/movies?sort=rating",
+    "/movies?sort=release_date",
+    "/movies?sort=title",
+    "/movies?genre={genre_id}",
+    "/movies?year=1999",
+    "/movies?decade=1990",
+    "/hidden-gems",
+    "/api/v1/movies?genre={genre_id}",
+]
+
+_SQLITE_FULL_SCAN = re.compile(r"\bSCAN (movies\w*)( AS \w+)?$")
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def plan_session(request, db_session, monkeypatch):
+    """A catalog session on each dialect, wired into the app's get_db_session."""
+    if request.param == "sqlite":
+        yield db_session
+        return
+
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL not set")
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+
+    import src.app as app_module
+
+    monkeypatch.setattr(app_module, "get_db_session", lambda: session)
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
+
+
+def _seed(session):
+    genre = Genre(tmdb_id=18, name="Drama")
+    session.add(genre)
+    for i in range(40):
+        movie = Movie(
+            tmdb_id=5000 + i,
+            title=f"Plan Movie {i}",
+            release_date=date(1990 + i % 20, 1, 1),
+            vote_average=5.0 + (i % 5),
+            vote_count=20 + i * 10,
+            popularity=5.0 + i,
+        )
+        movie.genres.append(genre)
+        session.add(movie)
+    session.commit()
+    return genre.id
+
+
+@contextmanager
+def _record_selects(session):
+    recorded = []
+    bind = session.get_bind()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "movies" in statement:
+            recorded.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield recorded
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
+def _full_scans(session, statement, parameters):
+    """Return the plan lines showing a full scan of movies, if any."""
+    connection = session.connection()
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[-1] for row in rows if _SQLITE_FULL_SCAN.search(row[-1])]
+
+    connection.exec_driver_sql("SET enable_seqscan = off")
+    rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    return [row[0] for row in rows if "Seq Scan on movies" in row[0]]
+
+
+@pytest.mark.parametrize("route", HOT_ROUTES)
+def test_hot_route_queries_use_indexes(client, plan_session, route):
+    genre_id = _seed(plan_session)
+
+    with _record_selects(plan_session) as selects:
+        response = client.get(route.format(genre_id=genre_id))
+    assert response.status_code == 200
+    assert selects
+
+    offenders = {}
+    for statement, parameters in selects:
+        scans = _full_scans(plan_session, statement, parameters)
+        if scans:
+            offenders[statement] = scans
+
+    assert offenders == {}
@@ -0,0 +1,188 @@
+"""
+Tests for read-replica routing (src/replicas.py)
+"""
+
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Response, g
+from flask import session as flask_session
+from sqlalchemy import create_engine, update
+
+import src.app as app_module
+from src.models import Base, Genre, Movie, MovieOfTheDay
+from src.replicas import ReplicaSet, RoutingSession, use_primary
+
+
+def _database(tmp_path, name, title):
+    engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+    Base.metadata.create_all(engine)
+    with RoutingSession(bind=engine) as session:
+        session.add(Movie(tmdb_id=1, title=title))
+        session.commit()
+    return engine
+
+
+@pytest.fixture
+def databases(tmp_path):
+    engines = {
+        "primary": _database(tmp_path, "primary", "From primary"),
+        "replica_a": _database(tmp_path, "replica_a", "From replica A"),
+        "replica_b": _database(tmp_path, "replica_b", "From replica B"),
+    }
+    yield engines
+    for engine in engines.values():
+        engine.dispose()
+
+
+def _title(session):
+    return session.query(Movie.title).filter_by(tmdb_id=1).scalar()
+
+
+def _session(databases, replicas, use_replicas=True):
+    session = RoutingSession(bind=databases["primary"], replicas=replicas)
+    session.use_replicas = use_replicas
+    return session
+
+
+class TestRoutingSession:
+    """Tests for RoutingSession bind selection"""
+
+    def test_reads_from_replica_when_enabled(self, databases):
+        replicas = ReplicaSet([databases["replica_a"]])
+
+        with _session(databases, replicas) as session:
+            assert _title(session) == "From replica A"
+
+    def test_primary_by_default(self, databases):
+        replicas = ReplicaSet([databases["replica_a"]])
+
+        with _session(databases, replicas, use_replicas=False) as session:
+            assert _title(session) == "From primary"
+
+    def test_reads_follow_writes_to_primary(self, databases):
+        replicas = ReplicaSet([databases["replica_a"]])
+
+        with _session(databases, replicas) as session:
+            assert _title(session) == "From replica A"
+            session.add(Genre(tmdb_id=28, name="Action"))
+            session.flush()
+
+            assert session.wrote
+            assert _title(session) == "From primary"
+            assert session.query(Genre).count() == 1
+
+    def test_dml_statements_go_to_primary(self, databases):
+        replicas = ReplicaSet([databases["replica_a"]])
+
+        with _session(databases, replicas) as session:
+            session.execute(update(Movie).values(title="Renamed"))
+            session.commit()
+
+        with _session(databases, replicas, use_replicas=False) as session:
+            assert _title(session) == "Renamed"
+
+    def test_replica_is_sticky_within_a_session(self, databases):
+        replicas = ReplicaSet([databases["replica_a"], databases["replica_b"]])
+
+        with _session(databases, replicas) as session:
+            assert _title(session) == _title(session) == "From replica A"
+        with _session(databases, replicas) as session:
+            assert _title(session) == "From replica B"
+
+    def test_use_primary_switches_later_reads(self, databases):
+        replicas = ReplicaSet([databases["replica_a"]])
+
+        with _session(databases, replicas) as session:
+            assert _title(session) == "From replica A"
+            use_primary(session)
+
+            assert _title(session) == "From primary"
+            assert not session.wrote
+
+    def test_movie_of_the_day_insert_check_reads_primary(self, databases):
+        """A pick already on the primary is reused even if the replica lags"""
+        with RoutingSession(bind=databases["primary"]) as session:
+            session.add(MovieOfTheDay(movie_id=1, shown_date=datetime.now().date()))
+            session.commit()
+        replicas = ReplicaSet([databases["replica_a"]])
+
+        with _session(databases, replicas) as session:
+            pick = app_module.get_movie_of_the_day(session)
+
+            assert pick is not None
+            assert pick.title == "From primary"
+
+
+class TestReplicaSet:
+    """Tests for round-robin and health tracking"""
+
+    def test_round_robin_skips_replicas_marked_down(self, databases):
+        a, b = databases["replica_a"], databases["replica_b"]
+        replicas = ReplicaSet([a, b])
+
+        replicas.mark_down(a)
+
+        assert [replicas.choose() for _ in range(3)] == [b, b, b]
+
+    def test_all_down_falls_back_to_primary(self, databases):
+        replicas = ReplicaSet([databases["replica_a"]])
+        replicas.mark_down(databases["replica_a"])
+
+        assert replicas.choose() is None
+        with _session(databases, replicas) as session:
+            assert _title(session) == "From primary"
+
+    def test_replica_retried_after_cooldown(self, databases):
+        replicas = ReplicaSet([databases["replica_a"]], retry_after=0)
+        replicas.mark_down(databases["replica_a"])
+
+        assert replicas.choose() is databases["replica_a"]
+
+    def test_connection_failure_marks_replica_down(self, databases, tmp_path):
+        broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+        replicas = ReplicaSet([broken])
+
+        with pytest.raises(Exception):
+            with _session(databases, replicas) as session:
+                _title(session)
+
+        assert replicas.choose() is None
+
+
+class TestRequestRouting:
+    """Tests for the app's per-request replica decisions"""
+
+    @pytest.fixture
+    def with_replicas(self, monkeypatch):
+        monkeypatch.setattr(app_module, "replicas", MagicMock(__bool__=lambda self: True))
+
+    @pytest.mark.parametrize("method,expected", [("GET", True), ("HEAD", True), ("POST", False)])
+    def test_safe_methods_use_replicas(self, app, with_replicas, method, expected):
+        with app.test_request_context("/movies", method=method):
+            assert app_module._reads_may_use_replica() is expected
+
+    def test_no_replicas_configured(self, app):
+        with app.test_request_context("/movies"):
+            assert app_module._reads_may_use_replica() is False
+
+    def test_write_pins_client_to_primary(self, app, with_replicas):
+        with app.test_request_context("/rate", method="POST"):
+            g.db_session = MagicMock(wrote=True)
+            app_module._pin_reads_after_write(Response())
+            pinned_until = flask_session["primary_until"]
+
+        assert pinned_until > time.time()
+        with app.test_request_context("/movies"):
+            flask_session["primary_until"] = pinned_until
+            assert app_module._reads_may_use_replica() is False
+            flask_session["primary_until"] = time.time() - 1
+            assert app_module._reads_may_use_replica() is True
+
+    def test_reads_do_not_pin(self, app, with_replicas):
+        with app.test_request_context("/movies"):
+            g.db_session = MagicMock(wrote=True)
+            app_module._pin_reads_after_write(Response())
+            assert "primary_until" not in flask_session
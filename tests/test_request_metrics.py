@@ -0,0 +1,112 @@
+"""
+Tests for per-request DB and TMDB timing (src/request_metrics.py)
+"""
+
+import logging
+import re
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import text
+
+from src import request_metrics
+from src.enrichment import MovieEnricher
+from src.tmdb_api import TMDBClient
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def app_log():
+    handler = ListHandler()
+    logger = logging.getLogger("app")
+    logger.addHandler(handler)
+    try:
+        yield handler.records
+    finally:
+        logger.removeHandler(handler)
+
+
+@pytest.fixture
+def collecting():
+    metrics = request_metrics.start_request()
+    try:
+        yield metrics
+    finally:
+        request_metrics.end_request()
+
+
+class TestRequestMetrics:
+    """Tests for RequestMetrics and the engine listeners"""
+
+    def test_counts_statements_and_slowest(self, db_session, collecting):
+        db_session.execute(text("SELECT 1"))
+        db_session.execute(text("SELECT 1"))
+
+        fields = collecting.log_fields()
+        assert fields["db_statements"] == 2
+        assert collecting.db_ms >= collecting.slowest_ms > 0
+        assert fields["db_slowest_statement"] == "SELECT 1"
+
+    def test_outside_a_request_nothing_is_collected(self, db_session):
+        assert request_metrics.current() is None
+        db_session.execute(text("SELECT 1"))
+        assert request_metrics.end_request() is None
+
+    def test_slowest_statement_is_compacted(self, collecting):
+        collecting.record_statement("SELECT *\n   FROM movies\n" + "x" * 1000, 5.0)
+
+        slowest = collecting.log_fields()["db_slowest_statement"]
+        assert slowest.startswith("SELECT * FROM movies x")
+        assert len(slowest) == request_metrics.SLOWEST_STATEMENT_CHARS
+
+    @patch("src.tmdb_api.requests.Session.get")
+    def test_tmdb_calls_are_timed(self, mock_get, collecting):
+        mock_get.return_value = Mock(json=Mock(return_value={"results": []}))
+
+        TMDBClient(use_cache=False).get_popular_movies(page=1)
+
+        assert collecting.tmdb_calls == 1
+
+    def test_enrichment_threads_report_to_the_request(self, collecting):
+        def fetch(tmdb_id):
+            with request_metrics.track_tmdb():
+                return {"key": "abc"}
+
+        enricher = MovieEnricher(
+            fetchers={"trailer": fetch, "watch_providers": fetch},
+            defaults={"trailer": None, "watch_providers": {}},
+            budget=1.0,
+        )
+        enricher.enrich(550)
+
+        assert collecting.tmdb_calls == 2
+
+
+class TestRequestLogging:
+    """Timings reach the request log line and the Server-Timing header"""
+
+    def test_server_timing_header(self, client, sample_movies, capture_sql):
+        with capture_sql() as statements:
+            response = client.get("/api/v1/movies")
+
+        header = response.headers["Server-Timing"]
+        assert re.search(rf'db;dur=[\d.]+;desc="{len(statements)} statements"', header)
+        assert 'tmdb;dur=0.0;desc="0 calls"' in header
+        assert re.search(r"total;dur=[\d.]+", header)
+
+    def test_log_line_fields(self, client, sample_movies, app_log):
+        client.get("/api/v1/movies")
+
+        record = next(r for r in app_log if r.getMessage() == "GET /api/v1/movies -> 200")
+        assert record.db_statements > 0
+        assert record.db_slowest_statement.startswith("SELECT")
+        assert record.tmdb_calls == 0
+        assert record.duration_ms >= 0
@@ -0,0 +1,129 @@
+"""
+Tests for full-text movie search (src/search.py)
+"""
+
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from src.models import Movie
+from src.search import MAX_TERMS, apply_text_search, search_terms
+
+
+def _movie(db_session, tmdb_id, title, overview=None, popularity=1.0):
+    movie = Movie(
+        tmdb_id=tmdb_id, title=title, overview=overview, popularity=popularity, vote_average=7.0
+    )
+    db_session.add(movie)
+    db_session.commit()
+    return movie
+
+
+def _search(db_session, text):
+    query, relevance = apply_text_search(db_session, db_session.query(Movie), text)
+    return [movie.title for movie in query.order_by(*relevance, Movie.id)]
+
+
+class TestSearchTerms:
+    """Tests for splitting user input into terms"""
+
+    def test_punctuation_and_operators_are_dropped(self):
+        assert search_terms('Fight "Club" NEAR(x) -- *') == ["fight", "club", "near", "x"]
+
+    def test_terms_are_capped(self):
+        assert len(search_terms(" ".join(f"w{i}" for i in range(20)))) == MAX_TERMS
+
+    def test_no_words(self):
+        assert search_terms("  %%  ") == []
+
+
+class TestApplyTextSearch:
+    """Tests for the SQLite FTS5 path"""
+
+    def test_prefix_terms_must_all_match(self, db_session):
+        _movie(db_session, 1, "The Matrix Reloaded")
+        _movie(db_session, 2, "The Matrix")
+
+        assert _search(db_session, "matri reload") == ["The Matrix Reloaded"]
+
+    def test_title_match_outranks_overview_match(self, db_session):
+        _movie(db_session, 1, "Quiet Harbour", overview="A storm hits the lighthouse.")
+        _movie(db_session, 2, "Lighthouse", overview="A keeper waits.")
+
+        assert _search(db_session, "lighthouse") == ["Lighthouse", "Quiet Harbour"]
+
+    def test_accents_are_ignored(self, db_session):
+        _movie(db_session, 1, "Amélie")
+
+        assert _search(db_session, "amelie") == ["Amélie"]
+
+    def test_index_follows_updates_and_deletes(self, db_session):
+        movie = _movie(db_session, 1, "Working Title")
+        movie.title = "Final Title"
+        db_session.commit()
+
+        assert _search(db_session, "working") == []
+        assert _search(db_session, "final") == ["Final Title"]
+
+        db_session.delete(movie)
+        db_session.commit()
+        assert _search(db_session, "final") == []
+
+    def test_input_without_words_falls_back_to_substring(self, db_session):
+        _movie(db_session, 1, "100% Wolf")
+
+        query, relevance = apply_text_search(db_session, db_session.query(Movie), "%")
+
+        assert relevance == ()
+        assert [movie.title for movie in query] == ["100% Wolf"]
+
+    def test_postgres_uses_weighted_tsquery(self):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        session.scalar.return_value = 2
+
+        base_query = MagicMock()
+
+        _, relevance = apply_text_search(session, base_query, "matri reload")
+
+        compiled = base_query.filter.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert "@@ to_tsquery('english'::regconfig" in str(compiled)
+        assert "matri:* & reload:*" in compiled.params.values()
+        assert "ts_rank" in str(relevance[0].compile(dialect=postgresql.dialect()))
+
+    def test_postgres_stopword_only_input_falls_back_to_substring(self):
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        session.scalar.return_value = 0  # numnode() of the reduced tsquery
+
+        base_query = MagicMock()
+
+        _, relevance = apply_text_search(session, base_query, "The Who")
+
+        probe = session.scalar.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert "numnode(to_tsquery(" in str(probe)
+        compiled = base_query.filter.call_args.args[0].compile(dialect=postgresql.dialect())
+        assert "ILIKE" in str(compiled).upper()
+        assert "%The Who%" in compiled.params.values()
+        assert relevance == ()
+
+
+class TestSearchRoutes:
+    """Route-level ordering and totals"""
+
+    def test_api_orders_by_relevance(self, client, db_session):
+        _movie(db_session, 1, "Side Story", overview="Set near the ocean.", popularity=99.0)
+        _movie(db_session, 2, "Ocean", popularity=1.0)
+
+        data = client.get("/api/v1/movies/search?q=ocean").get_json()
+
+        assert data["total"] == 2
+        assert [movie["title"] for movie in data["movies"]] == ["Ocean", "Side Story"]
+
+    def test_advanced_search_relevance_sort(self, client, db_session):
+        _movie(db_session, 1, "Side Story", overview="Set near the ocean.", popularity=99.0)
+        _movie(db_session, 2, "Ocean", popularity=1.0)
+
+        html = client.get("/advanced-search?q=ocean").get_data(as_text=True)
+
+        assert html.index("Ocean") < html.index("Side Story")
@@ -0,0 +1,126 @@
+"""
+Tests for degrees of separation (src/separation.py)
+"""
+
+import pytest
+
+from src.costar_graph import build_collaboration_graph
+from src.models import Cast, Crew, Movie, Person
+from src.separation import find_connection
+
+
+class DictCache:
+    """Minimal stand-in for Flask-Caching's get/set API."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+
+
+@pytest.fixture
+def chain(db_session):
+    """Actor 0 -(Film 0)- Actor 1 -(Film 1, directed)- Director; Loner unlinked"""
+    movies = [Movie(tmdb_id=i, title=f"Film {i}", release_year=2000 + i) for i in range(3)]
+    people = [
+        Person(tmdb_id=100, name="Actor 0"),
+        Person(tmdb_id=101, name="Actor 1"),
+        Person(tmdb_id=102, name="Director"),
+        Person(tmdb_id=103, name="Loner"),
+    ]
+    db_session.add_all(movies + people)
+    db_session.flush()
+    db_session.add_all(
+        [
+            Cast(movie_id=movies[0].id, person_id=people[0].id, cast_order=0),
+            Cast(movie_id=movies[0].id, person_id=people[1].id, cast_order=1),
+            Cast(movie_id=movies[1].id, person_id=people[1].id, cast_order=0),
+            Crew(movie_id=movies[1].id, person_id=people[2].id, job="Director"),
+            Cast(movie_id=movies[2].id, person_id=people[3].id, cast_order=0),
+        ]
+    )
+    db_session.commit()
+    return [m.id for m in movies], [p.id for p in people]
+
+
+class TestFindConnection:
+    """Tests for path lookup and caching"""
+
+    def test_links_cast_and_crew(self, db_session, chain):
+        movie_ids, person_ids = chain
+        graph = build_collaboration_graph(db_session)
+
+        connection = find_connection(db_session, graph, person_ids[0], person_ids[2])
+
+        assert connection["degrees"] == 2
+        assert [p["name"] for p in connection["people"]] == ["Actor 0", "Actor 1", "Director"]
+        assert [m["title"] for m in connection["movies"]] == ["Film 0", "Film 1"]
+        assert connection["movies"][0]["release_year"] == 2000
+
+    def test_unconnected(self, db_session, chain):
+        _, person_ids = chain
+        graph = build_collaboration_graph(db_session)
+
+        assert find_connection(db_session, graph, person_ids[0], person_ids[3]) is None
+
+    def test_pair_cached_once_for_both_directions(self, db_session, chain):
+        _, person_ids = chain
+        graph = build_collaboration_graph(db_session)
+        cache = DictCache()
+
+        forward = find_connection(db_session, graph, person_ids[0], person_ids[2], cache=cache)
+        graph.shortest_path = None  # any further search would fail
+        backward = find_connection(db_session, graph, person_ids[2], person_ids[0], cache=cache)
+
+        assert len(cache.data) == 1
+        assert backward["people"] == forward["people"][::-1]
+        assert backward["movies"] == forward["movies"][::-1]
+
+
+class TestPathRoutes:
+    """Tests for the API endpoint and page"""
+
+    def test_api(self, client, chain):
+        _, person_ids = chain
+
+        data = client.get(f"/api/v1/people/{person_ids[0]}/path/{person_ids[2]}").get_json()
+
+        assert data["connected"] is True
+        assert data["degrees"] == 2
+        assert [p["id"] for p in data["people"]] == person_ids[:3]
+
+    def test_api_unconnected(self, client, chain):
+        _, person_ids = chain
+
+        data = client.get(f"/api/v1/people/{person_ids[0]}/path/{person_ids[3]}").get_json()
+
+        assert data["connected"] is False
+        assert data["degrees"] is None
+
+    def test_api_unknown_person(self, client, chain):
+        _, person_ids = chain
+
+        response = client.get(f"/api/v1/people/{person_ids[0]}/path/999999")
+
+        assert response.status_code == 404
+
+    def test_page(self, client, chain):
+        _, person_ids = chain
+
+        html = client.get(f"/people/{person_ids[0]}/path/{person_ids[2]}").get_data(as_text=True)
+
+        steps = html[html.index("list-unstyled") :]
+        assert "2 degrees apart" in html
+        assert steps.index("Actor 0") < steps.index("Film 0") < steps.index("Director")
+
+    def test_page_unconnected(self, client, chain):
+        _, person_ids = chain
+
+        response = client.get(f"/people/{person_ids[0]}/path/{person_ids[3]}")
+
+        assert response.status_code == 200
+        assert "No connection found" in response.get_data(as_text=True)
@@ -0,0 +1,112 @@
+"""
+Tests for precomputed similar movies (src/similarity.py)
+"""
+
+import pytest
+
+from src.app import get_similar_movies
+from src.models import Crew, Genre, Movie, MovieSimilarity, Person
+from src.similarity import compute_similar_movies, refresh_movie_similarities
+
+ELIGIBLE = {1: (7.0, 10.0), 2: (6.0, 50.0), 3: (8.0, 20.0), 4: (7.5, 5.0)}
+
+
+class TestComputeSimilarMovies:
+    """Tests for feature weighting and neighbour ranking"""
+
+    def test_shared_director_beats_shared_genre(self):
+        features = {
+            1: {("genre", 1), ("director", 9)},
+            2: {("genre", 1)},
+            3: {("genre", 2), ("director", 9)},
+            4: {("genre", 2)},
+        }
+
+        neighbours = compute_similar_movies(features, ELIGIBLE)
+
+        assert [other for other, _ in neighbours[1]] == [3, 2]
+        assert 0 < neighbours[1][1][1] < neighbours[1][0][1] <= 1
+
+    def test_ties_go_to_higher_rating(self):
+        features = {movie_id: {("genre", 1)} for movie_id in ELIGIBLE}
+
+        neighbours = compute_similar_movies(features, ELIGIBLE, top_k=2)
+
+        assert neighbours[1] == [(3, 1.0), (4, 1.0)]
+
+    def test_only_eligible_movies_are_neighbours(self):
+        features = {1: {("genre", 1)}, 2: {("genre", 1)}, 5: {("genre", 1)}}
+
+        neighbours = compute_similar_movies(features, {1: (7.0, 1.0), 2: (7.0, 1.0)})
+
+        assert neighbours[5] == [(1, 1.0), (2, 1.0)]
+        assert [other for other, _ in neighbours[1]] == [2]
+
+    def test_movie_without_shared_features(self):
+        neighbours = compute_similar_movies({1: {("genre", 1)}, 2: set()}, {1: (7.0, 1.0)})
+
+        assert 2 not in neighbours
+
+
+@pytest.fixture
+def catalog(db_session):
+    drama, comedy = Genre(tmdb_id=18, name="Drama"), Genre(tmdb_id=35, name="Comedy")
+    director = Person(tmdb_id=1, name="Auteur")
+    movies = [
+        Movie(tmdb_id=100 + i, title=f"Film {i}", vote_count=100, vote_average=7.0, popularity=i)
+        for i in range(4)
+    ]
+    movies[0].genres.append(drama)
+    movies[1].genres.append(drama)
+    movies[2].genres.append(comedy)
+    movies[3].genres.append(drama)
+    movies[3].vote_count = 5  # too few votes to be recommended
+    db_session.add_all(movies + [director])
+    db_session.flush()
+    db_session.add_all(
+        [
+            Crew(movie_id=movies[0].id, person_id=director.id, job="Director"),
+            Crew(movie_id=movies[2].id, person_id=director.id, job="Director"),
+        ]
+    )
+    db_session.commit()
+    return movies
+
+
+class TestRefresh:
+    """Tests for persisting and reading neighbours"""
+
+    def test_refresh_writes_ranked_rows(self, db_session, catalog):
+        written = refresh_movie_similarities(db_session)
+
+        rows = (
+            db_session.query(MovieSimilarity.similar_movie_id)
+            .filter_by(movie_id=catalog[0].id)
+            .order_by(MovieSimilarity.rank)
+            .all()
+        )
+        assert [row.similar_movie_id for row in rows] == [catalog[2].id, catalog[1].id]
+        assert written == db_session.query(MovieSimilarity).count()
+
+    def test_refresh_replaces_previous_rows(self, db_session, catalog):
+        refresh_movie_similarities(db_session)
+        first = db_session.query(MovieSimilarity).count()
+
+        refresh_movie_similarities(db_session)
+
+        assert db_session.query(MovieSimilarity).count() == first
+
+    def test_get_similar_movies_reads_table(self, db_session, catalog, capture_sql):
+        refresh_movie_similarities(db_session)
+        movie_id = catalog[0].id
+
+        with capture_sql() as statements:
+            similar = get_similar_movies(db_session, movie_id)
+
+        assert [movie.title for movie in similar] == ["Film 2", "Film 1"]
+        assert len(statements) == 1
+
+    def test_get_similar_movies_falls_back_to_genres(self, db_session, catalog):
+        similar = get_similar_movies(db_session, catalog[0].id)
+
+        assert [movie.title for movie in similar] == ["Film 1"]
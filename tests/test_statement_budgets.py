@@ -0,0 +1,92 @@
+"""
+Per-request SQL statement budgets for routes that render lists of movies.
+
+Each route gets a fixed statement budget. The catalog it runs against has
+more movies than any budget, so a relationship that lazy-loads once per
+movie (N+1) blows through the limit instead of slipping by unnoticed.
+Budgets cover every statement the request sends, including session lookups.
+"""
+
+from datetime import date
+
+import pytest
+
+from src.app import movie_vectors
+from src.models import Crew, Genre, Movie, Person, ProductionCompany
+from src.taste import backfill_profiles
+
+CATALOG_SIZE = 30
+
+ROUTE_BUDGETS = [
+    ("/api/v1/movies?per_page=30", 4),
+    ("/api/v1/movies?per_page=30&include_total=1", 4),
+    ("/api/v1/movies?per_page=30&genre={genre_id}", 4),
+    ("/director/{director_id}", 4),
+    ("/company/{company_id}", 4),
+    ("/compare?id={movie_ids[0]}&id={movie_ids[1]}&id={movie_ids[2]}&id={movie_ids[3]}", 4),
+    ("/advanced-search?q=Budget&per_page=30", 6),
+    ("/favorites", 3),
+    ("/watchlist", 3),
+    ("/recommendations", 7),
+]
+
+
+@pytest.fixture
+def catalog(db_session, sample_user):
+    """CATALOG_SIZE movies, each with two genres, one director and one company"""
+    genres = [Genre(tmdb_id=900 + i, name=f"Genre {i}") for i in range(3)]
+    director = Person(tmdb_id=9100, name="Budget Director")
+    company = ProductionCompany(tmdb_id=9200, name="Budget Pictures")
+    db_session.add_all(genres + [director, company])
+    db_session.flush()
+
+    movies = []
+    for i in range(CATALOG_SIZE):
+        movie = Movie(
+            tmdb_id=9300 + i,
+            title=f"Budget Movie {i}",
+            release_date=date(2000 + i % 10, 1, 1),
+            vote_average=6.0 + (i % 4),
+            vote_count=200 + i,
+            popularity=10.0 + i,
+            revenue=1000 * i,
+        )
+        movie.genres.extend([genres[i % 3], genres[(i + 1) % 3]])
+        movie.companies.append(company)
+        movies.append(movie)
+    db_session.add_all(movies)
+    db_session.flush()
+
+    db_session.add_all(Crew(movie_id=m.id, person_id=director.id, job="Director") for m in movies)
+    for movie in movies[:10]:
+        sample_user.favorites.append(movie)
+    for movie in movies[10:20]:
+        sample_user.watchlist.append(movie)
+    db_session.commit()
+
+    # The vector index is built on first use, and profiles by the backfill
+    # script; budgets cover the steady state
+    movie_vectors.get(db_session)
+    backfill_profiles(db_session)
+
+    return {
+        "genre_id": genres[0].id,
+        "director_id": director.id,
+        "company_id": company.id,
+        "movie_ids": [m.id for m in movies],
+    }
+
+
+@pytest.mark.parametrize("path,budget", ROUTE_BUDGETS)
+def test_route_stays_within_statement_budget(
+    client, logged_in_user, catalog, capture_sql, path, budget
+):
+    url = path.format(**catalog)
+
+    with capture_sql() as statements:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert (
+        len(statements) <= budget
+    ), f"{url} sent {len(statements)} statements (budget {budget}):\n" + "\n".join(statements)
@@ -0,0 +1,239 @@
+"""
+Tests for per-user taste profiles (src/taste.py)
+"""
+
+import json
+
+import pytest
+
+from src.app import get_personalized_recommendations, movie_vectors
+from src.models import Crew, Genre, Movie, Person, Rating, User, UserTasteProfile
+from src.taste import (
+    MovieVectors,
+    backfill_profiles,
+    build_profile,
+    get_taste_profile,
+    rating_weight,
+)
+
+ELIGIBLE = {1: (7.0, 10.0), 2: (6.0, 50.0), 3: (8.0, 20.0)}
+
+
+class TestMovieVectors:
+    """Tests for scoring profiles against movie vectors"""
+
+    def test_shared_director_beats_shared_genre(self):
+        features = {
+            1: {("genre", 1)},
+            2: {("genre", 2), ("director", 9)},
+            3: {("genre", 2)},
+        }
+        vectors = MovieVectors(features, ELIGIBLE)
+
+        assert vectors.rank({"genre:2": 1.0, "director:9": 1.0}, 10) == [2, 3]
+
+    def test_disliked_features_are_left_out(self):
+        features = {1: {("genre", 1)}, 2: {("genre", 1), ("cast", 5)}, 3: {("genre", 2)}}
+        vectors = MovieVectors(features, ELIGIBLE)
+
+        assert vectors.rank({"genre:1": 1.0, "cast:5": -2.0}, 10) == [1]
+
+    def test_only_eligible_movies_are_ranked(self):
+        features = {1: {("genre", 1)}, 2: {("genre", 1)}, 4: {("genre", 1)}}
+        vectors = MovieVectors(features, {1: (7.0, 1.0), 2: (8.0, 1.0)})
+
+        assert vectors.rank({"genre:1": 1.0}, 10) == [2, 1]
+        assert len(vectors) == 2
+
+    def test_companies_and_decades_are_ignored(self):
+        vectors = MovieVectors({1: {("company", 3), ("decade", 1990)}}, {1: (7.0, 1.0)})
+
+        assert vectors.rank({"company:3": 1.0, "decade:1990": 1.0}, 10) == []
+
+
+def test_rating_weight():
+    assert [rating_weight(stars) for stars in (1, 3, 5, None)] == [-1.0, 0.0, 1.0, 0.0]
+
+
+@pytest.fixture
+def catalog(db_session, sample_user):
+    """Drama and comedy films, two of them by the same director"""
+    drama, comedy = Genre(tmdb_id=18, name="Drama"), Genre(tmdb_id=35, name="Comedy")
+    director = Person(tmdb_id=1, name="Auteur")
+    movies = [
+        Movie(tmdb_id=100 + i, title=f"Film {i}", vote_count=100, vote_average=7.0, popularity=i)
+        for i in range(6)
+    ]
+    for movie in movies[:4]:
+        movie.genres.append(drama)
+    for movie in movies[4:]:
+        movie.genres.append(comedy)
+    db_session.add_all(movies + [director])
+    db_session.flush()
+    db_session.add_all(
+        Crew(movie_id=movies[i].id, person_id=director.id, job="Director") for i in (0, 5)
+    )
+    db_session.commit()
+    return {"movies": movies, "drama": drama, "comedy": comedy, "director": director}
+
+
+def _stored_profile(db_session, user_id):
+    db_session.expire_all()
+    stored = db_session.query(UserTasteProfile.weights).filter_by(user_id=user_id).scalar()
+    return json.loads(stored) if stored is not None else None
+
+
+class TestProfiles:
+    """Tests for building and incrementally updating profiles"""
+
+    def test_build_profile_weights_history(self, db_session, sample_user, catalog):
+        movies = catalog["movies"]
+        sample_user.favorites.append(movies[0])
+        sample_user.watchlist.append(movies[1])
+        db_session.add(Rating(user_id=sample_user.id, movie_id=movies[4].id, rating=1))
+        db_session.commit()
+
+        profile = build_profile(db_session, sample_user.id)
+
+        assert profile == {
+            f"genre:{catalog['drama'].id}": 1.5,
+            f"director:{catalog['director'].id}": 1.0,
+            f"genre:{catalog['comedy'].id}": -1.0,
+        }
+
+    def test_reading_a_missing_profile_writes_nothing(self, db_session, sample_user, catalog):
+        sample_user.favorites.append(catalog["movies"][0])
+        db_session.commit()
+
+        profile = get_taste_profile(db_session, sample_user.id)
+
+        assert profile == build_profile(db_session, sample_user.id)
+        assert not db_session.new and not db_session.dirty
+        assert _stored_profile(db_session, sample_user.id) is None
+
+    def test_backfill_stores_missing_profiles_only(self, db_session, sample_user, catalog):
+        sample_user.favorites.append(catalog["movies"][0])
+        db_session.commit()
+
+        assert backfill_profiles(db_session) == 1
+        assert backfill_profiles(db_session) == 0
+        assert _stored_profile(db_session, sample_user.id) == build_profile(
+            db_session, sample_user.id
+        )
+
+    def test_favorite_routes_update_profile(self, client, db_session, logged_in_user, catalog):
+        user_id = logged_in_user.id
+        movie_id = catalog["movies"][5].id
+        before = get_taste_profile(db_session, user_id)
+
+        client.post(f"/movie/{movie_id}/favorite")
+        assert _stored_profile(db_session, user_id) == {
+            f"genre:{catalog['comedy'].id}": 1.0,
+            f"director:{catalog['director'].id}": 1.0,
+        }
+
+        client.post(f"/movie/{movie_id}/unfavorite")
+        assert _stored_profile(db_session, user_id) == before == {}
+
+    def test_rerating_applies_the_difference(self, client, db_session, logged_in_user, catalog):
+        user_id = logged_in_user.id
+        movie_id = catalog["movies"][4].id
+        get_taste_profile(db_session, user_id)
+
+        client.post(f"/movie/{movie_id}/rate", data={"rating": 5})
+        client.post(f"/movie/{movie_id}/watchlist")
+        client.post(f"/movie/{movie_id}/rate", data={"rating": 1})
+
+        assert _stored_profile(db_session, user_id) == {f"genre:{catalog['comedy'].id}": -0.5}
+        assert _stored_profile(db_session, user_id) == build_profile(db_session, user_id)
+
+    def test_first_change_stores_whole_history(self, client, db_session, logged_in_user, catalog):
+        user_id = logged_in_user.id
+        logged_in_user.watchlist.append(catalog["movies"][1])
+        db_session.commit()
+
+        client.post(f"/movie/{catalog['movies'][0].id}/favorite")
+
+        assert _stored_profile(db_session, user_id) == build_profile(db_session, user_id)
+        assert len(_stored_profile(db_session, user_id)) == 2
+
+    def test_removal_skips_pruned_features(self, client, db_session, logged_in_user, catalog):
+        user_id = logged_in_user.id
+        movie_id = catalog["movies"][5].id
+        client.post(f"/movie/{movie_id}/favorite")
+        # As if the director had been pruned from a long profile
+        comedy = f"genre:{catalog['comedy'].id}"
+        db_session.query(UserTasteProfile).filter_by(user_id=user_id).update(
+            {"weights": json.dumps({comedy: 1.0})}
+        )
+        db_session.commit()
+
+        client.post(f"/movie/{movie_id}/unfavorite")
+
+        assert _stored_profile(db_session, user_id) == {}
+
+
+class TestPersonalizedRecommendations:
+    """Tests for get_personalized_recommendations"""
+
+    def test_skips_movies_already_in_history(self, db_session, sample_user, catalog):
+        movies = catalog["movies"]
+        sample_user.favorites.append(movies[0])
+        sample_user.watchlist.append(movies[1])
+        db_session.add(Rating(user_id=sample_user.id, movie_id=movies[2].id, rating=4))
+        db_session.commit()
+
+        recommendations = get_personalized_recommendations(db_session, sample_user, limit=6)
+
+        # Film 3 is a drama like all three; Film 5 shares only the director
+        assert [movie.title for movie in recommendations] == ["Film 3", "Film 5"]
+
+    def test_heavy_history_still_gets_profile_matches(self, db_session, sample_user, sample_movies):
+        # Every movie matches equally, so ranking is by rating: favorite the best 20
+        best_first = sorted(sample_movies, key=lambda m: (-m.vote_average, -m.popularity))
+        for movie in best_first[:20]:
+            sample_user.favorites.append(movie)
+        db_session.commit()
+
+        recommendations = get_personalized_recommendations(db_session, sample_user, limit=1)
+
+        assert [movie.id for movie in recommendations] == [best_first[20].id]
+
+    def test_partial_matches_are_topped_up(self, db_session, sample_user, catalog):
+        movies = catalog["movies"]
+        for movie in movies[:4]:
+            sample_user.favorites.append(movie)
+        movies[4].vote_count = movies[3].vote_count = 500
+        db_session.commit()
+
+        recommendations = get_personalized_recommendations(db_session, sample_user, limit=3)
+
+        # Film 5 shares the director; Film 4 tops up (Film 3 is already a favorite)
+        assert [movie.title for movie in recommendations] == ["Film 5", "Film 4"]
+
+    def test_falls_back_to_top_rated_without_history(self, db_session, sample_user, catalog):
+        catalog["movies"][3].vote_count = 500
+        catalog["movies"][3].vote_average = 9.0
+        db_session.commit()
+
+        recommendations = get_personalized_recommendations(db_session, sample_user, limit=1)
+
+        assert [movie.title for movie in recommendations] == ["Film 3"]
+
+    def test_statements_do_not_grow_with_favorites(
+        self, db_session, sample_user, sample_movies, capture_sql
+    ):
+        def statements_with(favorite_count):
+            user = db_session.query(User).filter_by(id=sample_user.id).one()
+            for movie in sample_movies[user.favorites.count() : favorite_count]:
+                user.favorites.append(movie)
+            db_session.query(UserTasteProfile).delete()
+            db_session.commit()
+            backfill_profiles(db_session)
+            movie_vectors.get(db_session)
+
+            with capture_sql() as statements:
+                get_personalized_recommendations(db_session, user, limit=3)
+            return len(statements)
+
+        assert statements_with(2) == statements_with(20)
@@ -35,7 +35,7 @@ class TestTMDBClientInitialization:
 class TestGetPopularMovies:
     """Tests for fetching popular movies"""
 
-    @patch("src.tmdb_api.requests.get")
+    @patch("src.tmdb_api.requests.Session.get")
     def test_get_popular_movies_success(self, mock_get):
         """Test successful API call for popular movies"""
         # Mock successful response
@@ -70,7 +70,7 @@ class TestGetPopularMovies:
         assert result["results"][0]["title"] == "Fight Club"
         assert result["page"] == 1
 
-    @patch("src.tmdb_api.requests.get")
+    @patch("src.tmdb_api.requests.Session.get")
     def test_get_popular_movies_with_page_parameter(self, mock_get):
         """Test API call with specific page number"""
         mock_response = Mock()
@@ -87,7 +87,7 @@ class TestGetPopularMovies:
         assert "page=2" in str(call_args) or call_args[1].get("params", {}).get("page") == 2
         assert call_args[1]["timeout"] == client.timeout
 
-    @patch("src.tmdb_api.requests.get")
+    @patch("src.tmdb_api.requests.Session.get")
     def test_get_popular_movies_api_error(self, mock_get):
         """Test handling of API errors"""
         mock_get.side_effect = Exception("API Error")
@@ -102,7 +102,7 @@ class TestGetPopularMovies:
 class TestGetMovieDetails:
     """Tests for fetching movie details"""
 
-    @patch("src.tmdb_api.requests.get")
+    @patch("src.tmdb_api.requests.Session.get")
     def test_get_movie_details_success(self, mock_get):
         """Test successful fetch of movie details"""
         mock_response = Mock()
@@ -127,7 +127,7 @@ class TestGetMovieDetails:
         assert result["title"] == "Fight Club"
         assert result["budget"] == 63000000
 
-    @patch("src.tmdb_api.requests.get")
+    @patch("src.tmdb_api.requests.Session.get")
     def test_get_movie_details_not_found(self, mock_get):
         """Test handling of non-existent movie"""
         mock_response = Mock()
@@ -148,7 +148,7 @@ class TestGetMovieDetails:
 class TestGetMovieCredits:
     """Tests for fetching movie credits (cast and crew)"""
 
-    @patch("src.tmdb_api.requests.get")
+    @patch("src.tmdb_api.requests.Session.get")
     def test_get_movie_credits_success(self, mock_get):
         """Test successful fetch of movie credits"""
         mock_response = Mock()
@@ -187,7 +187,7 @@ class TestGetMovieCredits:
 class TestGetMovieVideos:
     """Tests for fetching movie videos (trailers)"""
 
-    @patch("src.tmdb_api.requests.get")
+    @patch("src.tmdb_api.requests.Session.get")
     def test_get_movie_videos_success(self, mock_get):
         """Test successful fetch of movie videos"""
         mock_response = Mock()
@@ -214,7 +214,7 @@ class TestGetMovieVideos:
         assert result["results"][0]["site"] == "YouTube"
         assert result["results"][0]["type"] == "Trailer"
 
-    @patch("src.tmdb_api.requests.get")
+    @patch("src.tmdb_api.requests.Session.get")
     def test_get_movie_videos_no_videos(self, mock_get):
         """Test movie with no videos available"""
         mock_response = Mock()
@@ -297,7 +297,7 @@ class TestTrailerSelection:
 class TestRateLimiting:
     """Tests for API rate limiting and retries"""
 
-    @patch("src.tmdb_api.requests.get")
+    @patch("src.tmdb_api.requests.Session.get")
     def test_rate_limit_handling(self, mock_get):
         """Test handling of rate limit errors"""
         mock_response = Mock()
@@ -313,7 +313,7 @@ class TestRateLimiting:
         # Should handle rate limiting gracefully
         assert result is not None
 
-    @patch("src.tmdb_api.requests.get")
+    @patch("src.tmdb_api.requests.Session.get")
     def test_network_timeout(self, mock_get):
         """Test handling of network timeouts"""
         mock_get.side_effect = requests.exceptions.Timeout("Connection timed out")
@@ -340,3 +340,117 @@ class TestAPIConfiguration:
 
         assert hasattr(Config, "TMDB_IMAGE_BASE_URL")
         assert "image.tmdb.org" in Config.TMDB_IMAGE_BASE_URL
+
+
+class TestConnectionPooling:
+    """Tests for the shared keep-alive HTTP session"""
+
+    def test_clients_share_one_session(self):
+        """Test that every client reuses the same pooled session"""
+        assert TMDBClient().session is TMDBClient().session
+
+    def test_session_adapter_pool_size_from_config(self):
+        """Test that the HTTPS adapter pool is sized from Config"""
+        from config.config import Config
+
+        adapter = TMDBClient().session.get_adapter("https://api.themoviedb.org/3")
+        assert adapter._pool_maxsize == Config.TMDB_POOL_MAXSIZE
+
+
+class TestResponseCache:
+    """Tests for TMDB response caching"""
+
+    @staticmethod
+    def _ok_response(payload):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = payload
+        return mock_response
+
+    @patch("src.tmdb_api.requests.Session.get")
+    def test_repeat_request_served_from_cache(self, mock_get):
+        """Test that an identical request does not hit the network twice"""
+        mock_get.return_value = self._ok_response({"id": 550, "results": []})
+
+        first = TMDBClient().get_movie_videos(550)
+        second = TMDBClient().get_movie_videos(550)
+
+        assert first == second
+        mock_get.assert_called_once()
+
+    @patch("src.tmdb_api.requests.Session.get")
+    def test_different_params_are_cached_separately(self, mock_get):
+        """Test that the cache key includes request params"""
+        mock_get.return_value = self._ok_response({"page": 1, "results": []})
+
+        client = TMDBClient()
+        client.get_popular_movies(page=1)
+        client.get_popular_movies(page=2)
+
+        assert mock_get.call_count == 2
+
+    @patch("src.tmdb_api.requests.Session.get")
+    def test_failures_are_not_cached(self, mock_get):
+        """Test that an error response is retried on the next call"""
+        mock_get.side_effect = [
+            requests.exceptions.Timeout("slow"),
+            self._ok_response({"id": 550}),
+        ]
+
+        client = TMDBClient()
+        assert client.get_movie_details(550) == {}
+        assert client.get_movie_details(550) == {"id": 550}
+
+    @patch("src.tmdb_api.requests.Session.get")
+    def test_use_cache_false_always_hits_network(self, mock_get):
+        """Test that uncached clients bypass the response cache"""
+        mock_get.return_value = self._ok_response({"id": 550})
+
+        client = TMDBClient(use_cache=False)
+        client.get_movie_details(550)
+        client.get_movie_details(550)
+
+        assert client.cache is None
+        assert mock_get.call_count == 2
+
+    def test_cache_key_ignores_api_key_and_param_order(self):
+        """Test that cache keys are stable and never contain the API key"""
+        from src.tmdb_api import cache_key
+
+        a = cache_key("discover/movie", {"year": 1999, "sort_by": "x", "api_key": "secret"})
+        b = cache_key("discover/movie", {"sort_by": "x", "year": 1999})
+
+        assert a == b
+        assert "secret" not in a
+
+    def test_endpoint_ttls(self):
+        """Test per-endpoint TTL selection"""
+        from src.tmdb_api import ttl_for_endpoint
+
+        assert ttl_for_endpoint("movie/550/watch/providers") == 6 * 3600
+        assert ttl_for_endpoint("movie/550/videos") == 24 * 3600
+        assert ttl_for_endpoint("search/movie") == 600
+        assert ttl_for_endpoint("genre/movie/list") == 7 * 24 * 3600
+
+    def test_lru_evicts_least_recently_used(self):
+        """Test that the in-process cache stays bounded"""
+        from src.tmdb_api import LRUResponseCache
+
+        cache = LRUResponseCache(max_entries=2)
+        cache.set("a", {"v": 1}, ttl=60)
+        cache.set("b", {"v": 2}, ttl=60)
+        cache.get("a")
+        cache.set("c", {"v": 3}, ttl=60)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"v": 1}
+        assert len(cache) == 2
+
+    def test_lru_expires_entries(self):
+        """Test that expired entries are treated as misses"""
+        from src.tmdb_api import LRUResponseCache
+
+        cache = LRUResponseCache()
+        cache.set("a", {"v": 1}, ttl=0)
+
+        assert cache.get("a") is None
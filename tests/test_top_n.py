@@ -0,0 +1,132 @@
+"""
+Tests for batched top-N-per-group fetches (src/top_n.py)
+"""
+
+import pytest
+from sqlalchemy import desc
+
+from src.models import Crew, Movie, Person, ProductionCompany
+from src.top_n import top_n_per_group
+
+
+@pytest.fixture
+def directors_with_films(db_session):
+    """Four directors with five films each, ratings 5.0-9.0"""
+    directors = []
+    for d in range(4):
+        person = Person(tmdb_id=7000 + d, name=f"Director {d}")
+        db_session.add(person)
+        db_session.flush()
+        for m in range(5):
+            movie = Movie(
+                tmdb_id=70000 + d * 10 + m,
+                title=f"Film {d}-{m}",
+                vote_average=5.0 + m,
+                vote_count=100,
+                revenue=1000,
+            )
+            db_session.add(movie)
+            db_session.flush()
+            db_session.add(Crew(movie_id=movie.id, person_id=person.id, job="Director"))
+        directors.append(person)
+    db_session.commit()
+    return directors
+
+
+def _director_query(db_session):
+    return (
+        db_session.query(Movie).join(Crew, Movie.id == Crew.movie_id).filter(Crew.job == "Director")
+    )
+
+
+class TestTopNPerGroup:
+    """Tests for top_n_per_group"""
+
+    @pytest.mark.parametrize("window", [True, False])
+    def test_returns_top_movies_per_group(self, db_session, directors_with_films, window):
+        ids = [d.id for d in directors_with_films]
+
+        result = top_n_per_group(
+            db_session,
+            _director_query(db_session),
+            Crew.person_id,
+            ids,
+            order_by=desc(Movie.vote_average),
+            limit=3,
+            window=window,
+        )
+
+        assert set(result) == set(ids)
+        for director in directors_with_films:
+            ratings = [float(m.vote_average) for m in result[director.id]]
+            assert ratings == [9.0, 8.0, 7.0]
+
+    def test_window_and_fallback_agree(self, db_session, directors_with_films):
+        ids = [d.id for d in directors_with_films]
+        kwargs = dict(order_by=desc(Movie.vote_count), limit=2)
+
+        windowed = top_n_per_group(
+            db_session, _director_query(db_session), Crew.person_id, ids, window=True, **kwargs
+        )
+        fallback = top_n_per_group(
+            db_session, _director_query(db_session), Crew.person_id, ids, window=False, **kwargs
+        )
+
+        assert {k: [m.id for m in v] for k, v in windowed.items()} == {
+            k: [m.id for m in v] for k, v in fallback.items()
+        }
+
+    def test_single_query(self, db_session, directors_with_films, capture_sql):
+        ids = [d.id for d in directors_with_films]
+
+        with capture_sql() as statements:
+            top_n_per_group(
+                db_session,
+                _director_query(db_session),
+                Crew.person_id,
+                ids,
+                order_by=desc(Movie.vote_average),
+                limit=3,
+            )
+
+        assert len(statements) == 1
+
+    def test_no_groups(self, db_session, capture_sql):
+        with capture_sql() as statements:
+            result = top_n_per_group(
+                db_session, db_session.query(Movie), Crew.person_id, [], Movie.id, 3
+            )
+
+        assert result == {}
+        assert statements == []
+
+
+class TestSpotlightPagesBatchTopMovies:
+    """/directors and /companies should not query per card"""
+
+    def test_directors_query_count_is_constant(
+        self, client, db_session, directors_with_films, capture_sql
+    ):
+        with capture_sql() as statements:
+            response = client.get("/directors")
+
+        assert response.status_code == 200
+        assert b"Film 0-4" in response.data
+        assert len(statements) <= 4
+
+    def test_companies_query_count_is_constant(
+        self, client, db_session, directors_with_films, capture_sql
+    ):
+        movies = db_session.query(Movie).order_by(Movie.id).all()
+        for c in range(4):
+            company = ProductionCompany(tmdb_id=8000 + c, name=f"Studio {c}")
+            company.movies.extend(movies[c * 5 : c * 5 + 5])
+            db_session.add(company)
+        db_session.commit()
+
+        with capture_sql() as statements:
+            response = client.get("/companies")
+
+        assert response.status_code == 200
+        assert b"Film 3-4" in response.data
+        assert len(statements) <= 4